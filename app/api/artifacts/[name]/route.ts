@@ -0,0 +1,25 @@
+import { NextRequest, NextResponse } from "next/server"
+
+// Proxies content-addressed TTS audio / SVG diagrams from the backend,
+// forwarding the caching and range headers so browsers can revalidate and seek.
+export async function GET(req: NextRequest, { params }: { params: { name: string } }) {
+  try {
+    const backendUrl = process.env.BACKEND_URL || "http://localhost:8000"
+    const forward: Record<string, string> = {}
+    for (const h of ["range", "if-none-match"]) {
+      const v = req.headers.get(h)
+      if (v) forward[h] = v
+    }
+
+    const res = await fetch(`${backendUrl}/artifacts/${encodeURIComponent(params.name)}`, { headers: forward })
+
+    const headers = new Headers()
+    for (const h of ["content-type", "content-length", "content-range", "accept-ranges", "etag", "cache-control", "content-security-policy", "x-content-type-options"]) {
+      const v = res.headers.get(h)
+      if (v) headers.set(h, v)
+    }
+    return new NextResponse(res.body, { status: res.status, headers })
+  } catch (e) {
+    return NextResponse.json({ error: "Failed to fetch artifact" }, { status: 500 })
+  }
+}
@@ -4,7 +4,9 @@ export async function GET(request: NextRequest) {
   try {
     const backendUrl = process.env.BACKEND_URL || "http://localhost:8000"
     
-    const response = await fetch(`${backendUrl}/dashboard/recent-activity`, {
+    const query = request.nextUrl.searchParams.toString()
+
+    const response = await fetch(`${backendUrl}/dashboard/recent-activity${query ? `?${query}` : ""}`, {
       method: "GET",
       headers: {
         "Content-Type": "application/json",
@@ -16,7 +18,10 @@ export async function GET(request: NextRequest) {
     }
 
     const activityData = await response.json()
-    return NextResponse.json(activityData)
+    const nextCursor = response.headers.get("X-Next-Cursor")
+    return NextResponse.json(activityData, {
+      headers: nextCursor ? { "X-Next-Cursor": nextCursor } : undefined,
+    })
   } catch (error) {
     console.error("Dashboard activity error:", error)
     return NextResponse.json(
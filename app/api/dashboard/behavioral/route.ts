@@ -3,9 +3,14 @@ import { NextRequest, NextResponse } from "next/server"
 export async function GET(req: NextRequest) {
   try {
     const backendUrl = process.env.BACKEND_URL || "http://localhost:8000"
-    const res = await fetch(`${backendUrl}/dashboard/behavioral`)
+    const query = req.nextUrl.searchParams.toString()
+    const res = await fetch(`${backendUrl}/dashboard/behavioral${query ? `?${query}` : ""}`)
     const data = await res.json()
-    return NextResponse.json(data, { status: res.status })
+    const nextCursor = res.headers.get("X-Next-Cursor")
+    return NextResponse.json(data, {
+      status: res.status,
+      headers: nextCursor ? { "X-Next-Cursor": nextCursor } : undefined,
+    })
   } catch (e) {
     return NextResponse.json({ error: "Failed to fetch behavioral summaries" }, { status: 500 })
   }
@@ -0,0 +1,44 @@
+import { NextRequest, NextResponse } from "next/server"
+
+// Relays the backend's NDJSON question stream without buffering it
+export async function POST(request: NextRequest) {
+  try {
+    const parsedData = await request.json()
+
+    if (!parsedData) {
+      return NextResponse.json(
+        { error: "Parsed email data is required" },
+        { status: 400 }
+      )
+    }
+
+    const backendUrl = process.env.BACKEND_URL || "http://localhost:8000"
+
+    const response = await fetch(`${backendUrl}/generate-interview/stream${request.nextUrl.search}`, {
+      method: "POST",
+      headers: {
+        "Content-Type": "application/json",
+        Accept: "application/x-ndjson",
+      },
+      body: JSON.stringify(parsedData),
+    })
+
+    if (!response.ok || !response.body) {
+      throw new Error(`Backend error: ${response.status}`)
+    }
+
+    return new Response(response.body, {
+      headers: {
+        "Content-Type": "application/x-ndjson",
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+      },
+    })
+  } catch (error) {
+    console.error("Interview stream error:", error)
+    return NextResponse.json(
+      { error: "Failed to generate interview questions" },
+      { status: 500 }
+    )
+  }
+}
@@ -0,0 +1,13 @@
+import { NextRequest, NextResponse } from "next/server"
+
+// A provisional answer evaluation, replaced by the model's once it arrives (status "final")
+export async function GET(req: NextRequest, { params }: { params: { id: string } }) {
+  try {
+    const backendUrl = process.env.BACKEND_URL || "http://localhost:8000"
+    const res = await fetch(`${backendUrl}/interview/evaluations/${encodeURIComponent(params.id)}`, { cache: "no-store" })
+    const data = await res.json()
+    return NextResponse.json(data, { status: res.status })
+  } catch (e) {
+    return NextResponse.json({ error: "Failed to load evaluation" }, { status: 500 })
+  }
+}
@@ -0,0 +1,20 @@
+import { NextRequest, NextResponse } from "next/server"
+
+// Answer outline and tips for one question, generated by the backend when first opened
+export async function POST(req: NextRequest, { params }: { params: { id: string } }) {
+  try {
+    const backendUrl = process.env.BACKEND_URL || "http://localhost:8000"
+    const context = await req.text()
+
+    const res = await fetch(`${backendUrl}/questions/${encodeURIComponent(params.id)}/detail`, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: context || undefined,
+    })
+
+    const data = await res.json()
+    return NextResponse.json(data, { status: res.status })
+  } catch (e) {
+    return NextResponse.json({ error: "Failed to load question detail" }, { status: 500 })
+  }
+}
@@ -152,18 +152,21 @@ export default function RunnerPage() {
 
       const resp = await fetch('/api/interview', { method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify(payload) })
       if (!resp.ok) return
-      const data = await resp.json()
-      // backend returns { ai: {...}, image?: base64, audio?: base64 }
-      const ai = data?.ai || {}
-      const explanation: string = ai.explanation || ai?.explanation || ''
-      const imageB64: string | null = data?.image || null
-      const audioB64: string | null = data?.audio || null
-
-      setResults((prev)=> prev.map((r,idx)=> idx===i ? { ...r, teach: mode, explanation, image: imageB64, audio: audioB64 } : r))
+      let data = await resp.json()
+      // backend returns { ai: {...}, image_url?: '/artifacts/<hash>.svg', audio_url?: '/artifacts/<hash>.mp3' }
+      let audioSrc = showTeach(i, mode, data)
+      // A slow model answer comes back as a local provisional score; the full one replaces it at status_url
+      for (let tries = 0; data?.status === 'provisional' && data?.status_url && tries < 40; tries++) {
+        await new Promise((r)=> setTimeout(r, 1500))
+        const poll = await fetch(`/api${data.status_url}`, { cache: 'no-store' })
+        if (!poll.ok) break
+        data = await poll.json()
+        if (data?.status === 'final') audioSrc = showTeach(i, mode, data)
+      }
 
-      if (mode === 'audio' && audioB64) {
+      if (mode === 'audio' && audioSrc) {
         try {
-          const audio = new Audio('data:audio/mpeg;base64,' + audioB64)
+          const audio = new Audio(audioSrc)
           setPlaying(i)
           audio.onended = () => setPlaying(null)
           await audio.play()
@@ -174,6 +177,15 @@ export default function RunnerPage() {
     } catch {}
   }
 
+  function showTeach(i: number, mode: 'audio'|'visual'|'explanation'|'theory', data: any): string | null {
+    const ai = data?.ai || {}
+    const explanation: string = ai.explanation || ''
+    const imageSrc: string | null = data?.image_url ? `/api${data.image_url}` : null
+    const audioSrc: string | null = data?.audio_url ? `/api${data.audio_url}` : null
+    setResults((prev)=> prev.map((r,idx)=> idx===i ? { ...r, teach: mode, explanation, image: imageSrc, audio: audioSrc } : r))
+    return audioSrc
+  }
+
   function triggerConfetti() {
     try {
       const root = document.createElement('div')
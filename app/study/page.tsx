@@ -28,14 +28,17 @@ interface ParsedEmailData {
 }
 
 interface GeneratedQuestions {
+  estimated_duration?: number
   categories: Array<{
     name: string
     description: string
     icon: string
     questions: Array<{
+      id?: string
       question: string
+      category?: string
       difficulty: string
-      expected_answer: string
+      expected_answer?: string | null
       tips: string[]
     }>
   }>
@@ -49,6 +52,7 @@ export default function StudyPracticePage() {
   const [parsedData, setParsedData] = useState<ParsedEmailData | null>(null)
   const [generatedQuestions, setGeneratedQuestions] = useState<GeneratedQuestions | null>(null)
   const [error, setError] = useState<string | null>(null)
+  const [loadingDetail, setLoadingDetail] = useState<string | null>(null)
   const [currentStep, setCurrentStep] = useState<'email' | 'parsed' | 'questions'>('email')
   const [automationEnabled, setAutomationEnabled] = useState(false)
   const [automation, setAutomation] = useState<StudyPracticeAutomation | null>(null)
@@ -124,7 +128,7 @@ export default function StudyPracticePage() {
     setError(null)
 
     try {
-      const response = await fetch("/api/generate-interview", {
+      const response = await fetch("/api/generate-interview/stream?detail=lazy", {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -132,13 +136,44 @@ export default function StudyPracticePage() {
         body: JSON.stringify(parsedData),
       })
 
-      if (!response.ok) {
+      if (!response.ok || !response.body) {
         throw new Error("Failed to generate questions")
       }
 
-      const data = await response.json()
+      // NDJSON events: "interview" (no questions yet), one "question" each, then "done"
+      const reader = response.body.getReader()
+      const decoder = new TextDecoder()
+      let buffer = ""
+      let data: any = null
+      while (true) {
+        const { value, done } = await reader.read()
+        buffer += decoder.decode(value, { stream: !done })
+        const lines = buffer.split("\n")
+        buffer = done ? "" : lines.pop() || ""
+        for (const line of lines) {
+          if (!line.trim()) continue
+          const { event, data: payload } = JSON.parse(line)
+          if (event === "error") throw new Error(payload.detail || "Failed to generate questions")
+          if (event === "interview") {
+            setGeneratedQuestions(payload)
+            setCurrentStep('questions')
+          } else if (event === "question") {
+            setGeneratedQuestions(prev => prev && {
+              ...prev,
+              estimated_duration: payload.estimated_duration,
+              categories: prev.categories.map((cat, i) => i === 0 ? { ...cat, questions: [...cat.questions, payload.question] } : cat),
+            })
+          } else if (event === "done") {
+            data = payload
+          }
+        }
+        if (done) break
+      }
+      if (!data) {
+        throw new Error("Question stream ended early")
+      }
+
       setGeneratedQuestions(data)
-      setCurrentStep('questions')
       try {
         const created = createSessionFromEmail(parsedData, data)
         setQuickStart(created)
@@ -150,6 +185,40 @@ export default function StudyPracticePage() {
     }
   }
 
+  // Questions are generated without answers; fetch the outline and tips when one is opened
+  const loadDetail = async (ci: number, qi: number) => {
+    const q = generatedQuestions?.categories[ci]?.questions[qi]
+    if (!q?.id || !parsedData) return
+    setLoadingDetail(q.id)
+    try {
+      const response = await fetch(`/api/questions/${q.id}/detail`, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({
+          question: q.question,
+          category: q.category,
+          difficulty: q.difficulty,
+          company: parsedData.company,
+          position: parsedData.position,
+          level: parsedData.experience_level,
+        }),
+      })
+      if (!response.ok) throw new Error("Failed to load answer and tips")
+      const detail = await response.json()
+      setGeneratedQuestions(prev => prev && {
+        ...prev,
+        categories: prev.categories.map((cat, i) => i !== ci ? cat : {
+          ...cat,
+          questions: cat.questions.map((item, j) => j === qi ? { ...item, expected_answer: detail.expected_answer, tips: detail.tips } : item),
+        }),
+      })
+    } catch (err: any) {
+      setError(err.message)
+    } finally {
+      setLoadingDetail(null)
+    }
+  }
+
   const resetFlow = () => {
     setEmailContent("")
     setParsedData(null)
@@ -374,6 +443,22 @@ export default function StudyPracticePage() {
                               </Badge>
                             )}
                             
+                            {q.expected_answer && (
+                              <p className="text-sm text-muted-foreground">{q.expected_answer}</p>
+                            )}
+
+                            {!q.expected_answer && !(q.tips && q.tips.length > 0) && q.id && (
+                              <Button
+                                variant="ghost"
+                                size="sm"
+                                className="px-0 text-xs"
+                                disabled={loadingDetail === q.id}
+                                onClick={() => loadDetail(i, qi)}
+                              >
+                                {loadingDetail === q.id ? "Loading answer and tips..." : "Show answer outline and tips"}
+                              </Button>
+                            )}
+
                             {q.tips && q.tips.length > 0 && (
                               <div className="mt-3 space-y-1">
                                 <p className="text-xs font-semibold text-muted-foreground uppercase tracking-wide">Tips:</p>
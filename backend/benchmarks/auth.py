@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Per-request auth overhead with and without the decoded-claims cache.
+
+Runs the resolve_user_id dependency the way FastAPI does for each dashboard
+or tracking call, for a pool of distinct tokens.
+
+    cd backend && python -m benchmarks.auth
+"""
+
+import os
+import time
+from datetime import timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+import main
+from database import SessionLocal, User, create_tables
+from services.token_cache import claims_cache
+
+
+def _tokens(db, n_users: int):
+    tokens = []
+    for i in range(n_users):
+        user = User(google_id=f"bench-{i}", email=f"bench-{i}@example.com", name=f"Bench {i}")
+        db.add(user)
+        db.flush()
+        tokens.append(main.get_auth_service().create_access_token(
+            {"sub": str(user.id), "email": user.email, "ver": 0}, timedelta(minutes=30)
+        ))
+    db.commit()
+    return tokens
+
+
+def _bench(tokens, db, requests: int, use_cache: bool) -> float:
+    claims_cache.clear()
+    service = main.get_auth_service()
+    start = time.perf_counter()
+    for i in range(requests):
+        claims = service.verify_token(tokens[i % len(tokens)], use_cache=use_cache)
+        assert claims is not None and service.is_token_current(db, claims)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def run(n_users: int = 50, requests: int = 20000):
+    create_tables()
+    db = SessionLocal()
+    try:
+        tokens = _tokens(db, n_users)
+        uncached = _bench(tokens, db, requests, use_cache=False)
+        cached = _bench(tokens, db, requests, use_cache=True)
+    finally:
+        db.close()
+    return {"users": n_users, "requests": requests, "uncached_us": uncached, "cached_us": cached}
+
+
+if __name__ == "__main__":
+    r = run()
+    print(f"{r['requests']} requests over {r['users']} tokens")
+    print(f"  jwt.decode every call : {r['uncached_us']:8.2f} us/request")
+    print(f"  claims cache          : {r['cached_us']:8.2f} us/request")
+    print(f"  speedup               : {r['uncached_us'] / r['cached_us']:8.1f}x")
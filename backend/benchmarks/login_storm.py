@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Login-storm benchmark: concurrent AuthService.create_user_session calls.
+
+Samples the connection pool while logins run and after they finish, to show
+that sessions are returned to the pool instead of leaking until GC.
+
+    cd backend && python -m benchmarks.login_storm [--threads 16] [--logins 2000]
+"""
+
+import argparse
+import gc
+import os
+import tempfile
+import threading
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/login_storm.db")
+
+from database import create_tables, engine, get_db
+from services.auth_service import AuthService
+from services.user_service import UserService
+
+
+def _profile(i: int, n_users: int):
+    u = i % n_users
+    return {
+        "google_id": f"storm-{u}",
+        "email": f"storm-{u}@example.com",
+        "name": f"Storm User {u}",
+        "picture": None,
+        "verified_email": True,
+    }
+
+
+def _legacy_login(auth: AuthService, info):
+    # Pre-fix behaviour: the get_db() generator is never closed
+    db = next(get_db())
+    user = UserService(db).get_or_create_user(info)
+    return auth.create_access_token({"sub": str(user.id)})
+
+
+def run(threads: int, logins: int, n_users: int, legacy: bool = False):
+    auth = AuthService()
+    lock = threading.Lock()
+    counter = {"next": 0}
+    peak = {"checked_out": 0}
+
+    def worker():
+        while True:
+            with lock:
+                i = counter["next"]
+                counter["next"] += 1
+            if i >= logins:
+                return
+            if legacy:
+                _legacy_login(auth, _profile(i, n_users))
+            else:
+                auth.create_user_session(_profile(i, n_users))
+            checked_out = engine.pool.checkedout()
+            with lock:
+                peak["checked_out"] = max(peak["checked_out"], checked_out)
+
+    start = time.perf_counter()
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return {
+        "logins": logins,
+        "logins_per_s": logins / elapsed,
+        "peak_checked_out": peak["checked_out"],
+        "checked_out_after": engine.pool.checkedout(),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--logins", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--legacy", action="store_true", help="replay the leaking next(get_db()) path (GC disabled)")
+    args = parser.parse_args()
+
+    create_tables()
+    if args.legacy:
+        gc.disable()
+        # Stay under pool_size + max_overflow so the leak shows instead of a pool timeout
+        args.logins = min(args.logins, 10)
+        args.threads = 1
+    r = run(args.threads, args.logins, args.users, legacy=args.legacy)
+    print(f"{r['logins']} logins, {r['logins_per_s']:.0f} logins/s")
+    print(f"  peak connections checked out : {r['peak_checked_out']}")
+    print(f"  checked out after storm      : {r['checked_out_after']}")
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Live-feedback latency while full-video analyses saturate Gemini.
+
+Starts the stub upstream and a server with a small Gemini concurrency cap,
+keeps ``--uploads`` /analyze-behavioral requests in flight, and meanwhile
+sends /behavioral/chunk frames from ``--sessions`` live sessions every
+``--interval`` seconds. Runs once with the scheduler off (SCHED_SLOTS=0) and
+once with it on, and reports frame latency, dropped frames and video
+throughput for each.
+
+    cd backend && python -m benchmarks.priority [--uploads 12] [--slots 4] [--duration 20]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.stub_upstream import add_profile_arguments, profile_from_args, start_stub
+from benchmarks.suite import _multipart, _percentile, _request, _video_bytes
+from benchmarks.workers import BACKEND_DIR, _frame_b64, _free_port, _wait_ready
+
+
+def _frame_request(url: str, body: bytes):
+    """(latency, status) for one live frame."""
+    import urllib.error
+    import urllib.request
+
+    req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=120) as r:
+            r.read()
+            status = r.status
+    except urllib.error.HTTPError as e:
+        e.read()
+        status = e.code
+    return time.perf_counter() - start, status
+
+
+def run(stub_url: str, scheduled: bool, args) -> dict:
+    port = _free_port()
+    workdir = tempfile.mkdtemp()
+    env = {
+        **os.environ,
+        "GEMINI_API_KEY": "benchmark",
+        "GEMINI_API_ENDPOINT": stub_url,
+        "DATABASE_URL": f"sqlite:///{workdir}/bench.db",
+        "GEMINI_MAX_CONCURRENCY": str(args.slots),
+        "SCHED_SLOTS": str(args.slots if scheduled else 0),
+        "SCHED_BATCH_SLOTS": str(max(1, args.slots // 4)),
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base = f"http://127.0.0.1:{port}"
+    video_body, video_type = _multipart("video_file", "clip.mp4", _video_bytes(), "video/mp4")
+    frame = _frame_b64()
+    stop = threading.Event()
+    videos, frames = [], []
+
+    def upload_loop():
+        while not stop.is_set():
+            videos.append(_request(f"{base}/analyze-behavioral", "POST", video_body, video_type))
+
+    def session_loop(session: int):
+        body = json.dumps({"session_id": f"live-{session}", "timestamp": 0, "image_b64": frame,
+                           "transcript_segment": "We cut checkout latency by caching the pricing calls."}).encode()
+        while not stop.is_set():
+            started = time.perf_counter()
+            frames.append(_frame_request(f"{base}/behavioral/chunk", body))
+            stop.wait(max(0.0, args.interval - (time.perf_counter() - started)))
+
+    try:
+        _wait_ready(base)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.uploads + args.sessions) as pool:
+            for _ in range(args.uploads):
+                pool.submit(upload_loop)
+            time.sleep(1.0)  # let the uploads fill the queue first
+            for s in range(args.sessions):
+                pool.submit(session_loop, s)
+            time.sleep(args.duration)
+            stop.set()
+        elapsed = time.perf_counter() - start
+    finally:
+        proc.terminate()
+        proc.wait(timeout=60)
+
+    answered = sorted(lat for lat, status in frames if status == 200)
+    return {
+        "scheduler": "on" if scheduled else "off",
+        "frames": len(frames),
+        "frame_p50_ms": _percentile(answered, 0.50) * 1000 if answered else None,
+        "frame_p95_ms": _percentile(answered, 0.95) * 1000 if answered else None,
+        "dropped": sum(1 for _, status in frames if status in (429, 503)),
+        "videos_per_min": sum(1 for _, ok in videos if ok) / elapsed * 60,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uploads", type=int, default=12, help="video uploads kept in flight")
+    parser.add_argument("--sessions", type=int, default=2, help="live sessions sending frames")
+    parser.add_argument("--interval", type=float, default=2.0, help="seconds between a session's frames")
+    parser.add_argument("--slots", type=int, default=4, help="Gemini concurrency cap and scheduler slots")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of live traffic per run")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    stub, stub_stats = start_stub(profile_from_args(args), args.latency_scale, args.seed)
+    try:
+        results = [run(f"http://127.0.0.1:{stub.server_port}", scheduled, args) for scheduled in (False, True)]
+    finally:
+        stub.shutdown()
+
+    print(f"{'scheduler':<10} {'frames':>6} {'p50 ms':>8} {'p95 ms':>8} {'dropped':>7} {'videos/min':>10}")
+    for r in results:
+        p50 = f"{r['frame_p50_ms']:8.0f}" if r["frame_p50_ms"] is not None else "       -"
+        p95 = f"{r['frame_p95_ms']:8.0f}" if r["frame_p95_ms"] is not None else "       -"
+        print(f"{r['scheduler']:<10} {r['frames']:>6} {p50} {p95} {r['dropped']:>7} {r['videos_per_min']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+ProgressService query timings and plans at 1x, 10x and 100x data volume.
+
+Loads benchmarks/synthetic_data.py into a fresh database per scale, then
+times every dashboard query for the heaviest, 99th-percentile and median
+user. ``--explain`` prints the plan of each SQL statement the service runs.
+
+    cd backend && python -m benchmarks.progress_scale [--scales 1x 10x] [--explain]
+    cd backend && python -m benchmarks.progress_scale --database-url postgresql://.../scratch --reset
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks.synthetic_data import BASE_USERS, SCALES, load
+from database import Base
+from services.progress_service import ProgressService
+
+QUERIES = {
+    "stats": lambda s: s.stats(),
+    "weekly_progress": lambda s: s.weekly_progress(),
+    "category_performance": lambda s: s.category_performance(),
+    "recent_activity": lambda s: s.recent_activity_page(limit=10),
+    "behavioral_summary": lambda s: s.behavioral_page(limit=10),
+    "behavioral_full": lambda s: s.behavioral_page(limit=10, full=True),
+}
+
+
+def _engine(url: str):
+    return create_engine(url, connect_args={"check_same_thread": False} if url.startswith("sqlite") else {})
+
+
+def _capture_statements(engine, fn):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return statements
+
+
+def _explain(engine, statements):
+    prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            print("    " + " ".join(statement.split())[:160])
+            for row in conn.exec_driver_sql(prefix + statement, parameters).all():
+                # sqlite: (id, parent, notused, detail); postgres: (line,)
+                print(f"      {row[-1]}")
+
+
+def run(engine, users: int, repeat: int, explain: bool):
+    Session = sessionmaker(bind=engine)
+    targets = {"heaviest": 1, "p99": max(1, users // 100), "median": users // 2}
+    results = {}
+    for who, user_id in targets.items():
+        for name, query in QUERIES.items():
+            db = Session()
+            try:
+                service = ProgressService(db, user_id)
+                query(service)  # warm the page cache
+                timings = []
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    query(service)
+                    timings.append(time.perf_counter() - start)
+                if explain and who == "heaviest":
+                    print(f"  plan: {name}")
+                    _explain(engine, _capture_statements(engine, lambda: query(service)))
+            finally:
+                db.close()
+            results[(who, name)] = statistics.median(timings) * 1000
+    return targets, results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["1x", "10x"])
+    parser.add_argument("--database-url", help="scratch database to load into (default: a temp SQLite file per scale)")
+    parser.add_argument("--reset", action="store_true", help="drop and recreate the tables in --database-url first")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--explain", action="store_true")
+    args = parser.parse_args()
+
+    for scale in args.scales:
+        url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), f'progress-{scale}.db')}"
+        engine = _engine(url)
+        if args.database_url and args.reset:
+            Base.metadata.drop_all(bind=engine)
+        start = time.perf_counter()
+        counts = load(engine, scale, args.seed)
+        load_s = time.perf_counter() - start
+        total = sum(counts.values())
+        print(f"{scale}: {total:,} rows loaded in {load_s:.1f}s ({total / load_s:,.0f} rows/s) [{engine.dialect.name}]")
+
+        targets, results = run(engine, BASE_USERS * SCALES[scale], args.repeat, args.explain)
+        print(f"  {'query (median ms)':<22}" + "".join(f"{f'{who} (#{uid})':>18}" for who, uid in targets.items()))
+        for name in QUERIES:
+            print(f"  {name:<22}" + "".join(f"{results[(who, name)]:18.2f}" for who in targets))
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
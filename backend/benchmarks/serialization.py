@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Serialization microbenchmark for the API's largest responses.
+
+Compares FastAPI's default path (jsonable_encoder + json) with the shipped
+path (pydantic response model + ORJSONResponse) and reports time and bytes.
+
+    cd backend && python -m benchmarks.serialization
+"""
+
+import base64
+import os
+import time
+from typing import Any, Callable, Dict, List
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+
+import main
+
+
+def _interview_payload() -> Dict[str, Any]:
+    questions = [
+        {
+            "question": f"Design a rate limiter for service {i} handling bursty traffic across regions.",
+            "category": "System Design",
+            "difficulty": "Hard",
+            "expected_answer": "Token bucket per client, shared state in Redis, sliding window fallback. " * 6,
+            "tips": [f"Tip {j}: discuss trade-offs, failure modes and observability." for j in range(7)],
+        }
+        for i in range(12)
+    ]
+    return {
+        "id": "0b7c3c52-3c1f-4c55-9d1e-1f1a7f1a2b3c",
+        "company": "Acme",
+        "position": "Senior Software Engineer",
+        "interview_type": "Technical",
+        "categories": [{"name": "Technical Questions", "description": "...", "icon": "brain", "questions": questions}],
+        "created_at": "2025-01-01T12:00:00",
+        "estimated_duration": 120,
+        "difficulty_level": "Senior",
+    }
+
+
+def _behavioral_payload() -> List[Dict[str, Any]]:
+    def series(n):
+        return [{"t": t * 2.5, "score": 50 + (t % 40)} for t in range(n)]
+
+    return [
+        {
+            "id": r,
+            "date": "2025-01-01T12:00:00",
+            "confidence_score": 72,
+            "eye_contact_score": 65,
+            "posture_score": 80,
+            "speech_clarity": 70,
+            "overall_feedback": "Good interview presence with room for minor improvements.",
+            "improvements": ["Maintain steady eye contact", "Quantify results"],
+            "trends": {"emotion": series(240), "focus": series(240), "responseQuality": series(240)},
+            "segments": [
+                {
+                    "tStart": s * 30.0,
+                    "tEnd": s * 30.0 + 28.0,
+                    "transcript": "In my last role I led the migration of our billing service. " * 8,
+                    "star": {"situation": True, "task": True, "action": True, "result": s % 2 == 0, "completeness": 0.75},
+                    "metrics": {"clarity": 70, "confidence": 68, "engagement": 74, "emotion": 60},
+                }
+                for s in range(20)
+            ],
+        }
+        for r in range(5)
+    ]
+
+
+def _unified_payload() -> Dict[str, Any]:
+    return {
+        "ai": {
+            "evaluation": {"score": 78, "verdict": "Good"},
+            "summary": "Solid answer covering the main trade-offs.",
+            "visual_prompt": "Diagram of a token bucket",
+            "explanation": "**Strengths**\n- Clear structure\n- Good trade-offs\n" * 10,
+            "theory": "Rate limiting protects shared resources." * 5,
+        },
+        "image": base64.b64encode(b"<svg>" + b"x" * 40_000 + b"</svg>").decode(),
+        "audio": base64.b64encode(os.urandom(300_000)).decode(),
+    }
+
+
+def _stats_payload() -> Dict[str, Any]:
+    return {
+        "total_interviews": 42,
+        "completed_sessions": 17,
+        "success_rate": 71.3,
+        "average_score": 76.4,
+        "study_hours": 31.5,
+        "questions_practiced": 388,
+        "companies_applied": 0,
+        "interviews_scheduled": 0,
+    }
+
+
+CASES = [
+    ("/dashboard/stats", main.DashboardStatsResponse, _stats_payload),
+    ("/dashboard/behavioral?view=full", List[main.BehavioralSummary], _behavioral_payload),
+    ("/generate-interview", main.GeneratedInterview, _interview_payload),
+    ("/interview", main.UnifiedInterviewResponse, _unified_payload),
+]
+
+
+def _time(fn: Callable[[], bytes], rounds: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def run(rounds: int = 200) -> List[Dict[str, Any]]:
+    results = []
+    for name, model, make in CASES:
+        payload = make()
+        adapter = TypeAdapter(model)
+
+        def default_path():
+            return JSONResponse(content=jsonable_encoder(payload)).body
+
+        def fast_path():
+            value = adapter.validate_python(payload)
+            return ORJSONResponse(content=adapter.dump_python(value, mode="json")).body
+
+        results.append({
+            "endpoint": name,
+            "default_us": _time(default_path, rounds),
+            "orjson_us": _time(fast_path, rounds),
+            "default_bytes": len(default_path()),
+            "orjson_bytes": len(fast_path()),
+        })
+    return results
+
+
+if __name__ == "__main__":
+    print(f"{'endpoint':34} {'default us':>11} {'orjson us':>10} {'speedup':>8} {'bytes':>10}")
+    for r in run():
+        speedup = r["default_us"] / r["orjson_us"] if r["orjson_us"] else 0
+        print(f"{r['endpoint']:34} {r['default_us']:11.1f} {r['orjson_us']:10.1f} {speedup:7.1f}x {r['orjson_bytes']:10d}")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the API process based on `python -X importtime`.
+
+Imports `main` in fresh interpreters, reports wall time and the slowest
+top-level imports, and checks that heavy optional modules stay unloaded.
+
+    cd backend && python -m benchmarks.startup [--runs 5] [--top 10]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that should only load when the endpoint needing them is first hit
+DEFERRED_MODULES = ["cv2", "numpy", "google.generativeai", "bs4", "google_auth_oauthlib", "jose", "passlib"]
+
+
+def _import_once():
+    probe = (
+        "import sys, main; "
+        f"print(','.join(m for m in {DEFERRED_MODULES!r} if m in sys.modules))"
+    )
+    env = {**os.environ, "DATABASE_URL": os.environ.get("DATABASE_URL", "sqlite:///:memory:")}
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    wall = time.perf_counter() - start
+    return wall, proc.stdout.strip(), proc.stderr
+
+
+def _parse_importtime(stderr: str):
+    """(module, nesting level, cumulative us) for every line of -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        # One separator space, then two spaces per nesting level
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), level, int(cumulative_us)))
+    return rows
+
+
+def run(runs: int = 5, top: int = 10):
+    walls, loaded, last_stderr = [], "", ""
+    for _ in range(runs):
+        wall, loaded, last_stderr = _import_once()
+        walls.append(wall)
+    rows = _parse_importtime(last_stderr)
+    main_us = next((us for name, level, us in rows if name == "main" and level == 0), 0)
+    # Direct imports made by main sit one level below it
+    slowest = sorted(((name, us) for name, level, us in rows if level == 1), key=lambda r: r[1], reverse=True)[:top]
+    return {
+        "wall_median_s": statistics.median(walls),
+        "import_main_ms": main_us / 1000,
+        "slowest": slowest,
+        "deferred_loaded": [m for m in loaded.split(",") if m],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    r = run(args.runs, args.top)
+    print(f"cold start (median of {args.runs}): {r['wall_median_s'] * 1000:.0f} ms wall, import main {r['import_main_ms']:.0f} ms")
+    print("slowest imports under main:")
+    for name, us in r["slowest"]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+    if r["deferred_loaded"]:
+        print(f"WARNING: heavy modules loaded at import: {', '.join(r['deferred_loaded'])}")
+        sys.exit(1)
+    print("heavy modules deferred: " + ", ".join(DEFERRED_MODULES))
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Gemini and ElevenLabs APIs.
+
+Replays the recorded responses in benchmarks/recordings/ with a lognormal
+latency and a configurable error rate, so benchmarks measure this service and
+not the network. Point the backend at it with GEMINI_API_ENDPOINT and
+ELEVENLABS_API_BASE (see services/upstream.py).
+
+    cd backend && python -m benchmarks.stub_upstream --port 9100 --gemini-ms 900 --error-rate 0.02
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RECORDINGS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "recordings")
+
+# Medians approximate typical latencies for these calls; sigma widens the tail
+DEFAULT_PROFILE = {
+    "gemini": {"median_ms": 900.0, "sigma": 0.35, "error_rate": 0.0, "error_status": 503, "ms_per_token": 0.0, "ms_per_input_kb": 0.0},
+    "elevenlabs": {"median_ms": 450.0, "sigma": 0.3, "error_rate": 0.0, "error_status": 500},
+}
+
+_GEMINI_PATH = re.compile(r"^/v1(beta)?/models/[^/:]+:(stream)?[gG]enerateContent")
+# Streamed responses: first chunk after this share of the drawn latency, the rest spread evenly
+STREAM_FIRST_CHUNK = 0.2
+STREAM_CHUNK_CHARS = 160
+_TTS_PATH = re.compile(r"^/v1/text-to-speech/[^/]+")
+
+
+def load_recordings():
+    with open(os.path.join(RECORDINGS_DIR, "gemini.json")) as f:
+        gemini = json.load(f)
+    with open(os.path.join(RECORDINGS_DIR, "elevenlabs.json")) as f:
+        tts = json.load(f)
+    return gemini, tts
+
+
+def _prompt_text(body: dict) -> str:
+    return " ".join(
+        part.get("text", "")
+        for content in body.get("contents", [])
+        for part in content.get("parts", [])
+    )
+
+
+def _recorded_text(recordings, prompt: str) -> str:
+    for rec in recordings:
+        if rec["match"] in prompt:
+            return rec["text"] if "text" in rec else json.dumps(rec["response"])
+    return "{}"
+
+
+def _audio(tts: dict) -> bytes:
+    # Size-matched placeholder for the recorded clip: MPEG-1 layer III frame headers and silence
+    frame = b"\xff\xfb\x90\x64" + b"\x00" * 413
+    return (frame * (tts["size"] // len(frame) + 1))[: tts["size"]]
+
+
+def start_stub(profile=None, latency_scale: float = 1.0, seed: int = 0, host: str = "127.0.0.1", port: int = 0):
+    """Start the stub on a background thread; returns (server, stats).
+
+    ``stats`` counts requests and injected errors per upstream.
+    """
+    profile = {k: {**v, **(profile or {}).get(k, {})} for k, v in DEFAULT_PROFILE.items()}
+    gemini, tts = load_recordings()
+    audio = _audio(tts)
+    rng = random.Random(seed)
+    lock = threading.Lock()
+    stats = {name: {"requests": 0, "errors": 0} for name in profile}
+
+    def draw(name: str):
+        p = profile[name]
+        with lock:
+            stats[name]["requests"] += 1
+            delay = p["median_ms"] * math.exp(p["sigma"] * rng.gauss(0, 1)) * latency_scale / 1000
+            fail = rng.random() < p["error_rate"]
+            if fail:
+                stats[name]["errors"] += 1
+        return delay, fail
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _reply(self, status: int, body: bytes, content_type: str):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _stream(self, text: str, delay: float):
+            # streamGenerateContent without alt=sse: one JSON array of responses, chunked
+            pieces = [text[i:i + STREAM_CHUNK_CHARS] for i in range(0, len(text), STREAM_CHUNK_CHARS)] or [""]
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for i, piece in enumerate(pieces):
+                if i:
+                    time.sleep(delay * (1 - STREAM_FIRST_CHUNK) / (len(pieces) - 1))
+                candidate = {"content": {"parts": [{"text": piece}], "role": "model"}, "index": 0}
+                if i == len(pieces) - 1:
+                    candidate["finishReason"] = "STOP"
+                data = ("[" if i == 0 else ",") + json.dumps({"candidates": [candidate]})
+                if i == len(pieces) - 1:
+                    data += "]"
+                self._chunk(data.encode())
+            self._chunk(b"")
+
+        def _chunk(self, data: bytes):
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            raw = self.rfile.read(length) if length else b""
+            path = self.path.split("?", 1)[0]
+            if _GEMINI_PATH.match(path):
+                delay, fail = draw("gemini")
+                text = _recorded_text(gemini, _prompt_text(json.loads(raw or b"{}")))
+                # Decoding time grows with the output (~4 characters per token)
+                delay += len(text) / 4 * profile["gemini"]["ms_per_token"] * latency_scale / 1000
+                # Upload and prompt processing grow with the request (inline media included)
+                delay += len(raw) / 1024 * profile["gemini"]["ms_per_input_kb"] * latency_scale / 1000
+                time.sleep(delay * STREAM_FIRST_CHUNK if ":stream" in path else delay)
+                status = profile["gemini"]["error_status"]
+                if fail:
+                    error = {"error": {"code": status, "message": "stub: injected error", "status": "UNAVAILABLE"}}
+                    return self._reply(status, json.dumps(error).encode(), "application/json")
+                if ":stream" in path:
+                    return self._stream(text, delay)
+                body = {
+                    "candidates": [{"content": {"parts": [{"text": text}], "role": "model"}, "finishReason": "STOP", "index": 0}],
+                    "usageMetadata": {"promptTokenCount": len(raw) // 4, "candidatesTokenCount": len(text) // 4},
+                }
+                return self._reply(200, json.dumps(body).encode(), "application/json")
+            if _TTS_PATH.match(path):
+                delay, fail = draw("elevenlabs")
+                time.sleep(delay)
+                if fail:
+                    return self._reply(profile["elevenlabs"]["error_status"], b'{"detail":"stub: injected error"}', "application/json")
+                return self._reply(200, audio, tts["content_type"])
+            self._reply(404, b"{}", "application/json")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, stats
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--gemini-ms", type=float, default=DEFAULT_PROFILE["gemini"]["median_ms"], help="median Gemini latency")
+    parser.add_argument("--gemini-ms-per-token", type=float, default=0.0, help="extra Gemini latency per output token")
+    parser.add_argument("--gemini-ms-per-input-kb", type=float, default=0.0, help="extra Gemini latency per KB of request body")
+    parser.add_argument("--elevenlabs-ms", type=float, default=DEFAULT_PROFILE["elevenlabs"]["median_ms"], help="median ElevenLabs latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of upstream calls that fail")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="multiply every upstream latency")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def profile_from_args(args) -> dict:
+    return {
+        "gemini": {"median_ms": args.gemini_ms, "error_rate": args.error_rate, "ms_per_token": args.gemini_ms_per_token,
+                   "ms_per_input_kb": args.gemini_ms_per_input_kb},
+        "elevenlabs": {"median_ms": args.elevenlabs_ms, "error_rate": args.error_rate},
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    server, stats = start_stub(profile_from_args(args), args.latency_scale, args.seed, args.host, args.port)
+    print(f"stub upstream on http://{args.host}:{server.server_port}")
+    print(f"  GEMINI_API_ENDPOINT=http://{args.host}:{server.server_port}")
+    print(f"  ELEVENLABS_API_BASE=http://{args.host}:{server.server_port}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print(json.dumps(stats))
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+End-to-end latency suite against recorded Gemini/ElevenLabs stand-ins.
+
+Starts the stub upstream (benchmarks/stub_upstream.py) and a single uvicorn
+process pointed at it, drives each endpoint at a fixed concurrency, and
+reports p50/p95/p99, throughput and server RSS. Results are compared with
+benchmarks/baselines/suite.json; a slower p50/p95, lower throughput or larger
+RSS beyond ``--tolerance`` exits non-zero.
+
+    cd backend && python -m benchmarks.suite [--only interview dashboard-stats] [--error-rate 0.05]
+    cd backend && python -m benchmarks.suite --save-baseline   # after an intended change
+    cd backend && python -m benchmarks.suite --only dashboard-stats --data-scale 10x
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.stub_upstream import add_profile_arguments, profile_from_args, start_stub
+from benchmarks.synthetic_data import SCALES
+from benchmarks.workers import BACKEND_DIR, _frame_b64, _free_port, _wait_ready
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "suite.json")
+
+SAMPLE_EMAIL = """
+<p>Hi Jordan,</p>
+<p>Thanks for applying to the <b>Senior Backend Engineer</b> role at Acme Robotics. We'd like to invite you
+to a technical interview over video on Thursday. The loop is two 60 minute rounds covering coding in Python
+and a system design discussion (PostgreSQL, Redis, Kubernetes).</p>
+<p>Best,<br/>Priya, Recruiting</p>
+"""
+
+PARSED_EMAIL = {
+    "company": "Acme Robotics",
+    "position": "Senior Backend Engineer",
+    "interview_type": "Technical",
+    "skills": ["Python", "PostgreSQL", "Kubernetes"],
+    "experience_level": "Senior",
+}
+
+QUESTION = {
+    "question": "Implement an LRU cache with O(1) get and put.",
+    "category": "Data Structures",
+    "difficulty": "Medium",
+    "company": "Acme Robotics",
+    "position": "Senior Backend Engineer",
+    "level": "Senior",
+}
+
+ANSWER = {
+    "question": "Implement an LRU cache with O(1) get and put.",
+    "answer": "I'd keep a hash map from key to a node in a doubly linked list and move nodes to the head on access.",
+    "mode": "text",
+    "voice": "rachel",
+}
+
+
+def _video_bytes(seconds: int = 3, fps: int = 10) -> bytes:
+    import cv2
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    path = os.path.join(tempfile.mkdtemp(), "clip.mp4")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (320, 240))
+    for _ in range(seconds * fps):
+        writer.write(rng.integers(0, 255, size=(240, 320, 3), dtype=np.uint8))
+    writer.release()
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _multipart(field: str, filename: str, data: bytes, content_type: str):
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"{field}\"; filename=\"{filename}\"\r\n"
+        f"Content-Type: {content_type}\r\n\r\n"
+    ).encode() + data + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def scenarios():
+    """(name, method, path, body, content type, default concurrency) per endpoint."""
+    as_json = lambda obj: (json.dumps(obj).encode(), "application/json")
+    frame = {"session_id": "bench", "timestamp": 0, "image_b64": _frame_b64(),
+             "transcript_segment": "At my last job our checkout service kept timing out during sales."}
+    return [
+        ("parse-email", "POST", "/parse-email", *as_json({"content": SAMPLE_EMAIL}), 8),
+        ("generate-interview", "POST", "/generate-interview", *as_json(PARSED_EMAIL), 8),
+        ("generate-interview-lazy", "POST", "/generate-interview?detail=lazy", *as_json(PARSED_EMAIL), 8),
+        ("question-detail", "POST", "/questions/{id}/detail", *as_json(QUESTION), 8),
+        ("interview", "POST", "/interview", *as_json(ANSWER), 8),
+        ("behavioral-chunk", "POST", "/behavioral/chunk", *as_json(frame), 16),
+        ("analyze-behavioral", "POST", "/analyze-behavioral", *_multipart("video_file", "clip.mp4", _video_bytes(), "video/mp4"), 4),
+        ("dashboard-stats", "GET", "/dashboard/stats?user_id=1", None, None, 16),
+        ("dashboard-progress", "GET", "/dashboard/progress?user_id=1", None, None, 16),
+        ("dashboard-activity", "GET", "/dashboard/recent-activity?user_id=1", None, None, 16),
+        ("dashboard-behavioral", "GET", "/dashboard/behavioral?user_id=1", None, None, 16),
+    ]
+
+
+def _request(url: str, method: str, body, content_type):
+    req = urllib.request.Request(url, data=body, method=method)
+    if content_type:
+        req.add_header("Content-Type", content_type)
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=120) as r:
+            r.read()
+        ok = True
+    except urllib.error.HTTPError as e:
+        e.read()
+        ok = e.code < 500
+    return time.perf_counter() - start, ok
+
+
+def _rss_mb(pid: int, field: str = "VmRSS"):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _percentile(sorted_values, q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))]
+
+
+def _seed_dashboard(base: str, rows: int = 60):
+    """Give the dashboard queries something to read."""
+    topics = ["arrays", "graphs", "dynamic programming", "system design"]
+    for i in range(rows):
+        posts = [
+            ("/tracking/interview", {"type": "technical", "difficulty": "medium", "score": 50 + i % 50, "duration": 1800,
+                                      "questions": [{"question": "q", "correct": i % 2 == 0}]}),
+            ("/tracking/study", {"topic": topics[i % 4], "difficulty": "medium", "questionsAttempted": 10,
+                                  "questionsCorrect": i % 10, "durationMin": 25}),
+            ("/tracking/dsa", {"topic": topics[i % 4], "difficulty": "hard", "correct": i % 3 == 0}),
+            ("/tracking/mentor", {"topic": topics[i % 4], "messageCount": 12, "durationMin": 15}),
+        ]
+        for path, payload in posts:
+            _request(f"{base}{path}?user_id=1", "POST", json.dumps(payload).encode(), "application/json")
+        finish = {"session_id": f"s{i}", "overall": {"confidence_score": 70, "eye_contact_score": 60, "posture_score": 80,
+                  "speech_clarity": 75, "overall_feedback": "ok", "improvements": ["slow down"]},
+                  "trends": {"emotion": []}, "segments": []}
+        _request(f"{base}/behavioral/finish?user_id=1", "POST", json.dumps(finish).encode(), "application/json")
+
+
+def run_scenario(base: str, pid: int, scenario, requests: int, concurrency=None):
+    name, method, path, body, content_type, default_concurrency = scenario
+    concurrency = concurrency or default_concurrency
+    # "{id}" in a path becomes a fresh id per request, so nothing is served from a cache
+    url = lambda: f"{base}{path}".replace("{id}", uuid.uuid4().hex)
+    for _ in range(2):
+        _request(url(), method, body, content_type)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        results = list(pool.map(lambda _: _request(url(), method, body, content_type), range(requests)))
+    elapsed = time.perf_counter() - start
+    latencies = sorted(lat for lat, ok in results if ok)
+    errors = sum(1 for _, ok in results if not ok)
+    if not latencies:
+        return {"name": name, "concurrency": concurrency, "errors": errors}
+    return {
+        "name": name,
+        "concurrency": concurrency,
+        "p50_ms": _percentile(latencies, 0.50) * 1000,
+        "p95_ms": _percentile(latencies, 0.95) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        "rps": len(latencies) / elapsed,
+        "errors": errors,
+        "rss_mb": _rss_mb(pid),
+    }
+
+
+def compare(results, baseline, tolerance: float, min_delta_ms: float):
+    """Names of metrics that regressed past the tolerance, per scenario.
+
+    Latency must also grow by ``min_delta_ms`` so scheduler noise on
+    millisecond endpoints does not fail the run.
+    """
+    regressions = {}
+    for r in results:
+        base = baseline.get(r["name"])
+        if not base or "p50_ms" not in r:
+            continue
+        slower = lambda m: r[m] > base[m] * (1 + tolerance) and r[m] - base[m] > min_delta_ms
+        bad = [m for m in ("p50_ms", "p95_ms") if base.get(m) and slower(m)]
+        if r.get("rss_mb") and base.get("rss_mb") and r["rss_mb"] > base["rss_mb"] * (1 + tolerance):
+            bad.append("rss_mb")
+        # At fixed concurrency throughput tracks latency; only count it when p50 moved too
+        if base.get("rps") and r["rps"] < base["rps"] * (1 - tolerance) and "p50_ms" in bad:
+            bad.append("rps")
+        if r["errors"] > base.get("errors", 0):
+            bad.append("errors")
+        if bad:
+            regressions[r["name"]] = bad
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--only", nargs="+", help="scenario names to run")
+    parser.add_argument("--requests", type=int, default=30, help="requests per scenario")
+    parser.add_argument("--concurrency", type=int, help="override every scenario's concurrency")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown before failing")
+    parser.add_argument("--min-delta-ms", type=float, default=25.0, help="ignore latency changes smaller than this")
+    parser.add_argument("--data-scale", choices=list(SCALES), help="preload synthetic progress data; dashboards then read user 1, the heaviest")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    stub, stub_stats = start_stub(profile_from_args(args), args.latency_scale, args.seed)
+    stub_url = f"http://127.0.0.1:{stub.server_port}"
+    port = _free_port()
+    workdir = tempfile.mkdtemp()
+    env = {
+        **os.environ,
+        "GEMINI_API_KEY": "benchmark",
+        "GEMINI_API_ENDPOINT": stub_url,
+        "ELEVENLABS_API_KEY": "benchmark",
+        "ELEVENLABS_API_BASE": stub_url,
+        "DATABASE_URL": f"sqlite:///{workdir}/bench.db",
+        "ARTIFACT_DIR": os.path.join(workdir, "artifacts"),
+        # The suite addresses its synthetic user by ?user_id=
+        "ALLOW_QUERY_USER_ID": "true",
+    }
+    if args.data_scale:
+        from sqlalchemy import create_engine
+        from benchmarks.synthetic_data import load
+
+        engine = create_engine(env["DATABASE_URL"])
+        load(engine, args.data_scale, args.seed)
+        engine.dispose()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base = f"http://127.0.0.1:{port}"
+    results = []
+    try:
+        _wait_ready(base)
+        selected = [s for s in scenarios() if not args.only or s[0] in args.only]
+        if not args.data_scale and any(s[0].startswith("dashboard") for s in selected):
+            _seed_dashboard(base)
+        for scenario in selected:
+            results.append(run_scenario(base, proc.pid, scenario, args.requests, args.concurrency))
+            print(f"  {scenario[0]} done", file=sys.stderr)
+        peak_rss = _rss_mb(proc.pid, "VmHWM")
+    finally:
+        proc.terminate()
+        proc.wait(timeout=60)
+        stub.shutdown()
+
+    config = {k: getattr(args, k) for k in ("requests", "concurrency", "gemini_ms", "gemini_ms_per_token", "elevenlabs_ms", "error_rate", "latency_scale", "seed")}
+    if args.data_scale:
+        config["data_scale"] = args.data_scale
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            stored = json.load(f)
+        baseline = stored["scenarios"]
+        if stored.get("config") != config:
+            print(f"note: baseline was recorded with {stored.get('config')}, this run used {config}")
+    regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+
+    print(f"{'scenario':<22} {'conc':>4} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>7} {'err':>4} {'rss MB':>7}  vs baseline p95")
+    for r in results:
+        if "p50_ms" not in r:
+            print(f"{r['name']:<22} {r['concurrency']:>4} all {r['errors']} requests failed")
+            continue
+        base_p95 = baseline.get(r["name"], {}).get("p95_ms")
+        delta = f"{(r['p95_ms'] / base_p95 - 1) * 100:+.0f}%" if base_p95 else "-"
+        flag = "  REGRESSION: " + ", ".join(regressions[r["name"]]) if r["name"] in regressions else ""
+        rss = f"{r['rss_mb']:7.0f}" if r["rss_mb"] is not None else "      -"
+        print(f"{r['name']:<22} {r['concurrency']:>4} {r['p50_ms']:8.1f} {r['p95_ms']:8.1f} {r['p99_ms']:8.1f} "
+              f"{r['rps']:7.1f} {r['errors']:>4} {rss}  {delta}{flag}")
+    if peak_rss is not None:
+        print(f"peak server RSS {peak_rss:.0f} MB")
+    print(f"upstream calls: {json.dumps(stub_stats)}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump({"config": config, "scenarios": {r["name"]: r for r in results}}, f, indent=2)
+            f.write("\n")
+        print(f"baseline written to {args.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} scenario(s) regressed more than {args.tolerance:.0%} against {args.baseline}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
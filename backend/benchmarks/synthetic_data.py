@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic data for the progress tables.
+
+Per-user activity follows a Pareto distribution (a few power users, a long
+tail of occasional ones). Each user's events arrive in bursts around
+recency-biased practice weeks, and topics follow a Zipf distribution plus a
+per-user focus topic. User ids are assigned by activity, so user 1 is the
+heaviest. Rows go through executemany on SQLite and COPY on Postgres.
+
+    cd backend && DATABASE_URL=sqlite:////tmp/scale.db python -m benchmarks.synthetic_data --scale 10x
+"""
+
+import argparse
+import csv
+import io
+import json
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select, text
+
+from database import (
+    Base,
+    User,
+    InterviewAttempt,
+    StudySession,
+    DSAAttempt,
+    MentorSession,
+    BehavioralAnalysis,
+)
+
+# 1x is the reference volume; the other scales multiply the user count
+BASE_USERS = 1000
+BASE_EVENTS_PER_USER = 60
+SCALES = {"1x": 1, "10x": 10, "100x": 100}
+
+PARETO_ALPHA = 1.2
+MAX_EVENTS_PER_USER = 5000  # roughly 14 events a day for a year; beyond that is a bot, not a power user
+HISTORY_DAYS = 365
+
+TOPICS = [
+    "arrays", "strings", "hash tables", "trees", "graphs", "dynamic programming", "system design",
+    "linked lists", "heaps", "binary search", "recursion", "sorting", "bit manipulation", "tries",
+]
+TOPIC_WEIGHTS = [1 / (rank + 1) ** 1.1 for rank in range(len(TOPICS))]
+COMPANIES = ["Google", "Amazon", "Meta", "Microsoft", "Apple", "Netflix", "Stripe", "Uber", "Airbnb", "Datadog"]
+COMPANY_WEIGHTS = [1 / (rank + 1) for rank in range(len(COMPANIES))]
+POSITIONS = ["Software Engineer", "Senior Software Engineer", "Backend Engineer", "Frontend Engineer", "Data Engineer"]
+DIFFICULTIES = ["easy", "medium", "hard"]
+DIFFICULTY_WEIGHTS = [0.3, 0.5, 0.2]
+INTERVIEW_TYPES = ["quick", "full", "behavioral", "system-design"]
+INTERVIEW_TYPE_WEIGHTS = [0.45, 0.3, 0.15, 0.1]
+
+# Share of a user's events per table
+EVENT_KINDS = ["study", "dsa", "interview", "mentor", "behavioral"]
+EVENT_WEIGHTS = [0.40, 0.35, 0.12, 0.08, 0.05]
+
+
+class _Writer:
+    """Buffers rows per table and flushes them with the backend's fastest bulk path."""
+
+    def __init__(self, conn, batch_size: int):
+        self.conn = conn
+        self.batch_size = batch_size
+        self.buffers = {}
+        self.counts = {}
+        self.use_copy = conn.dialect.name == "postgresql"
+
+    def add(self, table, row: dict):
+        buf = self.buffers.setdefault(table, [])
+        buf.append(row)
+        if len(buf) >= self.batch_size:
+            self.flush(table)
+
+    def flush(self, table=None):
+        for t in [table] if table is not None else list(self.buffers):
+            rows = self.buffers.get(t)
+            if not rows:
+                continue
+            if self.use_copy:
+                self._copy(t, rows)
+            else:
+                self.conn.execute(t.insert(), rows)
+            self.counts[t.name] = self.counts.get(t.name, 0) + len(rows)
+            self.buffers[t] = []
+
+    def _copy(self, table, rows):
+        cols = list(rows[0])
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        for row in rows:
+            writer.writerow([_copy_value(row[c]) for c in cols])
+        buf.seek(0)
+        sql = f"COPY {table.name} ({', '.join(cols)}) FROM STDIN WITH (FORMAT csv)"
+        cursor = self.conn.connection.driver_connection.cursor()
+        try:
+            if hasattr(cursor, "copy_expert"):  # psycopg2
+                cursor.copy_expert(sql, buf)
+            else:  # psycopg 3
+                with cursor.copy(sql) as copy:
+                    copy.write(buf.getvalue())
+        finally:
+            cursor.close()
+
+
+def _copy_value(value):
+    # csv writes None as an unquoted empty field, which COPY reads as NULL
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    return value
+
+
+def _events_per_user(rng: random.Random, users: int, total: int):
+    weights = [rng.paretovariate(PARETO_ALPHA) for _ in range(users)]
+    scale = total / sum(weights)
+    counts = [min(MAX_EVENTS_PER_USER, max(1, round(w * scale))) for w in weights]
+    return sorted(counts, reverse=True)
+
+
+def _timestamps(rng: random.Random, n: int, end: datetime):
+    """Event times clustered into practice bursts, more of them in recent weeks."""
+    bursts = []
+    for _ in range(1 + n // 25):
+        days_ago = min(HISTORY_DAYS - 7, rng.expovariate(1 / 60) if rng.random() < 0.7 else rng.uniform(0, HISTORY_DAYS))
+        bursts.append(end - timedelta(days=days_ago))
+    out = []
+    for _ in range(n):
+        center = rng.choice(bursts)
+        # Within a burst: a few days either side, mostly in the evening
+        day = center + timedelta(days=round(rng.gauss(0, 2)))
+        hour = min(23, max(7, int(rng.gauss(20, 3))))
+        ts = day.replace(hour=hour, minute=rng.randrange(60), second=rng.randrange(60))
+        if ts >= end:
+            ts -= timedelta(days=(ts - end).days + 1)
+        out.append(ts)
+    return out
+
+
+def _trend(rng: random.Random, points: int, base: int):
+    return [{"t": t * 5, "score": max(0, min(100, base + round(rng.gauss(0, 8))))} for t in range(points)]
+
+
+def _user_events(rng: random.Random, user_id: int, n: int, end: datetime, writer: _Writer):
+    focus = rng.choices(TOPICS, TOPIC_WEIGHTS)[0]
+    skill = rng.betavariate(2, 2)  # per-user success rate
+    topic = lambda: focus if rng.random() < 0.4 else rng.choices(TOPICS, TOPIC_WEIGHTS)[0]
+    for ts in _timestamps(rng, n, end):
+        kind = rng.choices(EVENT_KINDS, EVENT_WEIGHTS)[0]
+        difficulty = rng.choices(DIFFICULTIES, DIFFICULTY_WEIGHTS)[0]
+        if kind == "study":
+            attempted = rng.randint(3, 20)
+            writer.add(StudySession.__table__, {
+                "user_id": user_id, "topic": topic(), "difficulty": difficulty,
+                "questions_attempted": attempted,
+                "questions_correct": sum(rng.random() < skill for _ in range(attempted)),
+                "duration_min": round(rng.lognormvariate(3.0, 0.5), 1), "completed_at": ts,
+            })
+        elif kind == "dsa":
+            company = rng.choices(COMPANIES, COMPANY_WEIGHTS)[0] if rng.random() < 0.6 else None
+            writer.add(DSAAttempt.__table__, {
+                "user_id": user_id, "company": company,
+                "position": rng.choice(POSITIONS) if company else None,
+                "topic": topic(), "difficulty": difficulty, "correct": rng.random() < skill, "attempted_at": ts,
+            })
+        elif kind == "interview":
+            questions = [{"question": f"{topic()} question", "correct": rng.random() < skill} for _ in range(rng.randint(3, 8))]
+            writer.add(InterviewAttempt.__table__, {
+                "user_id": user_id, "type": rng.choices(INTERVIEW_TYPES, INTERVIEW_TYPE_WEIGHTS)[0],
+                "difficulty": difficulty, "score": round(100 * sum(q["correct"] for q in questions) / len(questions)),
+                "duration_sec": int(rng.lognormvariate(7.3, 0.4)), "questions": questions, "completed_at": ts,
+            })
+        elif kind == "mentor":
+            writer.add(MentorSession.__table__, {
+                "user_id": user_id, "topic": topic(), "message_count": rng.randint(2, 60),
+                "duration_min": round(rng.lognormvariate(2.5, 0.6), 1), "started_at": ts,
+            })
+        else:
+            base = int(40 + 50 * skill)
+            writer.add(BehavioralAnalysis.__table__, {
+                "user_id": user_id, "session_id": None,
+                "confidence_score": base, "eye_contact_score": max(0, base - rng.randint(0, 20)),
+                "posture_score": min(100, base + rng.randint(0, 15)), "speech_clarity": base,
+                "overall_feedback": "Clear structure; tighten the result.",
+                "improvements": ["Quantify the result", "Keep eye contact while answering"],
+                "trends": {k: _trend(rng, 12, base) for k in ("emotion", "focus", "responseQuality")},
+                "segments": [{"tStart": 0, "tEnd": 30, "transcript": "Situation and task.", "star": {"completeness": 50}}],
+                "created_at": ts,
+            })
+
+
+def load(engine, scale: str = "1x", seed: int = 0, end: datetime = None, batch_size: int = 20000, progress=None):
+    """Create the schema and bulk-load ``scale`` worth of users and events; returns row counts per table.
+
+    The target must not contain users yet. Same seed, scale and end date give the same rows.
+    """
+    factor = SCALES[scale] if isinstance(scale, str) else scale
+    end = end or datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    rng = random.Random(seed)
+    users = BASE_USERS * factor
+    Base.metadata.create_all(bind=engine)
+
+    with engine.begin() as conn:
+        if conn.execute(select(func.count()).select_from(User.__table__)).scalar():
+            raise ValueError("target database already has users; load into an empty database")
+        if conn.dialect.name == "sqlite":
+            # Bulk load only: skip fsync for this connection's transaction
+            conn.exec_driver_sql("PRAGMA synchronous=OFF")
+        writer = _Writer(conn, batch_size)
+        counts = _events_per_user(rng, users, users * BASE_EVENTS_PER_USER)
+        for i, n in enumerate(counts, start=1):
+            joined = end - timedelta(days=rng.uniform(0, HISTORY_DAYS))
+            writer.add(User.__table__, {
+                "id": i, "google_id": f"synthetic-{i}", "email": f"user{i}@example.com", "name": f"User {i}",
+                "picture": None, "verified_email": True, "created_at": joined, "updated_at": joined,
+                "is_active": True, "token_version": 0,
+            })
+            _user_events(rng, i, n, end, writer)
+            if progress and i % 1000 == 0:
+                progress(i, users)
+        writer.flush()
+        if conn.dialect.name == "postgresql":
+            # Explicit ids bypass the sequence; move it past them for later inserts
+            conn.execute(text("SELECT setval(pg_get_serial_sequence('users', 'id'), (SELECT MAX(id) FROM users))"))
+    return writer.counts
+
+
+if __name__ == "__main__":
+    import sys
+    from database import engine, DATABASE_URL
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", choices=list(SCALES), default="1x")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = load(engine, args.scale, args.seed, progress=lambda i, n: print(f"  {i}/{n} users", file=sys.stderr))
+    elapsed = time.perf_counter() - start
+    total = sum(counts.values())
+    print(f"loaded {total} rows into {DATABASE_URL} in {elapsed:.1f}s ({total / elapsed:,.0f} rows/s)")
+    for name, n in sorted(counts.items()):
+        print(f"  {name:<22} {n:>10}")
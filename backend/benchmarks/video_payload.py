@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Gemini payload for full-video analysis: the raw upload vs keyframe montage + audio.
+
+Renders a synthetic interview recording (a moving face-sized shape over a
+textured background with a few scene cuts, plus a speech-like audio track
+when ffmpeg is available), then runs BehavioralAnalyzer._analyze_video_llm
+against the stub upstream with VIDEO_LLM_PAYLOAD=raw and =montage. Reports
+request payload bytes, estimated input tokens (Gemini's published rates:
+258 tokens per video frame at 1 fps or per 768 px image tile, 32 per second
+of audio), local preprocessing time and end-to-end latency. The stub charges
+``--gemini-ms-per-input-kb`` for each KB sent, standing in for upload and
+prompt processing.
+
+    cd backend && python -m benchmarks.video_payload [--seconds 120] [--runs 3]
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import statistics
+import subprocess
+import tempfile
+import time
+import wave
+
+import numpy as np
+
+from benchmarks.stub_upstream import add_profile_arguments, profile_from_args, start_stub
+
+
+def render_recording(seconds: int, fps: int = 30, size=(640, 480)) -> str:
+    import cv2
+
+    from services.speech_metrics import FFMPEG
+
+    w, h = size
+    rng = np.random.default_rng(0)
+    workdir = tempfile.mkdtemp()
+    video = os.path.join(workdir, "video.mp4")
+    writer = cv2.VideoWriter(video, cv2.VideoWriter_fourcc(*"mp4v"), fps, size)
+    texture = rng.integers(0, 40, size=(h, w, 3), dtype=np.uint8)
+    backgrounds = [(90, 110, 130), (60, 80, 60), (120, 90, 70), (80, 80, 110)]
+    for i in range(seconds * fps):
+        t = i / fps
+        frame = np.full((h, w, 3), backgrounds[int(t // 20) % len(backgrounds)], dtype=np.uint8) + texture
+        cx = int(w / 2 + 40 * math.sin(t / 3))
+        cv2.ellipse(frame, (cx, h // 3 + 20), (70, 90), 0, 0, 360, (150, 170, 210), -1)
+        cv2.rectangle(frame, (cx - 140, h // 3 + 120), (cx + 140, h), (60, 60, 70), -1)
+        writer.write(frame)
+    writer.release()
+    if not FFMPEG:
+        return video
+
+    # Speech-like audio: syllable-rate loudness changes, with a pause every 8 seconds
+    rate = 16000
+    tt = np.arange(seconds * rate) / rate
+    voice = 0.3 * np.sin(np.pi * 4 * tt) ** 2 * np.sin(2 * np.pi * 170 * tt) * ((tt % 8) < 6.5)
+    pcm = ((voice + rng.normal(0, 0.003, len(tt))) * 32767).astype(np.int16)
+    audio = os.path.join(workdir, "audio.wav")
+    with wave.open(audio, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(pcm.tobytes())
+    muxed = os.path.join(workdir, "recording.mp4")
+    subprocess.run([FFMPEG, "-v", "error", "-y", "-i", video, "-i", audio, "-c:v", "copy", "-c:a", "aac", "-b:a", "96k", muxed], check=True)
+    return muxed
+
+
+def _image_tokens(jpeg: bytes) -> int:
+    import cv2
+
+    h, w = cv2.imdecode(np.frombuffer(jpeg, dtype=np.uint8), cv2.IMREAD_GRAYSCALE).shape
+    return 258 if w <= 384 and h <= 384 else math.ceil(w / 768) * math.ceil(h / 768) * 258
+
+
+def run(mode: str, path: str, runs: int, duration: float, has_audio: bool) -> dict:
+    import services.behavioral_analyzer as behavioral_analyzer
+    from services.video_payload import build_video_payload
+
+    behavioral_analyzer.VIDEO_LLM_PAYLOAD = mode
+    analyzer = behavioral_analyzer.BehavioralAnalyzer()
+    if mode == "raw":
+        payload = os.path.getsize(path)
+        tokens = int(duration * (258 + (32 if has_audio else 0)))
+        prep_ms = 0.0
+    else:
+        parts, _, stats = build_video_payload(path, analyzer.face_cascade)
+        payload = stats["payload_bytes"]
+        tokens = _image_tokens(parts[0]["inline_data"]["data"]) + (int(duration * 32) if len(parts) > 1 else 0)
+        prep_ms = stats["prep_ms"]
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        asyncio.run(analyzer._analyze_video_llm(path))
+        latencies.append(time.perf_counter() - start)
+    return {
+        "mode": mode,
+        "payload_kb": payload / 1024,
+        "request_kb": payload * 4 / 3 / 1024,  # inline data travels base64-encoded
+        "tokens": tokens,
+        "prep_ms": prep_ms,
+        "latency_ms": statistics.median(latencies) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=int, default=120, help="length of the synthetic recording")
+    parser.add_argument("--runs", type=int, default=3)
+    add_profile_arguments(parser)
+    parser.set_defaults(gemini_ms_per_input_kb=0.5)
+    args = parser.parse_args()
+
+    stub, _ = start_stub(profile_from_args(args), args.latency_scale, args.seed)
+    os.environ["GEMINI_API_KEY"] = "benchmark"
+    os.environ["GEMINI_API_ENDPOINT"] = f"http://127.0.0.1:{stub.server_port}"
+    try:
+        from services.speech_metrics import FFMPEG
+
+        path = render_recording(args.seconds)
+        results = [run(mode, path, args.runs, args.seconds, bool(FFMPEG)) for mode in ("raw", "montage")]
+    finally:
+        stub.shutdown()
+
+    print(f"{args.seconds}s recording, {os.path.getsize(path) / 1024:.0f} KB, audio {'included' if FFMPEG else 'not available (no ffmpeg)'}")
+    print(f"{'payload':<8} {'media KB':>9} {'request KB':>10} {'~tokens':>8} {'prep ms':>8} {'latency ms':>10}")
+    for r in results:
+        print(f"{r['mode']:<8} {r['payload_kb']:9.0f} {r['request_kb']:10.0f} {r['tokens']:8d} {r['prep_ms']:8.0f} {r['latency_ms']:10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Throughput of the production launcher with 1 vs N workers.
+
+Starts `start.py --prod` on a free port, drives /behavioral/chunk with a JPEG
+frame (the local OpenCV path, so each request is CPU-bound) from concurrent
+clients, and reports requests/second and latency per worker count.
+
+    cd backend && python -m benchmarks.workers [--workers 1 4] [--requests 400]
+"""
+
+import argparse
+import base64
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _frame_b64() -> str:
+    import cv2
+    import numpy as np
+
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, size=(480, 640, 3), dtype=np.uint8)
+    ok, buf = cv2.imencode(".jpg", frame)
+    assert ok
+    return base64.b64encode(buf.tobytes()).decode()
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(base: str, timeout: float = 60.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"{base}/health", timeout=1) as r:
+                if r.status == 200:
+                    return
+        except Exception:
+            time.sleep(0.2)
+    raise RuntimeError("server did not become ready")
+
+
+def _post(url: str, body: bytes) -> float:
+    start = time.perf_counter()
+    req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=60) as r:
+        r.read()
+    return time.perf_counter() - start
+
+
+def run(workers: int, requests: int, concurrency: int, body: bytes):
+    port = _free_port()
+    env = {
+        **os.environ,
+        "GEMINI_API_KEY": "",  # force the local OpenCV path
+        "DATABASE_URL": f"sqlite:///{tempfile.mkdtemp()}/bench.db",
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "start.py", "--prod", "--workers", str(workers), "--host", "127.0.0.1", "--port", str(port)],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        _wait_ready(base)
+        url = f"{base}/behavioral/chunk"
+        for _ in range(workers * 4):
+            _post(url, body)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            latencies = list(pool.map(lambda _: _post(url, body), range(requests)))
+        elapsed = time.perf_counter() - start
+    finally:
+        proc.terminate()
+        proc.wait(timeout=60)
+    latencies.sort()
+    return {
+        "workers": workers,
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 2])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    body = json.dumps({"session_id": "bench", "timestamp": 0, "image_b64": _frame_b64()}).encode()
+    results = [run(w, args.requests, args.concurrency, body) for w in args.workers]
+    print(f"{'workers':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    for r in results:
+        print(f"{r['workers']:>7} {r['rps']:8.1f} {r['p50_ms']:8.1f} {r['p95_ms']:8.1f}")
+    if len(results) > 1:
+        print(f"scaling {results[0]['workers']} -> {results[-1]['workers']} workers: {results[-1]['rps'] / results[0]['rps']:.2f}x")
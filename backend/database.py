@@ -1,7 +1,11 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, Text, Float
+from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, Text, Float, JSON, Index, inspect, text, select, update
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, deferred
+from contextlib import contextmanager
 from datetime import datetime
+import json
 import os
 from dotenv import load_dotenv
 
@@ -13,12 +17,15 @@ DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./interview_practice.db")
 # Create engine
 engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {})
 
-# Create session
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create session (objects stay loaded after commit; writes use RETURNING instead of refresh)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 # Create base class
 Base = declarative_base()
 
+# Native JSON column: JSONB on Postgres, JSON (queryable via json1) elsewhere
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
 # User model
 class User(Base):
     __tablename__ = "users"
@@ -32,6 +39,7 @@ class User(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     is_active = Column(Boolean, default=True)
+    token_version = Column(Integer, default=0, nullable=False)  # bump to revoke issued JWTs
 
 # Legacy Interview session model (kept for compatibility)
 class InterviewSession(Base):
@@ -42,7 +50,7 @@ class InterviewSession(Base):
     company = Column(String, nullable=False)
     position = Column(String, nullable=False)
     interview_type = Column(String, nullable=False)
-    questions = Column(Text)  # JSON string
+    questions = Column(JSONType)
     created_at = Column(DateTime, default=datetime.utcnow)
     is_completed = Column(Boolean, default=False)
 
@@ -58,7 +66,10 @@ class BehavioralAnalysis(Base):
     posture_score = Column(Integer, nullable=False)
     speech_clarity = Column(Integer, nullable=False)
     overall_feedback = Column(Text)
-    improvements = Column(Text)  # JSON string
+    improvements = Column(JSONType)  # list of strings
+    # Heavy per-session detail; deferred so summary queries never read it
+    trends = deferred(Column(JSONType), group="detail")  # {emotion: [{t, score}], focus: [...], responseQuality: [...]}
+    segments = deferred(Column(JSONType), group="detail")  # per-answer segments with transcript, STAR and metrics
     created_at = Column(DateTime, default=datetime.utcnow)
 
 # New: granular progress tracking tables
@@ -71,9 +82,12 @@ class InterviewAttempt(Base):
     difficulty = Column(String, nullable=False)
     score = Column(Integer, nullable=False)
     duration_sec = Column(Integer, nullable=False)
-    questions = Column(Text)  # JSON array with correctness
+    questions = Column(JSONType)  # array with correctness
     completed_at = Column(DateTime, default=datetime.utcnow, index=True)
 
+    # Activity feed: one user's rows newest first, id breaking ties
+    __table_args__ = (Index("ix_interview_attempts_user_completed", "user_id", "completed_at", "id"),)
+
 class StudySession(Base):
     __tablename__ = "study_sessions"
 
@@ -86,6 +100,8 @@ class StudySession(Base):
     duration_min = Column(Float, default=0.0)
     completed_at = Column(DateTime, default=datetime.utcnow, index=True)
 
+    __table_args__ = (Index("ix_study_sessions_user_completed", "user_id", "completed_at", "id"),)
+
 class DSAAttempt(Base):
     __tablename__ = "dsa_attempts"
 
@@ -98,6 +114,8 @@ class DSAAttempt(Base):
     correct = Column(Boolean, default=False)
     attempted_at = Column(DateTime, default=datetime.utcnow, index=True)
 
+    __table_args__ = (Index("ix_dsa_attempts_user_attempted", "user_id", "attempted_at", "id"),)
+
 class MentorSession(Base):
     __tablename__ = "mentor_sessions"
 
@@ -108,9 +126,145 @@ class MentorSession(Base):
     duration_min = Column(Float, default=0.0)
     started_at = Column(DateTime, default=datetime.utcnow, index=True)
 
+# Background /analyze-behavioral jobs (services/job_queue.py); the table is the queue
+class AnalysisJob(Base):
+    __tablename__ = "analysis_jobs"
+
+    id = Column(String, primary_key=True)  # uuid hex
+    user_id = Column(Integer, nullable=False, index=True)
+    status = Column(String, nullable=False, default="queued")  # queued | running | done | failed
+    video_path = Column(String, nullable=False)
+    frames_done = Column(Integer, default=0)
+    frames_total = Column(Integer, default=0)
+    attempts = Column(Integer, default=0)
+    analysis_id = Column(Integer, nullable=True)  # behavioral_analyses row written on success
+    result = deferred(Column(JSONType))
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    heartbeat_at = Column(DateTime, nullable=True)  # a running job with a stale heartbeat is requeued
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (Index("ix_analysis_jobs_status_created", "status", "created_at"),)
+
+# /interview answers served a provisional local score; upgraded in place by the model's evaluation
+class InterviewEvaluation(Base):
+    __tablename__ = "interview_evaluations"
+
+    id = Column(String, primary_key=True)  # uuid hex
+    status = Column(String, nullable=False, default="provisional")  # provisional | final | failed
+    result = Column(JSONType)  # the /interview response body
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 # Create tables
 def create_tables():
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns(User.__tablename__, {"token_version": "INTEGER NOT NULL DEFAULT 0"})
+    _upgrade_behavioral_columns()
+    _create_missing_indexes(InterviewAttempt, StudySession, DSAAttempt)
+
+def _create_missing_indexes(*models):
+    """CREATE INDEX for indexes declared after the table was created; create_all skips existing tables."""
+    for model in models:
+        for index in model.__table__.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+def _add_missing_columns(table: str, columns: dict):
+    """ALTER TABLE ... ADD COLUMN for columns added after the table was created."""
+    existing = {c["name"] for c in inspect(engine).get_columns(table)}
+    with engine.begin() as conn:
+        for name, ddl in columns.items():
+            if name not in existing:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
+
+# Columns that held JSON strings in TEXT before they became JSON columns
+LEGACY_JSON_COLUMNS = [
+    (InterviewSession.__tablename__, "questions"),
+    (InterviewAttempt.__tablename__, "questions"),
+    (BehavioralAnalysis.__tablename__, "improvements"),
+]
+
+# One row per data migration that has run, so create_tables() does each only once
+class SchemaMigration(Base):
+    __tablename__ = "schema_migrations"
+
+    name = Column(String, primary_key=True)
+    applied_at = Column(DateTime, default=datetime.utcnow)
+
+def _run_once(name: str, migrate):
+    with engine.begin() as conn:
+        if conn.execute(select(SchemaMigration.name).where(SchemaMigration.name == name)).first():
+            return
+        migrate(conn)
+        conn.execute(SchemaMigration.__table__.insert().values(name=name, applied_at=datetime.utcnow()))
+
+def _upgrade_behavioral_columns():
+    """Add trends/segments to pre-JSON databases, convert legacy JSON text and split improvements blobs."""
+    json_ddl = "JSONB" if engine.dialect.name == "postgresql" else "JSON"
+    _add_missing_columns(BehavioralAnalysis.__tablename__, {"trends": json_ddl, "segments": json_ddl})
+    _run_once("json_columns", _migrate_json_columns)
+
+def _migrate_json_columns(conn):
+    postgres = engine.dialect.name == "postgresql"
+    for table, column in LEGACY_JSON_COLUMNS:
+        if postgres:
+            current = next(c["type"] for c in inspect(conn).get_columns(table) if c["name"] == column)
+            if isinstance(current, (JSON, JSONB)):
+                continue
+        # Fix the cells that would not read as JSON first, so the cast below cannot fail on them
+        rows = conn.execute(text(f"SELECT id, {column} FROM {table} WHERE {column} IS NOT NULL")).all()
+        for row_id, raw in rows:
+            fixed = _legacy_json_text(raw)
+            if fixed is not None:
+                conn.execute(text(f"UPDATE {table} SET {column} = :value WHERE id = :id"), {"value": fixed, "id": row_id})
+        if postgres:
+            # The column type itself changes; SQLite keeps the TEXT declaration, which reads fine as JSON
+            conn.execute(text(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSONB USING {column}::jsonb"))
+
+    # Legacy rows stored {"improvements", "trends", "segments"} in the improvements column
+    rows = conn.execute(
+        select(BehavioralAnalysis.id, BehavioralAnalysis.improvements).where(BehavioralAnalysis.trends.is_(None))
+    ).all()
+    for row_id, blob in rows:
+        if isinstance(blob, str):
+            try:
+                blob = json.loads(blob)
+            except ValueError:
+                continue
+        if not isinstance(blob, dict):
+            continue
+        conn.execute(
+            update(BehavioralAnalysis)
+            .where(BehavioralAnalysis.id == row_id)
+            .values(
+                improvements=blob.get("improvements", []),
+                trends=blob.get("trends", {}),
+                segments=blob.get("segments", []),
+            )
+        )
+
+def _legacy_json_text(raw):
+    """Replacement text for a legacy cell the JSON column type would misread, else None."""
+    if not isinstance(raw, str):
+        return None
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        return json.dumps(raw)  # free text: keep it, as a JSON string
+    if isinstance(value, str):
+        # Encoded twice by some writers; store the document itself
+        try:
+            return json.dumps(json.loads(value))
+        except ValueError:
+            return None
+    return None
+
+# INSERT supporting ON CONFLICT for the configured backend
+def dialect_insert(model):
+    if engine.dialect.name == "postgresql":
+        return pg_insert(model)
+    return sqlite_insert(model)
 
 # Dependency to get database session
 def get_db():
@@ -119,3 +273,22 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Context-managed session for code outside request dependencies
+@contextmanager
+def session_scope():
+    db = SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    # Explicit migration step: `python database.py`
+    create_tables()
+    print(f"Tables ready at {DATABASE_URL}")
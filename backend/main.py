@@ -1,19 +1,24 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File, Depends, Query
+from fastapi import FastAPI, HTTPException, UploadFile, File, Depends, Header, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
 from typing import List, Optional
-import uvicorn
+from contextlib import asynccontextmanager
+from functools import lru_cache
+import asyncio
 import os
+import orjson
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 
-from services.email_parser import EmailParser
-from services.interview_generator import InterviewGenerator
-from services.behavioral_analyzer import BehavioralAnalyzer
 from database import (
     create_tables,
+    engine,
     get_db,
+    session_scope,
     InterviewAttempt,
     StudySession,
     DSAAttempt,
@@ -21,15 +26,62 @@ from database import (
     BehavioralAnalysis as BehavioralAnalysisModel,
 )
 from services.progress_service import ProgressService
-from services.unified_interview import run_unified
+from services.artifact_store import ArtifactStore, parse_range
+from services.metrics import MetricsMiddleware, registry as metrics_registry
+from services.profiler import ProfilerMiddleware, ProfileStore
+from services.upstream import gemini as upstream_gemini
+from services.scheduler import LIVE_FRAME_DEADLINE_S, Expired, Priority, QueueFull, scheduler
+from services.star_classifier import star_sessions
 
 load_dotenv()
-create_tables()
 
 DEFAULT_USER_ID = 1
-
-app = FastAPI(title="Interview Practice API", version="1.1.0")
-
+# Accept ?user_id= from requests without a bearer token. On by default: the Next.js API routes
+# identify the user this way, as nothing issues tokens to the app yet. A sent token always wins.
+ALLOW_QUERY_USER_ID = os.getenv("ALLOW_QUERY_USER_ID", "true").lower() == "true"
+ADMIN_USER_IDS = {int(uid) for uid in os.getenv("ADMIN_USER_IDS", "").split(",") if uid.strip()}
+PROFILED_ROUTES = ("/analyze-behavioral", "/generate-interview", "/dashboard/stats")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Deployments that run `python database.py` as a migration step can set AUTO_CREATE_TABLES=false
+    if os.getenv("AUTO_CREATE_TABLES", "true").lower() == "true":
+        create_tables()
+    job_queue = get_job_queue()
+    job_queue.start()
+    yield
+    job_queue.stop()
+
+# orjson renders every response; response_model endpoints validate and encode in pydantic-core
+app = FastAPI(title="Interview Practice API", version="1.1.0", default_response_class=ORJSONResponse, lifespan=lifespan)
+
+def is_admin_request(headers: dict) -> bool:
+    """True when the request carries a current bearer token for a user in ADMIN_USER_IDS."""
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    auth_service = get_auth_service()
+    claims = auth_service.verify_token(token)
+    if claims is None or int(claims.get("sub", 0)) not in ADMIN_USER_IDS:
+        return False
+    with session_scope() as db:
+        return auth_service.is_token_current(db, claims)
+
+@lru_cache(maxsize=None)
+def get_profile_store() -> ProfileStore:
+    return ProfileStore(max_files=int(os.getenv("PROFILE_RING_SIZE", "200")))
+
+app.add_middleware(MetricsMiddleware)
+# Admins profile a request with `X-Profile: 1` or `?profile=1`; PROFILE_SAMPLE_EVERY=N also profiles 1 in N requests
+app.add_middleware(
+    ProfilerMiddleware,
+    routes=PROFILED_ROUTES,
+    is_admin=is_admin_request,
+    store_factory=get_profile_store,
+    sample_every=int(os.getenv("PROFILE_SAMPLE_EVERY", "0")),
+    interval=float(os.getenv("PROFILE_INTERVAL_MS", "5")) / 1000,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000", "http://127.0.0.1:3000"],
@@ -38,19 +90,118 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-email_parser = EmailParser()
-interview_generator = InterviewGenerator()
-behavioral_analyzer = BehavioralAnalyzer()
+# Services are built on first use. Their modules pull in cv2, numpy, bs4,
+# google.generativeai and the Google auth stack, which dominate cold start.
+@lru_cache(maxsize=None)
+def get_email_parser():
+    from services.email_parser import EmailParser
+    return EmailParser()
+
+@lru_cache(maxsize=None)
+def get_interview_generator():
+    from services.interview_generator import InterviewGenerator
+    return InterviewGenerator()
+
+@lru_cache(maxsize=None)
+def get_behavioral_analyzer():
+    from services.behavioral_analyzer import BehavioralAnalyzer
+    return BehavioralAnalyzer()
+
+@lru_cache(maxsize=None)
+def get_artifact_store() -> ArtifactStore:
+    return ArtifactStore()
+
+@lru_cache(maxsize=None)
+def get_auth_service():
+    from services.auth_service import AuthService
+    return AuthService()
+
+@lru_cache(maxsize=None)
+def get_evaluation_store():
+    from services.answer_evaluator import EvaluationStore
+    return EvaluationStore()
+
+@lru_cache(maxsize=None)
+def get_job_queue():
+    from services.job_queue import JobQueue
+    # ANALYSIS_WORKERS=0 only queues; some other process sharing the database runs the jobs
+    return JobQueue(get_behavioral_analyzer, workers=int(os.getenv("ANALYSIS_WORKERS", "2")))
+
+def preload_services():
+    """Build every service and the schema up front, e.g. in a pre-fork master process."""
+    create_tables()
+    # Workers forked from this process share the schema work already done
+    os.environ["AUTO_CREATE_TABLES"] = "false"
+    get_email_parser()
+    get_interview_generator()
+    get_behavioral_analyzer()
+    get_artifact_store()
+    get_auth_service()
+    import services.unified_interview  # noqa: F401
+    # Forked workers must open their own connections, not share the master's pooled ones
+    engine.dispose()
+
+
+def resolve_user_id(
+    user_id: int = Query(DEFAULT_USER_ID),
+    authorization: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+) -> int:
+    """User from the bearer token; ?user_id= only counts without one and with ALLOW_QUERY_USER_ID."""
+    return _user_for(authorization, user_id, db)
+
+def _user_for(authorization: Optional[str], user_id: int, db: Session) -> int:
+    if not authorization:
+        if ALLOW_QUERY_USER_ID:
+            return user_id
+        raise HTTPException(status_code=401, detail="Bearer token required", headers={"WWW-Authenticate": "Bearer"})
+    auth_service = get_auth_service()
+    scheme, _, token = authorization.partition(" ")
+    claims = auth_service.verify_token(token) if scheme.lower() == "bearer" and token else None
+    if claims is None or not auth_service.is_token_current(db, claims):
+        raise HTTPException(status_code=401, detail="Invalid or revoked token", headers={"WWW-Authenticate": "Bearer"})
+    return int(claims["sub"])
+
+def client_key(request: Request) -> str:
+    """Scheduler fairness key: the token's user when one is sent, otherwise the client address."""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    claims = get_auth_service().verify_token(token) if scheme.lower() == "bearer" and token else None
+    if claims is not None:
+        return f"user:{claims.get('sub')}"
+    return request.client.host if request.client else "anonymous"
+
+@app.exception_handler(QueueFull)
+async def queue_full_handler(request: Request, exc: QueueFull):
+    return ORJSONResponse({"detail": str(exc)}, status_code=429, headers={"Retry-After": str(exc.retry_after)})
+
+@app.exception_handler(Expired)
+async def expired_handler(request: Request, exc: Expired):
+    return ORJSONResponse({"detail": str(exc)}, status_code=503, headers={"Retry-After": "0"})
+
 class EmailContent(BaseModel):
     content: str
 
 class InterviewQuestion(BaseModel):
+    id: Optional[str] = None
     question: str
     category: str
     difficulty: str
     expected_answer: Optional[str] = None
     tips: List[str] = []
 
+class QuestionContext(BaseModel):
+    question: str
+    category: Optional[str] = None
+    difficulty: Optional[str] = None
+    company: Optional[str] = None
+    position: Optional[str] = None
+    level: Optional[str] = None
+
+class QuestionDetail(BaseModel):
+    id: str
+    expected_answer: str
+    tips: List[str]
+
 class GeneratedInterview(BaseModel):
     id: str
     company: str
@@ -58,6 +209,8 @@ class GeneratedInterview(BaseModel):
     interview_type: str
     categories: list
     created_at: str
+    estimated_duration: int
+    difficulty_level: Optional[str] = None
 
 class BehavioralAnalysis(BaseModel):
     confidence_score: float
@@ -114,6 +267,68 @@ class UnifiedInterviewRequest(BaseModel):
     answer: str
     mode: str | None = "text"  # 'text' | 'visual'
     voice: str | None = None
+    question_id: str | None = None  # from /generate-interview; its expected_answer is the reference for local scoring
+    expected_answer: str | None = None
+
+class UnifiedInterviewResponse(BaseModel):
+    ai: dict
+    image: str | None = None  # inline base64, only with ?inline=true
+    audio: str | None = None
+    image_url: str | None = None
+    audio_url: str | None = None
+    status: str | None = None  # provisional | final | failed, when a local score was served first
+    evaluation_id: str | None = None
+    status_url: str | None = None
+
+class DashboardStatsResponse(BaseModel):
+    total_interviews: int
+    completed_sessions: int
+    success_rate: float
+    average_score: float
+    study_hours: float
+    questions_practiced: int
+    companies_applied: int
+    interviews_scheduled: int
+
+class WeeklyProgressPoint(BaseModel):
+    week: str
+    sessions: int
+    score: float
+
+class CategoryPerformance(BaseModel):
+    category: str
+    questions: int
+    correct: int
+    percentage: float
+
+class ActivityItem(BaseModel):
+    date: str
+    activity: str
+    score: float
+
+class BehavioralSummary(BaseModel):
+    id: int
+    date: str | None = None
+    confidence_score: int
+    eye_contact_score: int
+    posture_score: int
+    speech_clarity: int
+    overall_feedback: str | None = None
+    improvements: List[str] = []
+    trends: dict | None = None
+    segments: List[dict] | None = None
+
+class AnalysisJobStatus(BaseModel):
+    id: str
+    status: str  # queued | running | done | failed
+    frames_done: int = 0
+    frames_total: int = 0
+    progress: float = 0.0
+    analysis_id: int | None = None
+    result: dict | None = None
+    error: str | None = None
+    created_at: str | None = None
+    finished_at: str | None = None
 
 
 @app.get("/")
@@ -122,28 +337,98 @@ async def root():
 
 
 @app.post("/parse-email")
-async def parse_email(email: EmailContent):
-    try:
-        parsed_data = await email_parser.parse_email(email.content)
-        return parsed_data
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
-
-@app.post("/generate-interview")
-async def generate_interview(parsed_data: dict, db: Session = Depends(get_db)):
-    try:
-        session_payload = await interview_generator.generate_interview(parsed_data)
-        return session_payload
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+async def parse_email(email: EmailContent, request: Request):
+    async with scheduler.slot(Priority.STANDARD, client_key(request)):
+        try:
+            parsed_data = await get_email_parser().parse_email(email.content)
+            return parsed_data
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+@app.post("/generate-interview", response_model=GeneratedInterview)
+async def generate_interview(parsed_data: dict, request: Request, detail: str = Query("full", pattern="^(full|lazy)$")):
+    async with scheduler.slot(Priority.STANDARD, client_key(request)):
+        try:
+            session_payload = await get_interview_generator().generate_interview(parsed_data, detail=detail == "full")
+            return session_payload
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/generate-interview/stream")
+async def generate_interview_stream(parsed_data: dict, request: Request, detail: str = Query("full", pattern="^(full|lazy)$")):
+    """Questions as they are generated: NDJSON by default, SSE with Accept: text/event-stream."""
+    sse = "text/event-stream" in request.headers.get("accept", "")
+
+    def frame(event: str, data: dict) -> bytes:
+        if sse:
+            return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+        return orjson.dumps({"event": event, "data": data}) + b"\n"
+
+    # Admission happens before the response starts so a full queue can still answer 429
+    ticket = await scheduler.acquire(Priority.STANDARD, client_key(request))
+
+    async def events():
+        try:
+            async for event, data in get_interview_generator().stream_interview(parsed_data, detail=detail == "full"):
+                yield frame(event, data)
+        except Exception as e:
+            yield frame("error", {"detail": str(e)})
+        finally:
+            ticket.release()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Also releases the slot when the client disconnects before the first event
+        background=BackgroundTask(ticket.release),
+    )
+
+@app.post("/questions/{question_id}/detail", response_model=QuestionDetail)
+async def question_detail(question_id: str, request: Request, context: Optional[QuestionContext] = None):
+    """Answer outline and tips for a question from ?detail=lazy, generated on first open and cached.
+
+    Send the question as the body for ids this server no longer knows (e.g. after a restart).
+    """
+    async with scheduler.slot(Priority.INTERACTIVE, client_key(request)):
+        detail = await get_interview_generator().question_detail(question_id, context.model_dump() if context else None)
+    if detail is None:
+        raise HTTPException(status_code=404, detail="Unknown question; send the question in the request body")
+    return detail
 
 @app.post("/analyze-behavioral")
-async def analyze_behavioral(video_file: UploadFile = File(...)):
-    try:
-        analysis = await behavioral_analyzer.analyze_video(video_file)
-        return analysis
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+async def analyze_behavioral(
+    request: Request,
+    video_file: UploadFile = File(...),
+    run_async: bool = Query(False, alias="async"),
+    user_id: int = Query(DEFAULT_USER_ID),
+    authorization: Optional[str] = Header(None),
+):
+    """Analyze an uploaded recording. With ?async=true the upload is queued and the
+    response is 202 with a job id; poll /jobs/{id} for progress and the result,
+    which is also saved to the user's behavioral analyses (so it needs a bearer token).
+    """
+    if run_async:
+        def owner() -> int:
+            with session_scope() as db:
+                return _user_for(authorization, user_id, db)
+
+        user_id = await run_in_threadpool(owner)
+        job_id = await run_in_threadpool(get_job_queue().submit, user_id, video_file.file)
+        return ORJSONResponse({"job_id": job_id, "status": "queued", "status_url": f"/jobs/{job_id}"}, status_code=202)
+    async with scheduler.slot(Priority.BATCH, client_key(request)):
+        try:
+            analysis = await get_behavioral_analyzer().analyze_video(video_file)
+            return analysis
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/jobs/{job_id}", response_model=AnalysisJobStatus, response_model_exclude_none=True)
+async def get_job(job_id: str, user_id: int = Depends(resolve_user_id)):
+    job = await run_in_threadpool(get_job_queue().status, job_id)
+    if job is None or job["user_id"] != user_id:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 @app.post("/behavioral/start")
 async def behavioral_start(_: BehavioralStart):
@@ -152,16 +437,23 @@ async def behavioral_start(_: BehavioralStart):
 
 @app.post("/behavioral/chunk")
 async def behavioral_chunk(payload: BehavioralChunkPayload):
-    try:
-        metrics = await behavioral_analyzer.analyze_chunk(payload.image_b64, payload.audio_b64, payload.transcript_segment)
-        return {"session_id": payload.session_id, "timestamp": payload.timestamp, "metrics": metrics}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    # Fed before queueing, so a frame dropped below still counts toward the session's STAR coverage
+    star = star_sessions.feed(payload.session_id, payload.transcript_segment)
+    # A frame that waited past its deadline, or that a newer frame from the same
+    # session overtook in the queue, is answered 503 without calling the model
+    async with scheduler.slot(Priority.INTERACTIVE, payload.session_id, timeout=LIVE_FRAME_DEADLINE_S, supersede=True):
+        try:
+            metrics = await get_behavioral_analyzer().analyze_chunk(
+                payload.image_b64, payload.audio_b64, payload.transcript_segment, star
+            )
+            return {"session_id": payload.session_id, "timestamp": payload.timestamp, "metrics": metrics}
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/behavioral/finish")
-async def behavioral_finish(payload: BehavioralFinishPayload, user_id: int = Query(DEFAULT_USER_ID), db: Session = Depends(get_db)):
+async def behavioral_finish(payload: BehavioralFinishPayload, user_id: int = Depends(resolve_user_id), db: Session = Depends(get_db)):
+    star_sessions.discard(payload.session_id)
     try:
-        from json import dumps as _dumps
         rec = BehavioralAnalysisModel(
             user_id=user_id,
             session_id=None,
@@ -170,11 +462,9 @@ async def behavioral_finish(payload: BehavioralFinishPayload, user_id: int = Que
             posture_score=int(payload.overall.posture_score),
             speech_clarity=int(payload.overall.speech_clarity),
             overall_feedback=payload.overall.overall_feedback,
-            improvements=_dumps({
-                "improvements": payload.overall.improvements,
-                "trends": payload.trends or {},
-                "segments": payload.segments or [],
-            }),
+            improvements=payload.overall.improvements,
+            trends=payload.trends or {},
+            segments=payload.segments or [],
         )
         db.add(rec)
         db.commit()
@@ -187,11 +477,26 @@ async def behavioral_finish(payload: BehavioralFinishPayload, user_id: int = Que
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics")
+async def metrics():
+    # Per-process; scrape each worker (or run a single worker) when using start.py --prod
+    return Response(content=metrics_registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/profiles/{name}")
+async def get_profile(name: str, request: Request):
+    """Collapsed stacks for a profiled request (id from X-Profile-Id); feed to flamegraph.pl or speedscope."""
+    if not await run_in_threadpool(is_admin_request, {k.lower(): v for k, v in request.headers.items()}):
+        raise HTTPException(status_code=403, detail="Admin token required")
+    path = get_profile_store().path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain")
+
 
 @app.post("/tracking/interview")
 async def track_interview(
     payload: TrackInterviewAttempt,
-    user_id: int = Query(DEFAULT_USER_ID),
+    user_id: int = Depends(resolve_user_id),
     db: Session = Depends(get_db),
 ):
     try:
@@ -201,11 +506,8 @@ async def track_interview(
             difficulty=payload.difficulty,
             score=payload.score,
             duration_sec=payload.duration,
-            questions=os.path.join('', '') or str(payload.questions),
+            questions=payload.questions,
         )
-        # Serialize questions reliably
-        import json as _json
-        rec.questions = _json.dumps(payload.questions)
         db.add(rec)
         db.commit()
         return {"ok": True, "id": rec.id}
@@ -216,7 +518,7 @@ async def track_interview(
 @app.post("/tracking/study")
 async def track_study(
     payload: TrackStudySession,
-    user_id: int = Query(DEFAULT_USER_ID),
+    user_id: int = Depends(resolve_user_id),
     db: Session = Depends(get_db),
 ):
     try:
@@ -238,7 +540,7 @@ async def track_study(
 @app.post("/tracking/dsa")
 async def track_dsa(
     payload: TrackDSAAttempt,
-    user_id: int = Query(DEFAULT_USER_ID),
+    user_id: int = Depends(resolve_user_id),
     db: Session = Depends(get_db),
 ):
     try:
@@ -260,7 +562,7 @@ async def track_dsa(
 @app.post("/tracking/mentor")
 async def track_mentor(
     payload: TrackMentorSession,
-    user_id: int = Query(DEFAULT_USER_ID),
+    user_id: int = Depends(resolve_user_id),
     db: Session = Depends(get_db),
 ):
     try:
@@ -277,9 +579,9 @@ async def track_mentor(
         db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/dashboard/stats")
+@app.get("/dashboard/stats", response_model=DashboardStatsResponse)
 async def get_dashboard_stats(
-    user_id: int = Query(DEFAULT_USER_ID), db: Session = Depends(get_db)
+    user_id: int = Depends(resolve_user_id), db: Session = Depends(get_db)
 ):
     try:
         service = ProgressService(db, user_id)
@@ -297,9 +599,9 @@ async def get_dashboard_stats(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/dashboard/progress")
+@app.get("/dashboard/progress", response_model=List[WeeklyProgressPoint])
 async def get_progress_data(
-    user_id: int = Query(DEFAULT_USER_ID), db: Session = Depends(get_db)
+    user_id: int = Depends(resolve_user_id), db: Session = Depends(get_db)
 ):
     try:
         service = ProgressService(db, user_id)
@@ -307,9 +609,9 @@ async def get_progress_data(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/dashboard/categories")
+@app.get("/dashboard/categories", response_model=List[CategoryPerformance])
 async def get_category_performance(
-    user_id: int = Query(DEFAULT_USER_ID), db: Session = Depends(get_db)
+    user_id: int = Depends(resolve_user_id), db: Session = Depends(get_db)
 ):
     try:
         service = ProgressService(db, user_id)
@@ -317,64 +619,159 @@ async def get_category_performance(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/dashboard/recent-activity")
+@app.get("/dashboard/recent-activity", response_model=List[ActivityItem])
 async def get_recent_activity(
-    user_id: int = Query(DEFAULT_USER_ID), db: Session = Depends(get_db)
+    response: Response,
+    user_id: int = Depends(resolve_user_id),
+    limit: int = Query(5, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
 ):
     try:
         service = ProgressService(db, user_id)
-        return service.recent_activity()
+        items, next_cursor = service.recent_activity_page(limit=limit, cursor=cursor)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        if not items and cursor is None:
+            items = service.empty_activity()
+        return items
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/dashboard/behavioral")
-async def get_behavioral_summaries(user_id: int = Query(DEFAULT_USER_ID), db: Session = Depends(get_db)):
+@app.get("/dashboard/behavioral", response_model=List[BehavioralSummary], response_model_exclude_unset=True)
+async def get_behavioral_summaries(
+    response: Response,
+    user_id: int = Depends(resolve_user_id),
+    view: str = Query("summary", pattern="^(summary|full)$"),
+    limit: int = Query(5, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+):
     try:
-        rows = (
-            db.query(BehavioralAnalysisModel)
-            .filter(BehavioralAnalysisModel.user_id == user_id)
-            .order_by(BehavioralAnalysisModel.created_at.desc())
-            .limit(5)
-            .all()
-        )
-        import json as _json
-        out = []
-        for r in rows:
-            trends = {}
-            segments = []
-            improvements = []
-            try:
-                blob = _json.loads(r.improvements or "{}")
-                trends = blob.get("trends", {})
-                segments = blob.get("segments", [])
-                improvements = blob.get("improvements", [])
-            except Exception:
-                pass
-            out.append({
-                "id": r.id,
-                "date": r.created_at.isoformat() if hasattr(r, 'created_at') and r.created_at else None,
-                "confidence_score": r.confidence_score,
-                "eye_contact_score": r.eye_contact_score,
-                "posture_score": r.posture_score,
-                "speech_clarity": r.speech_clarity,
-                "overall_feedback": r.overall_feedback,
-                "improvements": improvements,
-                "trends": trends,
-                "segments": segments,
-            })
-        return out
+        service = ProgressService(db, user_id)
+        items, next_cursor = service.behavioral_page(limit=limit, cursor=cursor, full=view == "full")
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return items
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/dashboard/behavioral/{analysis_id}", response_model=BehavioralSummary)
+async def get_behavioral_detail(analysis_id: int, user_id: int = Depends(resolve_user_id), db: Session = Depends(get_db)):
+    service = ProgressService(db, user_id)
+    detail = service.behavioral_detail(analysis_id)
+    if detail is None:
+        raise HTTPException(status_code=404, detail="Behavioral analysis not found")
+    return detail
+
+
+# Model evaluations still running after their provisional score was served
+_pending_evaluations = set()
 
-@app.post("/interview")
-async def interview_endpoint(payload: UnifiedInterviewRequest):
+@app.post("/interview", response_model=UnifiedInterviewResponse, response_model_exclude_unset=True)
+async def interview_endpoint(
+    payload: UnifiedInterviewRequest, request: Request, inline: bool = Query(False), provisional: bool = Query(False)
+):
+    """Evaluate an answer. With ?provisional=true, or once INTERVIEW_EVAL_DEADLINE_MS passes without
+    the model's evaluation, a local score is returned with status "provisional"; the model's result
+    replaces it at status_url when it arrives."""
+    from services.answer_evaluator import EVAL_DEADLINE_S, local_evaluation
+    from services.unified_interview import run_unified
+
+    expected = payload.expected_answer
+    if not expected and payload.question_id:
+        entry = get_interview_generator().details.get(payload.question_id)
+        expected = entry["detail"]["expected_answer"] if entry and entry["detail"] else None
+    key = client_key(request)
+    store = None if inline else get_artifact_store()
+
+    async def evaluate():
+        # Time queued for the slot counts toward the deadline; the slot is held until the
+        # model's evaluation finishes, even after a provisional answer
+        async with scheduler.slot(Priority.INTERACTIVE, key):
+            # Blocking upstream calls; keep them off the event loop
+            return await upstream_gemini.offload(
+                run_unified, payload.question, payload.answer, payload.mode or "text", payload.voice, store, expected
+            )
+
+    task = asyncio.ensure_future(evaluate())
+    deadline = 0 if provisional else EVAL_DEADLINE_S
+    if deadline:
+        await asyncio.wait({task}, timeout=deadline)
+    if deadline is None or task.done():
+        try:
+            return await task
+        except QueueFull:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    evaluations = get_evaluation_store()
+    ai = local_evaluation(payload.question, payload.answer, expected)
+    evaluation_id = await run_in_threadpool(evaluations.create, {"ai": ai})
+
+    async def upgrade():
+        try:
+            await run_in_threadpool(evaluations.complete, evaluation_id, await task)
+        except Exception as e:
+            await run_in_threadpool(evaluations.complete, evaluation_id, None, str(e))
+
+    pending = asyncio.ensure_future(upgrade())
+    _pending_evaluations.add(pending)
+    pending.add_done_callback(_pending_evaluations.discard)
+    return {"ai": ai, "status": "provisional", "evaluation_id": evaluation_id, "status_url": f"/interview/evaluations/{evaluation_id}"}
+
+@app.get("/interview/evaluations/{evaluation_id}", response_model=UnifiedInterviewResponse, response_model_exclude_none=True)
+async def get_interview_evaluation(evaluation_id: str):
+    evaluation = await run_in_threadpool(get_evaluation_store().get, evaluation_id)
+    if evaluation is None:
+        raise HTTPException(status_code=404, detail="Evaluation not found")
+    return evaluation
+
+
+# Artifacts are content-addressed, so they never change once written
+ARTIFACT_HEADERS = {
+    "Cache-Control": "public, max-age=31536000, immutable",
+    "Accept-Ranges": "bytes",
+    "Content-Security-Policy": "default-src 'none'; style-src 'unsafe-inline'",
+    "X-Content-Type-Options": "nosniff",
+}
+
+def _read_range(path: str, start: int, end: int) -> bytes:
+    with open(path, "rb") as f:
+        f.seek(start)
+        return f.read(end - start + 1)
+
+@app.get("/artifacts/{name}")
+async def get_artifact(name: str, request: Request):
+    artifact_store = get_artifact_store()
+    path = artifact_store.path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Artifact not found")
+    etag = f'"{name.split(".")[0]}"'
+    headers = {**ARTIFACT_HEADERS, "ETag": etag}
+    if etag in (request.headers.get("if-none-match") or ""):
+        return Response(status_code=304, headers=headers)
+
+    size = os.path.getsize(path)
+    media_type = artifact_store.content_type(name)
     try:
-        data = run_unified(payload.question, payload.answer, payload.mode or "text", payload.voice)
-        return data
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        byte_range = parse_range(request.headers.get("range"), size)
+    except ValueError:
+        return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+    if byte_range is None:
+        # Streamed from disk in chunks, off the event loop
+        return FileResponse(path, media_type=media_type, headers=headers)
+    start, end = byte_range
+    body = await run_in_threadpool(_read_range, path, start, end)
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    return Response(content=body, status_code=206, media_type=media_type, headers=headers)
 
 
 if __name__ == "__main__":
+    import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
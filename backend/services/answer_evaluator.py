@@ -0,0 +1,167 @@
+import math
+import os
+import re
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, select, update
+
+from database import InterviewEvaluation, session_scope
+from services.metrics import timed
+from services.star_classifier import score_star
+
+# How long /interview waits for the model before serving the local score; 0 waits as long as it takes
+EVAL_DEADLINE_S = float(os.getenv("INTERVIEW_EVAL_DEADLINE_MS", "8000")) / 1000 or None
+# Provisional evaluations are kept this long for polling
+EVAL_TTL = timedelta(hours=int(os.getenv("INTERVIEW_EVAL_TTL_HOURS", "24")))
+
+MAX_KEYWORDS = 20
+# Without a reference answer the score says little about correctness, so it stays below "Excellent"
+NO_REFERENCE_CAP = 75
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#]*")
+_BEHAVIORAL = re.compile(
+    r"\b(?:tell me about a time|describe a (?:time|situation)|give (?:me )?an example|how did you (?:handle|deal)"
+    r"|walk me through a time|a time when you)\b|\b(?-i:STAR)\b",
+    re.IGNORECASE,
+)
+_STOPWORDS = frozenset(
+    "a an and are as at be been being but by can could did do does for from had has have how i if in into is it its "
+    "just like may me might more most my no not of on or our out over per should so some such than that the their them "
+    "then there these they this those through to too up us use used using very was we were what when where which "
+    "via while who why will with would you your about also any both each example examples answer candidate include "
+    "including mention explain describe discuss etc".split()
+)
+
+
+def _stem(word: str) -> str:
+    for suffix in ("ing", "ed", "es", "s"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[: -len(suffix)]
+            break
+    return word[:-1] if word.endswith("e") and len(word) > 3 else word
+
+
+def _terms(text: str) -> List[tuple]:
+    """(stem, surface word) for each content word, in order."""
+    return [(_stem(w), w) for w in _WORD.findall(text.lower()) if w not in _STOPWORDS and len(w) > 2]
+
+
+def _cosine(a: Counter, b: Counter) -> float:
+    dot = sum(math.log1p(n) * math.log1p(b[t]) for t, n in a.items() if t in b)
+    norm = math.sqrt(sum(math.log1p(n) ** 2 for n in a.values())) * math.sqrt(sum(math.log1p(n) ** 2 for n in b.values()))
+    return dot / norm if norm else 0.0
+
+
+def _length_score(words: int) -> float:
+    if words < 10:
+        return 0.1
+    if words < 30:
+        return 0.5
+    if words <= 300:
+        return 1.0
+    return max(0.6, 1 - (words - 300) / 600)
+
+
+def _verdict(score: int) -> str:
+    return "Excellent" if score >= 80 else "Good" if score >= 60 else "Needs Improvement"
+
+
+@timed()
+def local_evaluation(
+    question: str, answer: str, expected_answer: Optional[str] = None, provisional: bool = True
+) -> Dict[str, Any]:
+    """Evaluation in the model's shape from the answer text alone, in well under a millisecond.
+
+    Scores how many of the reference outline's key terms the answer covers,
+    its overall term similarity to the outline, its length and, for
+    behavioral questions, its STAR coverage. Without a reference outline the
+    question's own terms stand in for the key terms. ``provisional`` says
+    the model's feedback is on its way; pass False when it is not coming.
+    """
+    answer_terms = _terms(answer)
+    answer_counts = Counter(stem for stem, _ in answer_terms)
+    reference = _terms(expected_answer or question)
+    reference_counts = Counter(stem for stem, _ in reference)
+    surface: Dict[str, str] = {}
+    for stem, word in reference:
+        surface.setdefault(stem, word)
+    # The reference's most frequent terms, ties in order of appearance
+    keywords = sorted(surface, key=lambda s: -reference_counts[s])[:MAX_KEYWORDS]
+    covered = [k for k in keywords if k in answer_counts]
+    coverage = min(1.0, len(covered) / len(keywords) / 0.6) if keywords else 0.0
+    words = len(_WORD.findall(answer.lower()))
+    length = _length_score(words)
+    star = score_star(answer) if _BEHAVIORAL.search(f"{question} {expected_answer or ''}") else None
+
+    if expected_answer:
+        similarity = min(1.0, _cosine(answer_counts, reference_counts) / 0.5)
+        if star:
+            raw = 0.35 * coverage + 0.2 * similarity + 0.15 * length + 0.3 * star["completeness"]
+        else:
+            raw = 0.5 * coverage + 0.3 * similarity + 0.2 * length
+        score = round(100 * raw)
+    else:
+        raw = 0.3 * coverage + 0.2 * length + 0.5 * star["completeness"] if star else 0.6 * coverage + 0.4 * length
+        score = min(NO_REFERENCE_CAP, round(100 * raw))
+    if words < 3:
+        score = 0
+
+    missing = [surface[k] for k in keywords if k not in answer_counts][:5]
+    against = "reference answer outline" if expected_answer else "question"
+    lines = [
+        f"**Provisional score**, measured against the {against}; detailed feedback follows when it is ready."
+        if provisional
+        else f"**Quick score**, measured against the {against}; detailed feedback is unavailable right now.",
+        f"- **Key terms covered:** {len(covered)} of {len(keywords)}"
+        + (f" ({', '.join(surface[k] for k in covered[:8])})" if covered else ""),
+    ]
+    if missing:
+        lines.append(f"- **Consider covering:** {', '.join(missing)}")
+    lines.append(f"- **Length:** {words} words" + (" - expand with specifics" if words < 30 else ""))
+    if star:
+        absent = [c for c in ("situation", "task", "action", "result") if not star[c]]
+        lines.append("- **STAR:** " + ("all four parts present" if not absent else f"missing {', '.join(absent)}"))
+    return {
+        "evaluation": {"score": score, "verdict": _verdict(score)},
+        "summary": f"Answer covers {len(covered)} of {len(keywords)} key terms in {words} words.",
+        "visual_prompt": "",
+        "explanation": "\n".join(lines),
+        "theory": "",
+        "source": "local",
+    }
+
+
+class EvaluationStore:
+    """Provisional /interview responses, replaced by the final one when the model answers.
+
+    Kept in the interview_evaluations table so any worker can serve the poll.
+    """
+
+    def __init__(self, ttl: timedelta = EVAL_TTL):
+        self.ttl = ttl
+
+    def create(self, result: Dict[str, Any]) -> str:
+        evaluation_id = uuid.uuid4().hex
+        now = datetime.utcnow()
+        with session_scope() as db:
+            db.execute(delete(InterviewEvaluation).where(InterviewEvaluation.created_at < now - self.ttl))
+            db.add(InterviewEvaluation(id=evaluation_id, status="provisional", result=result, created_at=now))
+        return evaluation_id
+
+    def complete(self, evaluation_id: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        """Upgrade to the final result; on error the provisional result stays, marked failed."""
+        values = {"status": "final", "result": result} if error is None else {"status": "failed", "error": error}
+        with session_scope() as db:
+            db.execute(update(InterviewEvaluation).where(InterviewEvaluation.id == evaluation_id).values(**values))
+
+    def get(self, evaluation_id: str) -> Optional[Dict[str, Any]]:
+        with session_scope() as db:
+            row = db.execute(
+                select(InterviewEvaluation.status, InterviewEvaluation.result).where(InterviewEvaluation.id == evaluation_id)
+            ).first()
+        if row is None:
+            return None
+        return {**(row.result or {}), "status": row.status, "evaluation_id": evaluation_id}
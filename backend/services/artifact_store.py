@@ -0,0 +1,91 @@
+import hashlib
+import os
+import re
+import tempfile
+from typing import Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+
+CONTENT_TYPES = {
+    "mp3": "audio/mpeg",
+    "svg": "image/svg+xml",
+}
+
+_NAME_RE = re.compile(r"^[0-9a-f]{64}\.(mp3|svg)$")
+
+
+class ArtifactStore:
+    """Content-addressed store for generated audio and diagrams.
+
+    Artifacts are written once under ``<root>/<first two hex chars>/<sha256>.<ext>``
+    and served by name, so the name doubles as a strong ETag.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or os.getenv("ARTIFACT_DIR", os.path.join(os.path.dirname(os.path.dirname(__file__)), "artifacts"))
+        os.makedirs(self.root, exist_ok=True)
+
+    def put(self, data: bytes, ext: str) -> str:
+        """Store bytes and return the artifact name (``<sha256>.<ext>``)."""
+        if ext not in CONTENT_TYPES:
+            raise ValueError(f"Unsupported artifact type: {ext}")
+        name = f"{hashlib.sha256(data).hexdigest()}.{ext}"
+        path = self._path(name)
+        if os.path.exists(path):
+            return name
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return name
+
+    def path(self, name: str) -> Optional[str]:
+        """Filesystem path of a stored artifact, or None for unknown/invalid names."""
+        if not _NAME_RE.match(name):
+            return None
+        path = self._path(name)
+        return path if os.path.exists(path) else None
+
+    def url(self, name: str) -> str:
+        return f"/artifacts/{name}"
+
+    @staticmethod
+    def content_type(name: str) -> str:
+        return CONTENT_TYPES.get(name.rsplit(".", 1)[-1], "application/octet-stream")
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.root, name[:2], name)
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single ``bytes=start-end`` Range header into inclusive offsets.
+
+    Returns None when there is no usable range (serve the full body) and raises
+    ValueError when the range cannot be satisfied.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start_s, _, end_s = header[6:].strip().partition("-")
+    try:
+        if start_s == "":
+            # Suffix range: last N bytes
+            length = int(end_s)
+            if length <= 0:
+                return None
+            start, end = max(size - length, 0), size - 1
+        else:
+            start = int(start_s)
+            end = int(end_s) if end_s else size - 1
+    except ValueError:
+        return None
+    end = min(end, size - 1)
+    if start > end or start >= size:
+        raise ValueError(f"Unsatisfiable range: {header}")
+    return start, end
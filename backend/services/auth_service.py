@@ -1,15 +1,17 @@
 import os
 import json
+import asyncio
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
-from google.auth.transport import requests
-from google.oauth2 import id_token
 from google_auth_oauthlib.flow import Flow
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from sqlalchemy.orm import Session
 from dotenv import load_dotenv
-from database import get_db
+from database import session_scope, User
 from services.user_service import UserService
+from services.token_cache import claims_cache, token_versions
+from services.google_token_verifier import get_google_verifier
 
 load_dotenv()
 
@@ -22,6 +24,7 @@ class AuthService:
         self.access_token_expire_minutes = 30
         
         self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self.google_verifier = get_google_verifier(self.client_id)
         
         # OAuth flow configuration
         self.client_config = {
@@ -58,12 +61,8 @@ class AuthService:
     async def verify_google_token(self, token: str) -> Optional[Dict[str, Any]]:
         """Verify Google ID token and extract user information"""
         try:
-            # Verify the token
-            idinfo = id_token.verify_oauth2_token(
-                token, 
-                requests.Request(), 
-                self.client_id
-            )
+            # Verify against cached Google keys, off the event loop
+            idinfo = await asyncio.to_thread(self.google_verifier.verify, token)
             
             # Extract user information
             user_info = {
@@ -92,27 +91,51 @@ class AuthService:
         encoded_jwt = jwt.encode(to_encode, self.secret_key, algorithm=self.algorithm)
         return encoded_jwt
     
-    def verify_token(self, token: str) -> Optional[Dict[str, Any]]:
-        """Verify JWT token"""
+    def verify_token(self, token: str, use_cache: bool = True) -> Optional[Dict[str, Any]]:
+        """Verify JWT token, reusing decoded claims until the token expires"""
+        if use_cache:
+            cached = claims_cache.get(token)
+            if cached is not None:
+                return cached
         try:
             payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            return payload
         except JWTError:
             return None
+        if use_cache:
+            claims_cache.put(token, payload)
+        return payload
     
-    def create_user_session(self, user_info: Dict[str, Any]) -> Dict[str, Any]:
+    def is_token_current(self, db: Session, claims: Dict[str, Any]) -> bool:
+        """Check the token's version against the user's revocation counter"""
+        try:
+            user_id = int(claims["sub"])
+        except (KeyError, TypeError, ValueError):
+            return False
+        def load(uid: int) -> Optional[int]:
+            row = db.query(User.token_version).filter(User.id == uid).first()
+            return row[0] if row else None
+        current = token_versions.get(user_id, load)
+        return current is not None and int(claims.get("ver", 0)) == current
+    
+    def revoke_user_tokens(self, db: Session, user_id: int) -> int:
+        """Invalidate every token issued to the user so far"""
+        version = UserService(db).bump_token_version(user_id)
+        token_versions.set(user_id, version)
+        return version
+    
+    def create_user_session(self, user_info: Dict[str, Any], db: Optional[Session] = None) -> Dict[str, Any]:
         """Create user session with JWT token and save to database"""
-        # Get database session
-        db = next(get_db())
-        user_service = UserService(db)
+        if db is None:
+            with session_scope() as scoped_db:
+                return self.create_user_session(user_info, scoped_db)
         
         # Get or create user in database
-        user = user_service.get_or_create_user(user_info)
+        user = UserService(db).get_or_create_user(user_info)
         
         # Create access token
         access_token_expires = timedelta(minutes=self.access_token_expire_minutes)
         access_token = self.create_access_token(
-            data={"sub": str(user.id), "email": user.email, "google_id": user.google_id},
+            data={"sub": str(user.id), "email": user.email, "google_id": user.google_id, "ver": user.token_version or 0},
             expires_delta=access_token_expires
         )
         
@@ -1,9 +1,21 @@
+import asyncio
+import base64
 import cv2
 import numpy as np
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Callable, Optional
 import tempfile
 import os
 from datetime import datetime
+from services.metrics import timed, record_fallback
+from services.upstream import configure_gemini, gemini_model
+from services.structured_output import agenerate_structured
+from services.llm_schemas import FrameAnalysis, VideoAnalysis
+from services.speech_metrics import analyze_bytes, analyze_file
+from services.video_payload import build_video_payload, describe_speech
+from services.star_classifier import score_star
+
+# "montage" sends Gemini keyframes plus compressed audio; "raw" sends the uploaded file as is
+VIDEO_LLM_PAYLOAD = os.getenv("VIDEO_LLM_PAYLOAD", "montage")
 
 class BehavioralAnalyzer:
     def __init__(self):
@@ -15,9 +27,9 @@ class BehavioralAnalyzer:
             import google.generativeai as genai
             api_key = os.getenv("GEMINI_API_KEY")
             if api_key:
-                genai.configure(api_key=api_key)
+                configure_gemini(api_key)
                 self._genai = genai
-                self._llm = genai.GenerativeModel('gemini-2.0-flash-exp')
+                self._llm = gemini_model('gemini-2.0-flash-exp')
         except Exception:
             pass
         
@@ -27,121 +39,146 @@ class BehavioralAnalyzer:
             tmp_file.write(content)
             tmp_file_path = tmp_file.name
         try:
-            if self._llm:
-                try:
-                    return await self._analyze_video_llm(tmp_file_path)
-                except Exception:
-                    pass
-            analysis_results = self._process_video(tmp_file_path)
-            os.unlink(tmp_file_path)
-            return analysis_results
-        except Exception as e:
+            return await self.analyze_path(tmp_file_path)
+        finally:
             if os.path.exists(tmp_file_path):
                 os.unlink(tmp_file_path)
-            raise e
 
-    async def analyze_chunk(self, image_b64: str | None, audio_b64: str | None, transcript_segment: str | None) -> Dict[str, Any]:
+    async def analyze_path(self, video_path: str, progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        """Analyze a video on disk. ``progress(frames_done, frames_total)`` is called as frames are processed."""
         if self._llm:
             try:
-                return await self._llm_analyze(image_b64, audio_b64, transcript_segment)
-            except Exception:
-                pass
+                # The model sees the whole clip at once; report it as all frames or none
+                total = await asyncio.to_thread(self._frame_count, video_path) if progress else 0
+                if progress:
+                    progress(0, total)
+                result = await self._analyze_video_llm(video_path, progress)
+                if progress:
+                    progress(total, total)
+                return result
+            except Exception as e:
+                record_fallback("behavioral.video", e)
+        return await asyncio.to_thread(self._process_video, video_path, progress)
+
+    async def analyze_chunk(
+        self, image_b64: str | None, audio_b64: str | None, transcript_segment: str | None, star: Dict[str, Any] | None = None
+    ) -> Dict[str, Any]:
+        # Speech metrics and STAR coverage are measured locally; the model only adds the visual read
+        speech = await asyncio.to_thread(analyze_bytes, base64.b64decode(audio_b64)) if audio_b64 else None
+        if speech:
+            speech.pop("trend")
+        # ``star`` is the live session's coverage so far; without it, the segment's own
+        if star is None:
+            star = score_star(transcript_segment or "")
+        if self._llm:
+            try:
+                result = await self._llm_analyze(image_b64, None if speech else audio_b64, transcript_segment)
+                result["star"] = star
+                if speech:
+                    result["speech_clarity"] = speech["speech_clarity"]
+                    result["speech"] = speech
+                return result
+            except Exception as e:
+                record_fallback("behavioral.chunk", e)
         frame_metrics = {}
         if image_b64:
-            import base64, io
             img = base64.b64decode(image_b64)
             data = np.frombuffer(img, dtype=np.uint8)
             frame = cv2.imdecode(data, cv2.IMREAD_COLOR)
             frame_metrics = self._analyze_frame(frame)
-        return {
-            "speech_clarity": 0.0,
+        result = {
+            "speech_clarity": speech["speech_clarity"] if speech else 0.0,
             "tone_confidence": 0.0,
             "emotional_stability": 0.0,
             "eye_contact": bool(frame_metrics.get("eye_contact", False)),
             "eye_contact_score": 100.0 if frame_metrics.get("eye_contact") else 0.0,
             "facial_expression": "neutral",
             "engagement_level": 0.0,
-            "star": {"situation": False, "task": False, "action": False, "result": False, "completeness": 0.0},
+            "star": star,
             "suggestions": ["Maintain steady eye contact", "Sit centered in frame"],
         }
+        if speech:
+            result["speech"] = speech
+        return result
 
-    async def _analyze_video_llm(self, video_path: str) -> Dict[str, Any]:
+    @timed()
+    async def _analyze_video_llm(self, video_path: str, progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
         if not self._llm:
-            return self._process_video(video_path)
+            return await asyncio.to_thread(self._process_video, video_path, progress)
         try:
-            with open(video_path, 'rb') as f:
-                video_bytes = f.read()
-            parts = [
-                {
-                    "inlineData": {
-                        "data": video_bytes,
-                        "mimeType": "video/mp4",
-                    }
-                }
-            ]
+            speech, payload_stats = None, None
+            if VIDEO_LLM_PAYLOAD == "raw":
+                with open(video_path, 'rb') as f:
+                    video_bytes = f.read()
+                parts = [{"inline_data": {"data": video_bytes, "mime_type": "video/mp4"}}]
+                recording = ""
+            else:
+                parts, speech, payload_stats = await asyncio.to_thread(build_video_payload, video_path, self.face_cascade, progress)
+                recording = (
+                    "The recording is given as a grid of keyframes, each labelled with its timestamp (m:ss), "
+                    + ("followed by its audio track. " if len(parts) > 1 else "without audio; leave transcripts empty. ")
+                    + (describe_speech(speech) + " " if speech else "")
+                )
             prompt = (
                 "You are an expert behavioral interview coach. Analyze the provided interview recording. "
+                + recording +
                 "Track over time: speech clarity, tone confidence, emotional stability, eye contact, facial expressions, engagement. "
-                "Transcribe the candidate’s responses and evaluate STAR framework completeness per answer. "
+                "Transcribe the candidate’s responses, one segment per answer. "
                 "Return ONLY strict JSON with keys: "
                 "{overall:{confidence_score, eye_contact_score, posture_score, speech_clarity}, "
                 "trends:{emotion:[{t,score}], focus:[{t,score}], responseQuality:[{t,score}]}, "
-                "segments:[{tStart,tEnd, transcript, star:{situation,task,action,result,completeness}, metrics:{clarity,confidence,engagement,emotion}}], "
+                "segments:[{tStart,tEnd, transcript, metrics:{clarity,confidence,engagement,emotion}}], "
                 "feedback:{overall:string, improvements:string[]}}"
             )
-            resp = self._llm.generate_content([prompt] + parts)
-            text = resp.text if hasattr(resp, 'text') else getattr(resp, 'response', {}).get('text', '')
-            import json as _json
-            data = _json.loads(text)
-            # Map to API shape (ensure required top-level keys exist)
-            overall = data.get("overall", {})
-            feedback = data.get("feedback", {"overall": "", "improvements": []})
-            return {
-                "confidence_score": float(overall.get("confidence_score", 0.0)),
-                "eye_contact_score": float(overall.get("eye_contact_score", 0.0)),
-                "posture_score": float(overall.get("posture_score", 0.0)),
-                "speech_clarity": float(overall.get("speech_clarity", 0.0)),
-                "overall_feedback": feedback.get("overall", ""),
-                "improvements": feedback.get("improvements", []),
-                "trends": data.get("trends", {"emotion": [], "focus": [], "responseQuality": []}),
-                "segments": data.get("segments", []),
+            data = await agenerate_structured(self._llm, [prompt] + parts, VideoAnalysis)
+            # STAR coverage is scored here from each answer's transcript
+            for segment in data["segments"]:
+                segment["star"] = score_star(segment.get("transcript") or "")
+            # Map to API shape
+            overall = data["overall"]
+            feedback = data["feedback"]
+            result = {
+                "confidence_score": overall["confidence_score"],
+                "eye_contact_score": overall["eye_contact_score"],
+                "posture_score": overall["posture_score"],
+                "speech_clarity": overall["speech_clarity"],
+                "overall_feedback": feedback["overall"],
+                "improvements": feedback["improvements"],
+                "trends": data["trends"],
+                "segments": data["segments"],
             }
-        except Exception:
-            return self._process_video(video_path)
+            if speech:
+                result["speech_clarity"] = speech["speech_clarity"]
+                result["trends"]["speech"] = speech.pop("trend")
+            if payload_stats:
+                result["analysis_metadata"] = {"payload": payload_stats, "speech": speech}
+            return result
+        except Exception as e:
+            record_fallback("behavioral.video", e)
+            return await asyncio.to_thread(self._process_video, video_path, progress)
 
+    @timed()
     async def _llm_analyze(self, image_b64: str | None, audio_b64: str | None, transcript_segment: str | None) -> Dict[str, Any]:
-        import json as _json
         parts = []
         if image_b64:
-            parts.append({"inlineData": {"data": image_b64, "mimeType": "image/jpeg"}})
+            parts.append({"inline_data": {"data": base64.b64decode(image_b64), "mime_type": "image/jpeg"}})
         if audio_b64:
-            parts.append({"inlineData": {"data": audio_b64, "mimeType": "audio/webm"}})
+            parts.append({"inline_data": {"data": base64.b64decode(audio_b64), "mime_type": "audio/webm"}})
         prompt = (
             "You are an expert behavioral interview coach analyzing this live frame. "
             "Evaluate the candidate's eye contact (looking at camera), posture, facial expressions, and engagement. "
             "Return ONLY JSON with exact structure: "
             "{\"speech_clarity\":0-100, \"tone_confidence\":0-100, \"emotional_stability\":0-100, "
             "\"eye_contact\": true/false, \"eye_contact_score\":0-100, \"facial_expression\":\"string\", \"engagement_level\":0-100, "
-            "\"star\":{\"situation\":false, \"task\":false, \"action\":false, \"result\":false, \"completeness\":0}, "
             "\"suggestions\":[]}. Focus on visual cues: is the person looking directly at camera (high eye_contact_score), "
             "are they centered in frame, do they appear confident and engaged?"
         )
         if transcript_segment:
             prompt += f" Transcript: {transcript_segment[:1000]}"
         try:
-            resp = self._llm.generate_content([prompt] + parts)
-            text = resp.text if hasattr(resp, 'text') else str(resp)
-            text = text.strip()
-            if text.startswith('```json'):
-                text = text[7:]
-            if text.startswith('```'):
-                text = text[3:]
-            if text.endswith('```'):
-                text = text[:-3]
-            text = text.strip()
-            data = _json.loads(text)
-            return data
+            return await agenerate_structured(self._llm, [prompt] + parts, FrameAnalysis, hedge=True)
         except Exception as e:
+            record_fallback("behavioral.chunk", e)
             return {
                 "speech_clarity": 50.0,
                 "tone_confidence": 50.0,
@@ -154,7 +191,16 @@ class BehavioralAnalyzer:
                 "suggestions": ["Look at the camera", "Sit centered in frame"],
             }
     
-    def _process_video(self, video_path: str) -> Dict[str, Any]:
+    @staticmethod
+    def _frame_count(video_path: str) -> int:
+        cap = cv2.VideoCapture(video_path)
+        try:
+            return max(0, int(cap.get(cv2.CAP_PROP_FRAME_COUNT)))
+        finally:
+            cap.release()
+    
+    @timed()
+    def _process_video(self, video_path: str, progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
         """Process video file for behavioral analysis"""
         
         cap = cv2.VideoCapture(video_path)
@@ -196,10 +242,22 @@ class BehavioralAnalyzer:
                         eye_contact_frames += 1
                     
                     posture_scores.append(frame_analysis["posture_score"])
+                
+                if progress:
+                    progress(frame_count, total_frames)
             
             frame_count += 1
         
         cap.release()
+        if progress:
+            progress(frame_count, max(total_frames, frame_count))
+        
+        # Audio track, decoded and scored a window at a time
+        speech = analyze_file(video_path)
+        speech_trend = []
+        if speech:
+            speech_trend = speech.pop("trend")
+            speech_analysis = speech
         
         # Calculate final scores
         eye_contact_score = (eye_contact_frames / max(face_detected_frames, 1)) * 100
@@ -216,13 +274,16 @@ class BehavioralAnalyzer:
             "speech_clarity": round(speech_analysis["speech_clarity"], 2),
             "overall_feedback": feedback["overall"],
             "improvements": feedback["improvements"],
+            "trends": {"speech": speech_trend},
             "analysis_metadata": {
                 "video_duration": round(duration, 2),
                 "frames_analyzed": len(posture_scores),
-                "face_detection_rate": round((face_detected_frames / max(frame_count // sample_rate, 1)) * 100, 2)
+                "face_detection_rate": round((face_detected_frames / max(frame_count // sample_rate, 1)) * 100, 2),
+                "speech": speech_analysis
             }
         }
     
+    @timed()
     def _analyze_frame(self, frame) -> Dict[str, Any]:
         """Analyze a single frame for behavioral indicators"""
         
@@ -1,10 +1,12 @@
 import re
-import json
 from typing import Dict, Any, Optional
 from bs4 import BeautifulSoup
-import google.generativeai as genai
 import os
 from dotenv import load_dotenv
+from services.metrics import timed, record_fallback
+from services.upstream import configure_gemini, gemini_model
+from services.structured_output import agenerate_structured
+from services.llm_schemas import EmailDetails
 
 load_dotenv()
 
@@ -12,9 +14,9 @@ class EmailParser:
     def __init__(self):
         api_key = os.getenv("GEMINI_API_KEY")
         if api_key:
-            genai.configure(api_key=api_key)
+            configure_gemini(api_key)
             # Use Gemini 2.5 Computer for more powerful analysis
-            self.model = genai.GenerativeModel('gemini-2.5-computer-use-preview-10-2025')
+            self.model = gemini_model('gemini-2.5-computer-use-preview-10-2025')
         else:
             self.model = None
         
@@ -175,10 +177,12 @@ class EmailParser:
                 seen.add(q); out.append(q)
         return out[:20]
     
+    @timed()
     async def _ai_extract_details(self, content: str) -> Dict[str, Any]:
         """Use AI to extract additional interview details"""
         if not self.model:
             # Fallback to basic extraction when no API key
+            record_fallback("email_parser")
             return {
                 "company": None,
                 "position": None,
@@ -202,7 +206,7 @@ class EmailParser:
             - Any unique requirements or preferences
 
             Return a JSON object with this exact structure:
-            {
+            {{
                 "company": "Company name (be precise, include full name if available)",
                 "position": "Exact job title and level (e.g., Senior Software Engineer, not just 'Engineer')", 
                 "interview_type": "Specific interview type (Technical, Behavioral, Phone, Video, On-site, Panel, etc.)",
@@ -212,19 +216,18 @@ class EmailParser:
                 "experience_level": "Experience level (Entry, Mid, Senior, Lead, Principal, etc.)",
                 "additional_notes": "Any special requirements, company culture notes, or unique aspects",
                 "questions": ["If the email lists or implies questions, enumerate them here as plain text"]
-            }
+            }}
             
             Email Content: {content[:3000]}
             
             Be extremely precise and extract every relevant detail. Return only valid JSON.
             """
             
-            response = self.model.generate_content(prompt)
-            result = json.loads(response.text)
-            return result
+            return await agenerate_structured(self.model, prompt, EmailDetails)
             
         except Exception as e:
             print(f"AI extraction failed: {e}")
+            record_fallback("email_parser", e)
             return {
                 "company": None,
                 "position": None,
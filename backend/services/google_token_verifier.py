@@ -0,0 +1,152 @@
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional
+import os
+import requests
+from jose import jwt, JWTError
+from dotenv import load_dotenv
+
+load_dotenv()
+
+GOOGLE_CERTS_URL = os.getenv("GOOGLE_CERTS_URL", "https://www.googleapis.com/oauth2/v3/certs")
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+class GoogleTokenVerifier:
+    """Verifies Google ID tokens locally against a cached JWKS.
+
+    Signing keys are kept for the ``Cache-Control`` max-age of the certs response
+    and refreshed in a background thread shortly before they expire. A token with
+    an unknown ``kid`` forces a refetch at most once per ``min_refetch_interval``,
+    and concurrent callers share one in-flight fetch. Tokens that already
+    verified are memoized by digest until their ``exp``.
+    """
+
+    def __init__(
+        self,
+        client_id: str,
+        certs_url: str = GOOGLE_CERTS_URL,
+        default_max_age: int = 3600,
+        refresh_margin: int = 300,
+        max_cached_tokens: int = 1024,
+        min_refetch_interval: float = 60.0,
+    ):
+        self.client_id = client_id
+        self.certs_url = certs_url
+        self.default_max_age = default_max_age
+        self.refresh_margin = refresh_margin
+        self.max_cached_tokens = max_cached_tokens
+        self.min_refetch_interval = min_refetch_interval
+        self.fetch_count = 0
+
+        self._session = requests.Session()
+        self._keys: Dict[str, Dict[str, Any]] = {}
+        self._keys_expire_at = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._refreshed = threading.Event()  # set when the in-flight fetch finishes
+        self._last_fetch_at = 0.0
+        self._verified: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """Return the token's claims or raise ValueError. Blocking; run off the event loop."""
+        digest = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        now = time.time()
+        with self._lock:
+            claims = self._verified.get(digest)
+            if claims is not None:
+                if claims["exp"] > now:
+                    self._verified.move_to_end(digest)
+                    return claims
+                del self._verified[digest]
+
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+        except JWTError as e:
+            raise ValueError(f"Malformed token: {e}")
+        key = self._get_key(kid)
+        try:
+            claims = jwt.decode(
+                token,
+                key,
+                algorithms=["RS256"],
+                audience=self.client_id,
+                issuer=GOOGLE_ISSUERS,
+                options={"verify_at_hash": False},
+            )
+        except JWTError as e:
+            raise ValueError(f"Invalid token: {e}")
+
+        with self._lock:
+            self._verified[digest] = claims
+            while len(self._verified) > self.max_cached_tokens:
+                self._verified.popitem(last=False)
+        return claims
+
+    def _get_key(self, kid: Optional[str]) -> Dict[str, Any]:
+        now = time.time()
+        if now >= self._keys_expire_at:
+            # Cold or expired: fetch inline
+            self._refresh_shared()
+        elif kid not in self._keys:
+            # A rotated key we have not seen yet, or a made-up kid: refetch, but not on every request
+            if now - self._last_fetch_at >= self.min_refetch_interval:
+                self._refresh_shared()
+        elif now >= self._keys_expire_at - self.refresh_margin:
+            self._refresh_in_background()
+        key = self._keys.get(kid)
+        if key is None:
+            raise ValueError(f"Unknown signing key: {kid}")
+        return key
+
+    def _start_refresh(self) -> bool:
+        """Claim the single in-flight fetch; False when another caller already holds it."""
+        with self._lock:
+            if self._refreshing:
+                return False
+            self._refreshing = True
+            self._refreshed.clear()
+            self._last_fetch_at = time.time()
+            return True
+
+    def _refresh_shared(self) -> None:
+        if self._start_refresh():
+            self._refresh()
+        else:
+            self._refreshed.wait(timeout=10)
+
+    def _refresh_in_background(self) -> None:
+        if self._start_refresh():
+            threading.Thread(target=self._refresh, daemon=True).start()
+
+    def _refresh(self) -> None:
+        """Fetch the certs; the caller must have claimed the fetch with _start_refresh."""
+        try:
+            resp = self._session.get(self.certs_url, timeout=10)
+            resp.raise_for_status()
+            self.fetch_count += 1
+            keys = {k["kid"]: k for k in resp.json().get("keys", []) if "kid" in k}
+            match = _MAX_AGE_RE.search(resp.headers.get("Cache-Control", ""))
+            max_age = int(match.group(1)) if match else self.default_max_age
+            with self._lock:
+                self._keys = keys
+                self._keys_expire_at = time.time() + max_age
+        except Exception as e:
+            # Keep serving the previous keys; the next call retries the fetch
+            print(f"Google certs refresh failed: {e}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+                self._refreshed.set()
+
+
+@lru_cache(maxsize=None)
+def get_google_verifier(client_id: str) -> GoogleTokenVerifier:
+    """Process-wide verifier per OAuth client, so the key cache survives across requests."""
+    return GoogleTokenVerifier(client_id)
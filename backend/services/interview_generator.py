@@ -1,40 +1,261 @@
-import json
+import asyncio
+import copy
+import threading
+import time
 import uuid
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, Any, List
-import google.generativeai as genai
+from typing import Dict, Any, List, AsyncIterator, Optional, Tuple
 import os
 from dotenv import load_dotenv
+from services.metrics import timed, record_fallback, stage_duration
+from services.upstream import configure_gemini, gemini, gemini_model
+from services.structured_output import agenerate_structured, generate_structured
+from services.llm_schemas import InterviewQuestion, QuestionDetail
 
 load_dotenv()
 
+
+# Two-tier generation: questions first, answer outline and tips on demand
+OUTLINE_ONLY = """
+        Do not include expected answers or tips; they are generated separately when a candidate opens a question."""
+
+
+class _StreamCancelled(Exception):
+    pass
+
+
+class QuestionDetailCache:
+    """Bounded LRU of generated questions by id: the context needed to write their
+    answer outline and tips, and that detail once it has been generated."""
+    
+    def __init__(self, max_size: int = 4096):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, question_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(question_id)
+            if entry is not None:
+                self._entries.move_to_end(question_id)
+            return entry
+    
+    def put(self, question_id: str, context: Dict[str, Any], detail: Optional[Dict[str, Any]] = None) -> None:
+        with self._lock:
+            self._entries[question_id] = {"context": context, "detail": detail}
+            self._entries.move_to_end(question_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def set_detail(self, question_id: str, detail: Dict[str, Any]) -> None:
+        with self._lock:
+            entry = self._entries.get(question_id)
+            if entry is not None:
+                entry["detail"] = detail
+
+
 class InterviewGenerator:
     def __init__(self):
         api_key = os.getenv("GEMINI_API_KEY")
         if api_key:
-            genai.configure(api_key=api_key)
+            configure_gemini(api_key)
             # Use Gemini 2.5 Computer for more powerful question generation
-            self.model = genai.GenerativeModel('gemini-2.5-computer-use-preview-10-2025')
+            self.model = gemini_model('gemini-2.5-computer-use-preview-10-2025')
         else:
             self.model = None
+        self.details = QuestionDetailCache(int(os.getenv("QUESTION_CACHE_SIZE", "4096")))
+        self._detail_calls: Dict[str, asyncio.Future] = {}
         
-    async def generate_interview(self, parsed_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Generate interview questions based on parsed email data"""
+    async def generate_interview(self, parsed_data: Dict[str, Any], detail: bool = True) -> Dict[str, Any]:
+        """Generate interview questions based on parsed email data
         
-        company = parsed_data.get("company", "Unknown Company")
-        position = parsed_data.get("position", "Software Engineer")
-        interview_type = parsed_data.get("interview_type", "Technical")
+        With ``detail=False`` only question, category and difficulty are generated;
+        answer outlines and tips come later from ``question_detail``.
+        """
+        
+        interview = self._interview_shell(parsed_data)
+        company, position, level = interview["company"], interview["position"], interview["difficulty_level"]
         skills = parsed_data.get("skills", [])
-        requirements = parsed_data.get("requirements", [])
-        experience_level = parsed_data.get("experience_level", "Mid")
         
         # Generate questions based on interview type
-        if interview_type.lower() in ["technical", "coding", "programming"]:
-            questions = await self._generate_technical_questions(company, position, skills, experience_level)
-        elif interview_type.lower() in ["behavioral", "hr", "culture"]:
-            questions = await self._generate_behavioral_questions(company, position, experience_level)
+        kind = self._question_kind(interview["interview_type"])
+        if kind == "technical":
+            questions = await self._generate_technical_questions(company, position, skills, level, detail)
+        elif kind == "behavioral":
+            questions = await self._generate_behavioral_questions(company, position, level, detail)
+        else:
+            questions = await self._generate_mixed_questions(company, position, skills, level, detail)
+        
+        for question in questions:
+            self._register(interview, question)
+        interview["categories"][0]["questions"] = questions
+        interview["estimated_duration"] = self._calculate_duration(questions)
+        return interview
+    
+    async def stream_interview(self, parsed_data: Dict[str, Any], detail: bool = True) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Generate an interview, yielding each question as soon as Gemini has streamed it.
+        
+        Yields ("interview", shell without questions), then ("question", ...) per
+        question with the running estimated_duration, then ("done", full interview).
+        """
+        interview = self._interview_shell(parsed_data)
+        company, position, level = interview["company"], interview["position"], interview["difficulty_level"]
+        skills = parsed_data.get("skills", [])
+        kind = self._question_kind(interview["interview_type"])
+        yield "interview", interview
+        
+        if kind == "technical":
+            prompt = self._technical_prompt(company, position, skills, level, detail)
+        elif kind == "behavioral":
+            prompt = self._behavioral_prompt(company, position, level, detail)
         else:
-            questions = await self._generate_mixed_questions(company, position, skills, experience_level)
+            prompt = self._mixed_prompt(company, position, skills, level, detail)
+        
+        questions: List[Dict[str, Any]] = []
+        streamed: List[Dict[str, Any]] = []  # as parsed, before _register adds the id
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        cancelled = threading.Event()
+        
+        def on_item(item):
+            if cancelled.is_set():
+                raise _StreamCancelled()  # client went away: stop reading the Gemini stream
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        
+        def produce():
+            try:
+                return generate_structured(self.model, prompt, List[InterviewQuestion], stream=True, on_item=on_item)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, None)
+        
+        future = None
+        try:
+            final: List[Dict[str, Any]] = []
+            if self.model:
+                future = gemini.offload(produce)
+                while (item := await queue.get()) is not None:
+                    if not questions:
+                        stage_duration.observe(time.perf_counter() - start, stage="InterviewGenerator.stream_interview.first_question")
+                    streamed.append(copy.deepcopy(item))
+                    questions.append(self._register(interview, item))
+                    yield "question", self._question_event(questions)
+                try:
+                    final = await future
+                except Exception as e:
+                    print(f"Streaming question generation failed: {e}")
+                    record_fallback(f"interview_generator.{kind}", e)
+            else:
+                record_fallback(f"interview_generator.{kind}")
+            if not questions and not final:
+                final = self._fallback_questions(kind)
+            # Elements the incremental parser could not close (e.g. a cut-off final question).
+            # The repaired final parse can keep or drop elements the stream did not, so match
+            # on content rather than position
+            for item in final:
+                if item in streamed:
+                    streamed.remove(item)
+                    continue
+                questions.append(self._register(interview, item))
+                yield "question", self._question_event(questions)
+        finally:
+            cancelled.set()
+            if future is not None and not future.done():
+                future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        
+        stage_duration.observe(time.perf_counter() - start, stage="InterviewGenerator.stream_interview")
+        interview["categories"][0]["questions"] = questions
+        interview["estimated_duration"] = self._calculate_duration(questions)
+        yield "done", interview
+    
+    async def question_detail(self, question_id: str, context: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Answer outline and tips for one question, generated on first request and cached.
+        
+        ``context`` (question, category, difficulty, company, position, level)
+        describes a question this process did not generate, e.g. after a restart.
+        Returns None for an unknown id without context.
+        """
+        entry = self.details.get(question_id)
+        if entry is None:
+            if not context or not context.get("question"):
+                return None
+            self.details.put(question_id, context)
+            entry = self.details.get(question_id)
+        if entry["detail"] is not None:
+            return {"id": question_id, **entry["detail"]}
+        
+        # Concurrent opens of the same question share one generation
+        pending = self._detail_calls.get(question_id)
+        if pending is None:
+            pending = asyncio.ensure_future(self._generate_detail(entry["context"]))
+            self._detail_calls[question_id] = pending
+            pending.add_done_callback(lambda _: self._detail_calls.pop(question_id, None))
+        detail, generated = await asyncio.shield(pending)
+        if generated:
+            self.details.set_detail(question_id, detail)
+        return {"id": question_id, **detail}
+    
+    @timed()
+    async def _generate_detail(self, context: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+        """Returns (detail, generated); fallback detail is not cached so a later open retries."""
+        
+        if not self.model:
+            record_fallback("interview_generator.detail")
+            return self._get_fallback_detail(), False
+        
+        try:
+            detail = await agenerate_structured(self.model, self._detail_prompt(context), QuestionDetail, hedge=True)
+            return {"expected_answer": detail["expected_answer"], "tips": detail["tips"]}, True
+            
+        except Exception as e:
+            print(f"Question detail generation failed: {e}")
+            record_fallback("interview_generator.detail", e)
+            return self._get_fallback_detail(), False
+    
+    def _detail_prompt(self, context: Dict[str, Any]) -> str:
+        company = context.get("company") or "the company"
+        position = context.get("position") or "Software Engineer"
+        category = context.get("category") or "General"
+        return f"""
+        You are an experienced interviewer at {company} preparing a {context.get("level") or "Mid"} level {position} candidate.
+        
+        Interview question ({category}, {context.get("difficulty") or "Medium"}):
+        {context["question"]}
+        
+        Provide:
+        - expected_answer: Comprehensive outline of what an excellent answer should include, with examples (use the STAR method for behavioral questions)
+        - tips: 5-7 specific, actionable tips for answering this question exceptionally well
+        
+        Return as a JSON object with this exact structure:
+        {{
+            "expected_answer": "Outline of the expected answer",
+            "tips": ["Tip 1", "Tip 2", "Tip 3", "Tip 4", "Tip 5"]
+        }}
+        """
+    
+    def _register(self, interview: Dict[str, Any], question: Dict[str, Any]) -> Dict[str, Any]:
+        """Give the question an id and remember its context for question_detail"""
+        question["id"] = question.get("id") or uuid.uuid4().hex
+        context = {
+            "question": question["question"],
+            "category": question.get("category"),
+            "difficulty": question.get("difficulty"),
+            "company": interview["company"],
+            "position": interview["position"],
+            "level": interview["difficulty_level"],
+        }
+        detail = None
+        if question.get("expected_answer") or question.get("tips"):
+            detail = {"expected_answer": question.get("expected_answer") or "", "tips": question.get("tips") or []}
+        self.details.put(question["id"], context, detail)
+        return question
+    
+    def _interview_shell(self, parsed_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Interview metadata with an empty question list"""
+        company = parsed_data.get("company", "Unknown Company")
+        position = parsed_data.get("position", "Software Engineer")
+        interview_type = parsed_data.get("interview_type", "Technical")
         
         return {
             "id": str(uuid.uuid4()),
@@ -46,21 +267,61 @@ class InterviewGenerator:
                     "name": f"{interview_type.title()} Questions",
                     "description": f"Personalized {interview_type} questions for {position} at {company}",
                     "icon": "brain",
-                    "questions": questions
+                    "questions": []
                 }
             ],
             "created_at": datetime.now().isoformat(),
-            "estimated_duration": self._calculate_duration(questions),
-            "difficulty_level": experience_level
+            "estimated_duration": 0,
+            "difficulty_level": parsed_data.get("experience_level", "Mid")
+        }
+    
+    def _question_kind(self, interview_type: str) -> str:
+        if interview_type.lower() in ["technical", "coding", "programming"]:
+            return "technical"
+        if interview_type.lower() in ["behavioral", "hr", "culture"]:
+            return "behavioral"
+        return "mixed"
+    
+    def _question_event(self, questions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "index": len(questions) - 1,
+            "question": questions[-1],
+            "estimated_duration": self._calculate_duration(questions)
         }
     
-    async def _generate_technical_questions(self, company: str, position: str, skills: List[str], level: str) -> List[Dict[str, Any]]:
+    def _fallback_questions(self, kind: str) -> List[Dict[str, Any]]:
+        if kind == "technical":
+            return self._get_fallback_technical_questions()
+        if kind == "behavioral":
+            return self._get_fallback_behavioral_questions()
+        return self._get_fallback_mixed_questions()
+    
+    @timed()
+    async def _generate_technical_questions(self, company: str, position: str, skills: List[str], level: str, detail: bool = True) -> List[Dict[str, Any]]:
         """Generate technical interview questions"""
         
         if not self.model:
+            record_fallback("interview_generator.technical")
             return self._get_fallback_technical_questions()
         
-        prompt = f"""
+        prompt = self._technical_prompt(company, position, skills, level, detail)
+        
+        try:
+            return await agenerate_structured(self.model, prompt, List[InterviewQuestion])
+            
+        except Exception as e:
+            print(f"Technical question generation failed: {e}")
+            record_fallback("interview_generator.technical", e)
+            return self._get_fallback_technical_questions()
+    
+    def _technical_prompt(self, company: str, position: str, skills: List[str], level: str, detail: bool = True) -> str:
+        fields = """
+            - expected_answer: Comprehensive outline of what an excellent answer should include
+            - tips: 5-7 specific, actionable tips for answering this question exceptionally well""" if detail else OUTLINE_ONLY
+        example = """,
+                    "expected_answer": "Comprehensive outline of expected answer with examples",
+                    "tips": ["Tip 1", "Tip 2", "Tip 3", "Tip 4", "Tip 5", "Tip 6", "Tip 7"]""" if detail else ""
+        return f"""
             You are a world-class technical interviewer and engineering manager with deep expertise in {company}'s technology stack, engineering culture, and hiring practices. You have conducted hundreds of interviews at {company} and understand exactly what they look for in {position} candidates.
 
             Generate 8-10 highly sophisticated, company-specific technical interview questions for a {position} position at {company}.
@@ -83,40 +344,46 @@ class InterviewGenerator:
             For each question, provide:
             - question: The actual interview question (be specific and detailed)
             - category: Technical area (Data Structures, Algorithms, System Design, Architecture, etc.)
-            - difficulty: Easy, Medium, or Hard (calibrated for {level} level)
-            - expected_answer: Comprehensive outline of what an excellent answer should include
-            - tips: 5-7 specific, actionable tips for answering this question exceptionally well
+            - difficulty: Easy, Medium, or Hard (calibrated for {level} level){fields}
             
             Return as JSON array with this exact structure:
             [
                 {{
                     "question": "Detailed, specific question text here",
                     "category": "Technical area name",
-                    "difficulty": "Easy/Medium/Hard",
-                    "expected_answer": "Comprehensive outline of expected answer with examples",
-                    "tips": ["Tip 1", "Tip 2", "Tip 3", "Tip 4", "Tip 5", "Tip 6", "Tip 7"]
+                    "difficulty": "Easy/Medium/Hard"{example}
                 }}
             ]
             
             Make these questions so good that they could be used in actual interviews at {company}. Focus on practical, real-world scenarios that demonstrate deep technical knowledge and problem-solving ability.
             """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            questions = json.loads(response.text)
-            return questions
-            
-        except Exception as e:
-            print(f"Technical question generation failed: {e}")
-            return self._get_fallback_technical_questions()
     
-    async def _generate_behavioral_questions(self, company: str, position: str, level: str) -> List[Dict[str, Any]]:
+    @timed()
+    async def _generate_behavioral_questions(self, company: str, position: str, level: str, detail: bool = True) -> List[Dict[str, Any]]:
         """Generate behavioral interview questions"""
         
         if not self.model:
+            record_fallback("interview_generator.behavioral")
             return self._get_fallback_behavioral_questions()
         
-        prompt = f"""
+        prompt = self._behavioral_prompt(company, position, level, detail)
+        
+        try:
+            return await agenerate_structured(self.model, prompt, List[InterviewQuestion])
+            
+        except Exception as e:
+            print(f"Behavioral question generation failed: {e}")
+            record_fallback("interview_generator.behavioral", e)
+            return self._get_fallback_behavioral_questions()
+    
+    def _behavioral_prompt(self, company: str, position: str, level: str, detail: bool = True) -> str:
+        fields = """
+        4. Expected answer outline (STAR method)
+        5. Tips for answering""" if detail else OUTLINE_ONLY
+        example = """,
+                "expected_answer": "Brief outline using STAR method",
+                "tips": ["Tip 1", "Tip 2", "Tip 3"]""" if detail else ""
+        return f"""
         Generate 8-10 behavioral interview questions for a {position} position at {company}.
         Experience Level: {level}
         
@@ -130,38 +397,44 @@ class InterviewGenerator:
         For each question, provide:
         1. The question text
         2. Category (Leadership, Teamwork, Problem Solving, etc.)
-        3. Difficulty (Easy, Medium, Hard)
-        4. Expected answer outline (STAR method)
-        5. Tips for answering
+        3. Difficulty (Easy, Medium, Hard){fields}
         
         Return as JSON array with this structure:
         [
             {{
                 "question": "Question text here",
                 "category": "Category name",
-                "difficulty": "Easy/Medium/Hard",
-                "expected_answer": "Brief outline using STAR method",
-                "tips": ["Tip 1", "Tip 2", "Tip 3"]
+                "difficulty": "Easy/Medium/Hard"{example}
             }}
         ]
         """
-        
-        try:
-            response = self.model.generate_content(prompt)
-            questions = json.loads(response.text)
-            return questions
-            
-        except Exception as e:
-            print(f"Behavioral question generation failed: {e}")
-            return self._get_fallback_behavioral_questions()
     
-    async def _generate_mixed_questions(self, company: str, position: str, skills: List[str], level: str) -> List[Dict[str, Any]]:
+    @timed()
+    async def _generate_mixed_questions(self, company: str, position: str, skills: List[str], level: str, detail: bool = True) -> List[Dict[str, Any]]:
         """Generate mixed interview questions"""
         
         if not self.model:
+            record_fallback("interview_generator.mixed")
             return self._get_fallback_mixed_questions()
         
-        prompt = f"""
+        prompt = self._mixed_prompt(company, position, skills, level, detail)
+        
+        try:
+            return await agenerate_structured(self.model, prompt, List[InterviewQuestion])
+            
+        except Exception as e:
+            print(f"Mixed question generation failed: {e}")
+            record_fallback("interview_generator.mixed", e)
+            return self._get_fallback_mixed_questions()
+    
+    def _mixed_prompt(self, company: str, position: str, skills: List[str], level: str, detail: bool = True) -> str:
+        fields = """
+        4. Expected answer outline
+        5. Tips for answering""" if detail else OUTLINE_ONLY
+        example = """,
+                "expected_answer": "Brief outline of expected answer",
+                "tips": ["Tip 1", "Tip 2", "Tip 3"]""" if detail else ""
+        return f"""
         Generate 10-12 mixed interview questions for a {position} position at {company}.
         Experience Level: {level}
         Skills/Technologies: {', '.join(skills) if skills else 'General software development'}
@@ -174,36 +447,17 @@ class InterviewGenerator:
         For each question, provide:
         1. The question text
         2. Category (Technical, Behavioral, Company Culture, etc.)
-        3. Difficulty (Easy, Medium, Hard)
-        4. Expected answer outline
-        5. Tips for answering
+        3. Difficulty (Easy, Medium, Hard){fields}
         
         Return as JSON array with this structure:
         [
             {{
                 "question": "Question text here",
                 "category": "Category name",
-                "difficulty": "Easy/Medium/Hard",
-                "expected_answer": "Brief outline of expected answer",
-                "tips": ["Tip 1", "Tip 2", "Tip 3"]
+                "difficulty": "Easy/Medium/Hard"{example}
             }}
         ]
         """
-        
-        try:
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[{"role": "user", "content": prompt}],
-                temperature=0.7,
-                max_tokens=2500
-            )
-            
-            questions = json.loads(response.choices[0].message.content)
-            return questions
-            
-        except Exception as e:
-            print(f"Mixed question generation failed: {e}")
-            return self._get_fallback_mixed_questions()
     
     def _calculate_duration(self, questions: List[Dict[str, Any]]) -> int:
         """Calculate estimated interview duration in minutes"""
@@ -263,3 +517,10 @@ class InterviewGenerator:
     def _get_fallback_mixed_questions(self) -> List[Dict[str, Any]]:
         """Fallback mixed questions if AI generation fails"""
         return self._get_fallback_technical_questions() + self._get_fallback_behavioral_questions()
+    
+    def _get_fallback_detail(self) -> Dict[str, Any]:
+        """Generic answer outline and tips if AI generation fails"""
+        return {
+            "expected_answer": "Restate the question, outline your approach, walk through a concrete example, then summarize trade-offs and results.",
+            "tips": ["Clarify assumptions before answering", "Think out loud", "Use a specific example", "Close with what you would do differently"]
+        }
@@ -0,0 +1,265 @@
+import asyncio
+import os
+import shutil
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import undefer
+
+from database import AnalysisJob, BehavioralAnalysis, session_scope
+from services.metrics import stage_duration
+from services.scheduler import Priority, QueueFull, Scheduler, Ticket, scheduler as default_scheduler
+
+# Progress writes are coalesced to at most one per interval per job
+PROGRESS_INTERVAL_S = 0.5
+
+
+class JobQueue:
+    """Background /analyze-behavioral jobs.
+
+    The analysis_jobs table is the queue, so jobs survive restarts and any
+    process sharing the database can run them; no broker is involved. Each
+    process runs ``workers`` threads that claim queued jobs oldest first.
+    Running jobs refresh ``heartbeat_at``; one whose heartbeat is older than
+    ``lease`` seconds (its process died) is queued again, up to
+    ``max_attempts`` runs. Results are written to behavioral_analyses.
+
+    A job holds a BATCH scheduler slot while it runs, so background analyses
+    share the model budget with requests. The scheduler belongs to the app's
+    event loop, which ``start`` captures when called from it; started outside
+    a running loop, jobs are not scheduled.
+    """
+
+    def __init__(
+        self,
+        analyzer_factory: Callable[[], Any],
+        workers: int = 2,
+        video_dir: Optional[str] = None,
+        poll_interval: float = 1.0,
+        lease: float = 120.0,
+        max_attempts: int = 3,
+        scheduler: Optional[Scheduler] = None,
+    ):
+        self.analyzer_factory = analyzer_factory
+        self.workers = workers
+        self.video_dir = video_dir or os.getenv(
+            "ANALYSIS_JOB_DIR", os.path.join(os.path.dirname(os.path.dirname(__file__)), "analysis_jobs")
+        )
+        self.poll_interval = poll_interval
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.scheduler = scheduler or default_scheduler
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+        self._running = set()  # job ids this process is working on, kept alive by the heartbeat thread
+        self._running_lock = threading.Lock()
+
+    def start(self) -> None:
+        if self._threads or self.workers <= 0:
+            return
+        self._stop.clear()
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._loop = None
+        for i in range(self.workers):
+            self._threads.append(threading.Thread(target=self._work, name=f"analysis-job-{i}", daemon=True))
+        self._threads.append(threading.Thread(target=self._heartbeat, name="analysis-job-heartbeat", daemon=True))
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop claiming jobs; a job still running is picked up again after its lease expires."""
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, user_id: int, fileobj) -> str:
+        """Store the upload and queue a job for it; returns the job id. Blocks on disk and DB I/O."""
+        job_id = uuid.uuid4().hex
+        os.makedirs(self.video_dir, exist_ok=True)
+        video_path = os.path.join(self.video_dir, f"{job_id}.mp4")
+        with open(video_path, "wb") as f:
+            shutil.copyfileobj(fileobj, f, 1 << 20)
+        try:
+            with session_scope() as db:
+                db.add(AnalysisJob(id=job_id, user_id=user_id, status="queued", video_path=video_path))
+        except Exception:
+            os.unlink(video_path)
+            raise
+        self._wake.set()
+        return job_id
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with session_scope() as db:
+            job = db.scalar(select(AnalysisJob).options(undefer(AnalysisJob.result)).where(AnalysisJob.id == job_id))
+        if job is None:
+            return None
+        return {
+            "id": job.id,
+            "user_id": job.user_id,
+            "status": job.status,
+            "frames_done": job.frames_done or 0,
+            "frames_total": job.frames_total or 0,
+            "progress": round((job.frames_done or 0) / job.frames_total, 3) if job.frames_total else 0.0,
+            "analysis_id": job.analysis_id,
+            "result": job.result,
+            "error": job.error,
+            "created_at": job.created_at.isoformat() if job.created_at else None,
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        }
+
+    def _work(self) -> None:
+        while not self._stop.is_set():
+            try:
+                job = self._claim()
+            except Exception as e:
+                print(f"Error claiming analysis job: {e}")
+                job = None
+            if job is None:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                continue
+            self._run(*job)
+
+    def _claim(self) -> Optional[Tuple[str, int, str]]:
+        """Mark the oldest queued job running; returns (id, user_id, video_path)."""
+        now = datetime.utcnow()
+        self._requeue_stale(now)
+        with session_scope() as db:
+            while True:
+                row = db.execute(
+                    select(AnalysisJob.id, AnalysisJob.user_id, AnalysisJob.video_path, AnalysisJob.created_at)
+                    .where(AnalysisJob.status == "queued")
+                    .order_by(AnalysisJob.created_at)
+                    .limit(1)
+                ).first()
+                if row is None:
+                    return None
+                # The status guard makes the claim atomic across threads and processes
+                claimed = db.execute(
+                    update(AnalysisJob)
+                    .where(AnalysisJob.id == row.id, AnalysisJob.status == "queued")
+                    .values(status="running", attempts=AnalysisJob.attempts + 1, heartbeat_at=now)
+                ).rowcount
+                if claimed:
+                    stage_duration.observe((now - row.created_at).total_seconds(), stage="JobQueue.wait")
+                    with self._running_lock:
+                        self._running.add(row.id)
+                    return row.id, row.user_id, row.video_path
+
+    def _requeue_stale(self, now: datetime) -> None:
+        stale = (AnalysisJob.status == "running") & (AnalysisJob.heartbeat_at < now - timedelta(seconds=self.lease))
+        failed = []
+        with session_scope() as db:
+            dead = db.execute(
+                select(AnalysisJob.id, AnalysisJob.video_path).where(stale, AnalysisJob.attempts >= self.max_attempts)
+            ).all()
+            for job in dead:
+                # Still guarded by ``stale``: a heartbeat may have landed since the select
+                if db.execute(
+                    update(AnalysisJob)
+                    .where(AnalysisJob.id == job.id, stale)
+                    .values(status="failed", error="Analysis worker stopped responding", finished_at=now)
+                ).rowcount:
+                    failed.append(job.video_path)
+            db.execute(update(AnalysisJob).where(stale).values(status="queued"))
+        # No run will come back for these videos
+        for video_path in failed:
+            if video_path and os.path.exists(video_path):
+                os.unlink(video_path)
+
+    def _run(self, job_id: str, user_id: int, video_path: str) -> None:
+        started = time.perf_counter()
+        last_write = [0.0]
+
+        def progress(done: int, total: int) -> None:
+            now = time.monotonic()
+            if now - last_write[0] < PROGRESS_INTERVAL_S and done < total:
+                return
+            last_write[0] = now
+            with session_scope() as db:
+                db.execute(
+                    update(AnalysisJob)
+                    .where(AnalysisJob.id == job_id)
+                    .values(frames_done=done, frames_total=total, heartbeat_at=datetime.utcnow())
+                )
+
+        ticket = None
+        try:
+            ticket = self._acquire(user_id)
+            # Each worker thread runs its own event loop for the analyzer's async API
+            result = asyncio.run(self.analyzer_factory().analyze_path(video_path, progress))
+            with session_scope() as db:
+                record = BehavioralAnalysis(
+                    user_id=user_id,
+                    session_id=None,
+                    confidence_score=int(round(result.get("confidence_score") or 0)),
+                    eye_contact_score=int(round(result.get("eye_contact_score") or 0)),
+                    posture_score=int(round(result.get("posture_score") or 0)),
+                    speech_clarity=int(round(result.get("speech_clarity") or 0)),
+                    overall_feedback=result.get("overall_feedback"),
+                    improvements=result.get("improvements") or [],
+                    trends=result.get("trends") or {},
+                    segments=result.get("segments") or [],
+                )
+                db.add(record)
+                db.flush()
+                db.execute(
+                    update(AnalysisJob)
+                    .where(AnalysisJob.id == job_id)
+                    .values(status="done", analysis_id=record.id, result=result, finished_at=datetime.utcnow())
+                )
+        except Exception as e:
+            print(f"Analysis job {job_id} failed: {e}")
+            with session_scope() as db:
+                db.execute(
+                    update(AnalysisJob)
+                    .where(AnalysisJob.id == job_id)
+                    .values(status="failed", error=str(e), finished_at=datetime.utcnow())
+                )
+        finally:
+            if ticket is not None and not self._loop.is_closed():
+                self._loop.call_soon_threadsafe(ticket.release)
+            with self._running_lock:
+                self._running.discard(job_id)
+            if os.path.exists(video_path):
+                os.unlink(video_path)
+            stage_duration.observe(time.perf_counter() - started, stage="JobQueue.run")
+
+    def _acquire(self, user_id: int) -> Optional[Ticket]:
+        """Wait for a BATCH slot on the app's loop; the scheduler is not thread-safe."""
+        if self._loop is None:
+            return None
+        while True:
+            future = asyncio.run_coroutine_threadsafe(self.scheduler.acquire(Priority.BATCH, f"user:{user_id}"), self._loop)
+            try:
+                return future.result()
+            except QueueFull as e:
+                # Requests filled the BATCH queue; the job keeps its lease through the heartbeat meanwhile
+                time.sleep(e.retry_after)
+
+    def _heartbeat(self) -> None:
+        # Long model calls report no progress; keep their leases fresh regardless
+        while not self._stop.wait(self.lease / 3):
+            with self._running_lock:
+                running = list(self._running)
+            if not running:
+                continue
+            try:
+                with session_scope() as db:
+                    db.execute(
+                        update(AnalysisJob)
+                        .where(AnalysisJob.id.in_(running), AnalysisJob.status == "running")
+                        .values(heartbeat_at=datetime.utcnow())
+                    )
+            except Exception as e:
+                print(f"Error refreshing analysis job heartbeat: {e}")
@@ -0,0 +1,88 @@
+from typing import Any, Dict, List, Optional, Union
+from pydantic import BaseModel, ConfigDict, Field
+
+# Response shapes requested from Gemini. The fields a caller cannot do without
+# (the question, the scores, the feedback) are required, so an answer missing
+# them fails validation and the caller falls back; the rest default so a
+# partial answer still validates. Extra keys the model adds are passed through.
+
+
+class _LLMModel(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class InterviewQuestion(_LLMModel):
+    question: str
+    category: str = "General"
+    difficulty: str = "Medium"
+    expected_answer: Optional[str] = None
+    tips: List[str] = []
+
+
+class QuestionDetail(_LLMModel):
+    expected_answer: str = ""
+    tips: List[str] = []
+
+
+class EmailDetails(_LLMModel):
+    company: Optional[str] = None
+    position: Optional[str] = None
+    interview_type: Optional[str] = None
+    location: Optional[str] = None
+    requirements: List[str] = []
+    skills: List[str] = []
+    experience_level: Optional[str] = None
+    additional_notes: Optional[str] = ""
+    questions: List[str] = []
+
+
+class Verdict(_LLMModel):
+    score: Union[int, float]
+    verdict: str
+
+
+class AnswerEvaluation(_LLMModel):
+    evaluation: Verdict
+    summary: str = ""
+    visual_prompt: str = ""
+    explanation: str = ""
+    theory: str = ""
+
+
+class StarFlags(_LLMModel):
+    situation: bool = False
+    task: bool = False
+    action: bool = False
+    result: bool = False
+    completeness: float = 0.0
+
+
+class FrameAnalysis(_LLMModel):
+    speech_clarity: float
+    tone_confidence: float
+    emotional_stability: float
+    eye_contact: bool = False
+    eye_contact_score: float
+    facial_expression: str = "neutral"
+    engagement_level: float
+    star: StarFlags = Field(default_factory=StarFlags)
+    suggestions: List[str] = []
+
+
+class VideoScores(_LLMModel):
+    confidence_score: float
+    eye_contact_score: float
+    posture_score: float
+    speech_clarity: float
+
+
+class VideoFeedback(_LLMModel):
+    overall: str
+    improvements: List[str] = []
+
+
+class VideoAnalysis(_LLMModel):
+    overall: VideoScores
+    trends: Dict[str, List[Dict[str, Any]]] = Field(default_factory=lambda: {"emotion": [], "focus": [], "responseQuality": []})
+    segments: List[Dict[str, Any]] = []
+    feedback: VideoFeedback
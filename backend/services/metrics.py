@@ -0,0 +1,225 @@
+import asyncio
+import functools
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Seconds; spans fast DB queries through multi-second LLM calls and video analysis
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}={json.dumps(v)}' for k, v in pairs) + "}"
+
+
+class Counter:
+    def __init__(self, name: str, doc: str):
+        self.name, self.doc, self.kind = name, doc, "counter"
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0.0)
+
+    def collect(self) -> Iterable[str]:
+        with self._lock:
+            items = list(self._values.items())
+        for key, v in items:
+            yield f"{self.name}{_format_labels(key)} {v}"
+
+
+class Gauge(Counter):
+    def __init__(self, name: str, doc: str):
+        super().__init__(name, doc)
+        self.kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram:
+    def __init__(self, name: str, doc: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name, self.doc, self.kind = name, doc, "histogram"
+        self.buckets = buckets
+        # per label set: [bucket counts..., +Inf count], sum
+        self._values: Dict[LabelKey, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][idx] += 1
+            entry[1][0] += value
+
+    def count(self, **labels) -> int:
+        entry = self._values.get(_label_key(labels))
+        return sum(entry[0]) if entry else 0
+
+    def collect(self) -> Iterable[str]:
+        with self._lock:
+            items = [(k, list(c), s[0]) for k, (c, s) in self._values.items()]
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, c in zip(self.buckets, counts):
+                cumulative += c
+                yield f"{self.name}_bucket{_format_labels(key, ('le', repr(bound)))} {cumulative}"
+            cumulative += counts[-1]
+            yield f"{self.name}_bucket{_format_labels(key, ('le', '+Inf'))} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(key)} {total}"
+            yield f"{self.name}_count{_format_labels(key)} {cumulative}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Prometheus text exposition format (per process)."""
+        lines = []
+        for m in self._metrics:
+            lines.append(f"# HELP {m.name} {m.doc}")
+            lines.append(f"# TYPE {m.name} {m.kind}")
+            lines.extend(m.collect())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_request_duration = registry.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template, method and status"))
+stage_duration = registry.register(Histogram(
+    "stage_duration_seconds", "Latency of internal pipeline stages"))
+llm_fallbacks = registry.register(Counter(
+    "llm_fallbacks_total", "Times a component served its canned/local fallback instead of an LLM result"))
+llm_parse_failures = registry.register(Counter(
+    "llm_parse_failures_total", "LLM responses that could not be parsed into the expected shape"))
+upstream_in_flight = registry.register(Gauge(
+    "upstream_in_flight", "Upstream (Gemini, ElevenLabs) calls currently in flight"))
+upstream_retries = registry.register(Counter(
+    "upstream_retries_total", "Upstream calls retried after a timeout, connection error or 429/5xx"))
+upstream_hedges = registry.register(Counter(
+    "upstream_hedges_total", "Duplicate upstream requests sent because the first was slow"))
+upstream_rejections = registry.register(Counter(
+    "upstream_rejections_total", "Upstream calls refused locally (circuit_open, rate_limited, saturated)"))
+upstream_circuit_state = registry.register(Gauge(
+    "upstream_circuit_state", "Circuit breaker state per upstream: 0 closed, 1 half-open, 2 open"))
+scheduler_queue_depth = registry.register(Gauge(
+    "scheduler_queue_depth", "LLM-bound requests waiting for a scheduler slot, per priority class"))
+scheduler_wait = registry.register(Histogram(
+    "scheduler_wait_seconds", "Time requests spent queued for a scheduler slot, per priority class"))
+scheduler_rejections = registry.register(Counter(
+    "scheduler_rejections_total", "Requests turned away by the scheduler (queue_full, expired, superseded)"))
+
+
+def timed(stage: Optional[str] = None):
+    """Decorator recording the wrapped function's latency under ``stage`` (default: qualname)."""
+    def decorator(fn):
+        name = stage or fn.__qualname__
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    stage_duration.observe(time.perf_counter() - start, stage=name)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                stage_duration.observe(time.perf_counter() - start, stage=name)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def in_flight(upstream: str):
+    upstream_in_flight.inc(upstream=upstream)
+    try:
+        yield
+    finally:
+        upstream_in_flight.dec(upstream=upstream)
+
+
+def record_fallback(component: str, exc: Optional[BaseException] = None) -> None:
+    """Count a fallback; malformed model output (ValueError/JSONDecodeError) also counts as a parse failure."""
+    llm_fallbacks.inc(component=component)
+    if isinstance(exc, ValueError):
+        llm_parse_failures.inc(component=component)
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing every HTTP request, labelled by route template."""
+
+    def __init__(self, app):
+        self.app = app
+        self._routes: Dict[object, str] = {}
+
+    def _route_path(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        path = self._routes.get(endpoint)
+        if path is None:
+            router_app = scope.get("app")
+            for route in getattr(router_app, "routes", []):
+                if getattr(route, "endpoint", None) is endpoint:
+                    path = route.path
+                    break
+            self._routes[endpoint] = path = path or "unmatched"
+        return path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_request_duration.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=self._route_path(scope),
+                status=status["code"],
+            )
@@ -0,0 +1,168 @@
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Callable, Iterable, Optional
+from dotenv import load_dotenv
+from starlette.concurrency import run_in_threadpool
+
+load_dotenv()
+
+
+class StackSampler:
+    """Samples the Python stacks of every thread in the process at a fixed interval.
+
+    Request work runs on the event loop and in the threadpool / executors it
+    hands off to, so all threads are sampled; each stack is rooted at its
+    thread's name to keep them apart. Output is the collapsed-stack format
+    (``root;child;leaf count`` per line) read by flamegraph.pl, speedscope and
+    inferno.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> "StackSampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> str:
+        self._stop.set()
+        self._thread.join()
+        return self.collapsed()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, f"thread-{thread_id}"))
+                self.samples[";".join(reversed(stack))] += 1
+
+
+class ProfileStore:
+    """Ring buffer of collapsed-stack files on disk; the oldest are deleted beyond ``max_files``."""
+
+    def __init__(self, root: Optional[str] = None, max_files: int = 200):
+        self.root = root or os.getenv("PROFILE_DIR", os.path.join(os.path.dirname(os.path.dirname(__file__)), "profiles"))
+        self.max_files = max_files
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def save(self, route: str, collapsed: str) -> str:
+        slug = route.strip("/").replace("/", "_") or "root"
+        name = f"{int(time.time() * 1000)}-{slug}-{uuid.uuid4().hex[:8]}.collapsed"
+        with open(os.path.join(self.root, name), "w") as f:
+            f.write(collapsed)
+        self._trim()
+        return name
+
+    def path(self, name: str) -> Optional[str]:
+        if os.path.basename(name) != name or not name.endswith(".collapsed"):
+            return None
+        path = os.path.join(self.root, name)
+        return path if os.path.exists(path) else None
+
+    def _trim(self):
+        with self._lock:
+            files = sorted(f for f in os.listdir(self.root) if f.endswith(".collapsed"))
+            for old in files[:-self.max_files] if len(files) > self.max_files else []:
+                try:
+                    os.unlink(os.path.join(self.root, old))
+                except FileNotFoundError:
+                    pass
+
+
+class ProfilerMiddleware:
+    """Runs a StackSampler around selected routes.
+
+    A request is profiled when an admin asks for it (``X-Profile: 1`` header or
+    ``?profile=1``) or, with ``sample_every`` > 0, for 1 in N requests. The
+    collapsed stacks are stored in the ProfileStore and the file name is
+    returned in the ``X-Profile-Id`` response header.
+    """
+
+    def __init__(
+        self,
+        app,
+        routes: Iterable[str],
+        is_admin: Callable[[dict], bool],
+        store_factory: Callable[[], ProfileStore] = ProfileStore,
+        sample_every: int = 0,
+        interval: float = 0.005,
+    ):
+        self.app = app
+        self.routes = set(routes)
+        self.is_admin = is_admin
+        self.store_factory = store_factory
+        self.sample_every = sample_every
+        self.interval = interval
+        self._store: Optional[ProfileStore] = None
+        self._count = 0
+        self._lock = threading.Lock()
+
+    async def _requested(self, scope) -> bool:
+        headers = {k.decode("latin-1").lower(): v.decode("latin-1") for k, v in scope.get("headers", [])}
+        query = scope.get("query_string", b"").decode("latin-1")
+        asked = headers.get("x-profile") == "1" or "profile=1" in query.split("&")
+        # The admin check reads the database; keep it off the event loop
+        return asked and await run_in_threadpool(self.is_admin, headers)
+
+    def _sampled(self) -> bool:
+        if self.sample_every <= 0:
+            return False
+        with self._lock:
+            self._count += 1
+            return self._count % self.sample_every == 0
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.routes:
+            return await self.app(scope, receive, send)
+        if not (self._sampled() or await self._requested(scope)):
+            return await self.app(scope, receive, send)
+
+        if self._store is None:
+            self._store = await run_in_threadpool(self.store_factory)
+        sampler = StackSampler(self.interval).start()
+        finished = {"value": False}
+
+        def finish() -> Optional[str]:
+            # Runs once, whether or not the save succeeds; joining the sampler and writing the file both block
+            finished["value"] = True
+            try:
+                return self._store.save(scope["path"], sampler.stop())
+            except Exception as e:
+                print(f"Error saving profile for {scope['path']}: {e}")
+                return None
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and not finished["value"]:
+                # Stop at the first byte so the id can go in the headers
+                name = await run_in_threadpool(finish)
+                if name is not None:
+                    message = {**message, "headers": list(message.get("headers", [])) + [
+                        (b"x-profile-id", name.encode("latin-1"))
+                    ]}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The app raised before responding; keep the profile anyway
+            if not finished["value"]:
+                await run_in_threadpool(finish)
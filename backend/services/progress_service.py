@@ -1,10 +1,11 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from database import InterviewAttempt, StudySession, DSAAttempt, MentorSession
+from typing import List, Dict, Any, Optional, Tuple
+from sqlalchemy.orm import Session, load_only, undefer_group
+from sqlalchemy import func, select, literal, case, cast, union_all, and_, or_, Float
+from services.metrics import timed
+from database import InterviewAttempt, StudySession, DSAAttempt, MentorSession, BehavioralAnalysis
 
 @dataclass
 class DashboardStats:
@@ -20,6 +21,7 @@ class ProgressService:
         self.db = db
         self.user_id = user_id
 
+    @timed()
     def stats(self) -> DashboardStats:
         total_interviews = self.db.query(InterviewAttempt).filter(InterviewAttempt.user_id == self.user_id).count()
         avg_score = (
@@ -89,6 +91,7 @@ class ProgressService:
             questions_practiced=int(questions_practiced),
         )
 
+    @timed()
     def weekly_progress(self) -> List[Dict[str, Any]]:
         now = datetime.utcnow()
         start = now - timedelta(weeks=8)
@@ -114,6 +117,7 @@ class ProgressService:
                 data.append({"week": week_label, "sessions": 0, "score": 0})
         return data
 
+    @timed()
     def category_performance(self) -> List[Dict[str, Any]]:
         rows = (
             self.db.query(
@@ -137,20 +141,184 @@ class ProgressService:
             ]
         return data
 
-    def recent_activity(self) -> List[Dict[str, Any]]:
-        def map_row(date: datetime, label: str, score: float):
-            return {"date": date.strftime('%Y-%m-%d'), "activity": label, "score": round(score, 1)}
-        acts = []
-        for r in self.db.query(StudySession).filter(StudySession.user_id == self.user_id).order_by(StudySession.completed_at.desc()).limit(5).all():
-            score = (r.questions_correct * 100.0 / r.questions_attempted) if r.questions_attempted else 0
-            acts.append(map_row(r.completed_at, f"Study: {r.topic}", score))
-        for r in self.db.query(InterviewAttempt).filter(InterviewAttempt.user_id == self.user_id).order_by(InterviewAttempt.completed_at.desc()).limit(5).all():
-            acts.append(map_row(r.completed_at, f"Interview: {r.type}", r.score))
-        for r in self.db.query(DSAAttempt).filter(DSAAttempt.user_id == self.user_id).order_by(DSAAttempt.attempted_at.desc()).limit(5).all():
-            acts.append(map_row(r.attempted_at, f"DSA: {r.topic}", 100.0 if r.correct else 0.0))
-        acts.sort(key=lambda a: a["date"], reverse=True)
-        result = acts[:5]
-        if not result:
-            now = datetime.utcnow()
-            result = [{"date": now.strftime('%Y-%m-%d'), "activity": "No activity yet", "score": 0}]
+    # Sort order of activity kinds within the same timestamp (descending).
+    ACTIVITY_KINDS = ("study", "interview", "dsa")
+    ACTIVITY_LABELS = {"study": "Study", "interview": "Interview", "dsa": "DSA"}
+
+    def recent_activity(self, limit: int = 5, cursor: Optional[str] = None) -> List[Dict[str, Any]]:
+        result, _ = self.recent_activity_page(limit=limit, cursor=cursor)
+        if not result and cursor is None:
+            result = self.empty_activity()
         return result
+
+    @staticmethod
+    def empty_activity() -> List[Dict[str, Any]]:
+        now = datetime.utcnow()
+        return [{"date": now.strftime('%Y-%m-%d'), "activity": "No activity yet", "score": 0}]
+
+    @timed()
+    def recent_activity_page(self, limit: int = 5, cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Merged activity feed, newest first, paged with an opaque keyset cursor.
+
+        All activity tables are combined in one UNION ALL query that projects only
+        (timestamp, kind, id, label, score) and is ordered by the real timestamp.
+        """
+        after = self._decode_cursor(cursor) if cursor else None
+        branches = []
+        for kind, ts_col, id_col, label_col, score_col, user_col in self._activity_sources():
+            stmt = select(
+                ts_col.label("ts"),
+                literal(kind).label("kind"),
+                id_col.label("id"),
+                label_col.label("label"),
+                cast(score_col, Float).label("score"),
+            ).where(user_col == self.user_id)
+            if after is not None:
+                stmt = stmt.where(self._keyset_before(kind, ts_col, id_col, after))
+            # Per-table top-N keeps each branch on its (user_id, timestamp, id) index
+            branches.append(select(stmt.order_by(ts_col.desc(), id_col.desc()).limit(limit + 1).subquery()))
+        feed = union_all(*branches).subquery("activity")
+        rows = self.db.execute(
+            select(feed.c.ts, feed.c.kind, feed.c.id, feed.c.label, feed.c.score)
+            .order_by(feed.c.ts.desc(), feed.c.kind.desc(), feed.c.id.desc())
+            .limit(limit + 1)
+        ).all()
+
+        items = [
+            {
+                "date": ts.strftime('%Y-%m-%d'),
+                "activity": f"{self.ACTIVITY_LABELS[kind]}: {label}",
+                "score": round(float(score or 0), 1),
+            }
+            for ts, kind, _id, label, score in rows[:limit]
+        ]
+        next_cursor = None
+        if len(rows) > limit:
+            ts, kind, _id = rows[limit - 1][:3]
+            next_cursor = self._encode_cursor(ts, kind, _id)
+        return items, next_cursor
+
+    def _activity_sources(self):
+        return [
+            (
+                "study",
+                StudySession.completed_at,
+                StudySession.id,
+                StudySession.topic,
+                case(
+                    (StudySession.questions_attempted > 0, StudySession.questions_correct * 100.0 / StudySession.questions_attempted),
+                    else_=0.0,
+                ),
+                StudySession.user_id,
+            ),
+            (
+                "interview",
+                InterviewAttempt.completed_at,
+                InterviewAttempt.id,
+                InterviewAttempt.type,
+                InterviewAttempt.score,
+                InterviewAttempt.user_id,
+            ),
+            (
+                "dsa",
+                DSAAttempt.attempted_at,
+                DSAAttempt.id,
+                DSAAttempt.topic,
+                case((DSAAttempt.correct == True, 100.0), else_=0.0),
+                DSAAttempt.user_id,
+            ),
+        ]
+
+    @staticmethod
+    def _keyset_before(kind: str, ts_col, id_col, after: Tuple[datetime, str, int]):
+        """Rows strictly after the cursor in (ts desc, kind desc, id desc) order."""
+        c_ts, c_kind, c_id = after
+        if kind < c_kind:
+            return ts_col <= c_ts
+        if kind > c_kind:
+            return ts_col < c_ts
+        return or_(ts_col < c_ts, and_(ts_col == c_ts, id_col < c_id))
+
+    @staticmethod
+    def _encode_cursor(ts: datetime, kind: str, row_id: int) -> str:
+        return f"{ts.isoformat()}~{kind}~{row_id}"
+
+    @classmethod
+    def _decode_cursor(cls, cursor: str) -> Tuple[datetime, str, int]:
+        try:
+            ts, kind, row_id = cursor.split("~")
+            if kind not in cls.ACTIVITY_KINDS:
+                raise ValueError(kind)
+            return datetime.fromisoformat(ts), kind, int(row_id)
+        except ValueError:
+            raise ValueError(f"Invalid activity cursor: {cursor}")
+
+    @timed()
+    def behavioral_page(self, limit: int = 5, cursor: Optional[str] = None, full: bool = False) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Behavioral analyses newest first; summary rows never load trends/segments."""
+        query = self.db.query(BehavioralAnalysis).filter(BehavioralAnalysis.user_id == self.user_id)
+        if full:
+            query = query.options(undefer_group("detail"))
+        else:
+            query = query.options(load_only(
+                BehavioralAnalysis.id,
+                BehavioralAnalysis.created_at,
+                BehavioralAnalysis.confidence_score,
+                BehavioralAnalysis.eye_contact_score,
+                BehavioralAnalysis.posture_score,
+                BehavioralAnalysis.speech_clarity,
+                BehavioralAnalysis.overall_feedback,
+                BehavioralAnalysis.improvements,
+            ))
+        if cursor:
+            c_ts, c_id = self._decode_behavioral_cursor(cursor)
+            query = query.filter(or_(
+                BehavioralAnalysis.created_at < c_ts,
+                and_(BehavioralAnalysis.created_at == c_ts, BehavioralAnalysis.id < c_id),
+            ))
+        rows = (
+            query.order_by(BehavioralAnalysis.created_at.desc(), BehavioralAnalysis.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+        items = [self._behavioral_row(r, full) for r in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = f"{last.created_at.isoformat()}~{last.id}"
+        return items, next_cursor
+
+    @timed()
+    def behavioral_detail(self, analysis_id: int) -> Optional[Dict[str, Any]]:
+        row = (
+            self.db.query(BehavioralAnalysis)
+            .options(undefer_group("detail"))
+            .filter(BehavioralAnalysis.user_id == self.user_id, BehavioralAnalysis.id == analysis_id)
+            .first()
+        )
+        return self._behavioral_row(row, True) if row else None
+
+    @staticmethod
+    def _behavioral_row(r: BehavioralAnalysis, full: bool) -> Dict[str, Any]:
+        out = {
+            "id": r.id,
+            "date": r.created_at.isoformat() if r.created_at else None,
+            "confidence_score": r.confidence_score,
+            "eye_contact_score": r.eye_contact_score,
+            "posture_score": r.posture_score,
+            "speech_clarity": r.speech_clarity,
+            "overall_feedback": r.overall_feedback,
+            "improvements": r.improvements or [],
+        }
+        if full:
+            out["trends"] = r.trends or {}
+            out["segments"] = r.segments or []
+        return out
+
+    @staticmethod
+    def _decode_behavioral_cursor(cursor: str) -> Tuple[datetime, int]:
+        try:
+            ts, row_id = cursor.split("~")
+            return datetime.fromisoformat(ts), int(row_id)
+        except ValueError:
+            raise ValueError(f"Invalid behavioral cursor: {cursor}")
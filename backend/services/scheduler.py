@@ -0,0 +1,213 @@
+import asyncio
+import math
+import os
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from enum import IntEnum
+from typing import Deque, Dict, Hashable, Optional
+
+from services.metrics import scheduler_queue_depth, scheduler_rejections, scheduler_wait
+
+
+class Priority(IntEnum):
+    """Lower values are served first."""
+
+    INTERACTIVE = 0  # someone is waiting on screen: live frames, answer evaluation, question detail
+    STANDARD = 1     # one-off generation: email parsing, interview generation
+    BATCH = 2        # whole-video analysis
+
+
+class QueueFull(Exception):
+    """The priority class's queue is at capacity; retry after ``retry_after`` seconds."""
+
+    def __init__(self, priority: Priority, retry_after: int):
+        super().__init__(f"{priority.name.lower()} queue is full")
+        self.priority = priority
+        self.retry_after = retry_after
+
+
+class Expired(Exception):
+    """The request's deadline passed, or a newer request with the same key replaced it,
+    before a slot became free. Nothing was sent upstream."""
+
+    def __init__(self, reason: str):
+        super().__init__(f"request {reason} while queued")
+        self.reason = reason
+
+
+class Ticket:
+    """A granted slot. ``release`` is idempotent."""
+
+    def __init__(self, scheduler: Optional["Scheduler"], priority: Priority):
+        self._scheduler = scheduler
+        self.priority = priority
+        self._started = time.monotonic()
+
+    def release(self) -> None:
+        scheduler, self._scheduler = self._scheduler, None
+        if scheduler is not None:
+            scheduler._release(self.priority, time.monotonic() - self._started)
+
+
+class _Waiter:
+    __slots__ = ("future", "key", "deadline", "enqueued")
+
+    def __init__(self, future: asyncio.Future, key: Hashable, deadline: Optional[float]):
+        self.future = future
+        self.key = key
+        self.deadline = deadline
+        self.enqueued = time.monotonic()
+
+
+class Scheduler:
+    """Admission control for LLM-bound requests on one event loop.
+
+    ``slots`` requests run at once. Waiting requests are served strictly by
+    priority, and round-robin by key (user) within a priority, so one user's
+    burst cannot delay everyone else's. ``class_slots`` caps how many slots a
+    class may hold; keeping BATCH well below ``slots`` leaves room for
+    interactive work that arrives while videos are being analyzed. Each class
+    queues at most ``max_queue`` requests; beyond that ``acquire`` raises
+    ``QueueFull`` with an estimated wait. ``slots=0`` disables scheduling.
+    """
+
+    def __init__(self, slots: int, class_slots: Optional[Dict[Priority, int]] = None, max_queue: int = 64):
+        self.slots = slots
+        self.class_slots = {p: min(slots, (class_slots or {}).get(p, slots)) for p in Priority}
+        self.max_queue = max_queue
+        self._running = 0
+        self._class_running = {p: 0 for p in Priority}
+        # Per class: key -> that key's waiters, oldest first; keys rotate to the back when served
+        self._queues: Dict[Priority, "OrderedDict[Hashable, Deque[_Waiter]]"] = {p: OrderedDict() for p in Priority}
+        self._queued = {p: 0 for p in Priority}
+        # Moving average of how long a slot is held, for Retry-After
+        self._service_time = {p: 1.0 for p in Priority}
+
+    def queued(self, priority: Priority) -> int:
+        return self._queued[priority]
+
+    def running(self, priority: Optional[Priority] = None) -> int:
+        return self._running if priority is None else self._class_running[priority]
+
+    def retry_after(self, priority: Priority) -> int:
+        backlog = self._queued[priority] + 1
+        return max(1, math.ceil(backlog * self._service_time[priority] / max(1, self.class_slots[priority])))
+
+    async def acquire(self, priority: Priority, key: Hashable, timeout: Optional[float] = None, supersede: bool = False) -> Ticket:
+        """Wait for a slot. ``timeout`` is the request's deadline: past it the request
+        is dropped with ``Expired`` rather than run late. With ``supersede`` a new
+        request replaces any of the same key still queued (e.g. an older live frame).
+        """
+        if self.slots <= 0:
+            return Ticket(None, priority)
+        if supersede:
+            self._drop_key(priority, key)
+        if self._queued[priority] == 0 and self._has_capacity(priority):
+            return self._grant(priority)
+        if self._queued[priority] >= self.max_queue:
+            scheduler_rejections.inc(priority=priority.name.lower(), reason="queue_full")
+            raise QueueFull(priority, self.retry_after(priority))
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), key, deadline)
+        self._queues[priority].setdefault(key, deque()).append(waiter)
+        self._count(priority, 1)
+        try:
+            return await asyncio.wait_for(asyncio.shield(waiter.future), timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            future = waiter.future
+            if future.done() and not future.cancelled() and future.exception() is None:
+                # Granted at the same moment the deadline hit or the client went away
+                if isinstance(e, asyncio.TimeoutError):
+                    return future.result()
+                future.result().release()
+                raise
+            if not future.done():
+                self._remove(priority, waiter)
+                future.cancel()
+            if isinstance(e, asyncio.TimeoutError):
+                scheduler_rejections.inc(priority=priority.name.lower(), reason="expired")
+                raise Expired("expired") from None
+            raise
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority, key: Hashable, timeout: Optional[float] = None, supersede: bool = False):
+        ticket = await self.acquire(priority, key, timeout, supersede)
+        try:
+            yield ticket
+        finally:
+            ticket.release()
+
+    def _has_capacity(self, priority: Priority) -> bool:
+        return self._running < self.slots and self._class_running[priority] < self.class_slots[priority]
+
+    def _grant(self, priority: Priority) -> Ticket:
+        self._running += 1
+        self._class_running[priority] += 1
+        return Ticket(self, priority)
+
+    def _release(self, priority: Priority, held: float) -> None:
+        self._running -= 1
+        self._class_running[priority] -= 1
+        self._service_time[priority] = 0.8 * self._service_time[priority] + 0.2 * held
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        now = time.monotonic()
+        for priority in Priority:
+            queue = self._queues[priority]
+            while queue and self._has_capacity(priority):
+                key, waiters = queue.popitem(last=False)
+                waiter = waiters.popleft()
+                if waiters:
+                    queue[key] = waiters
+                self._count(priority, -1)
+                if waiter.future.done():
+                    continue
+                if waiter.deadline is not None and now >= waiter.deadline:
+                    scheduler_rejections.inc(priority=priority.name.lower(), reason="expired")
+                    waiter.future.set_exception(Expired("expired"))
+                    continue
+                scheduler_wait.observe(now - waiter.enqueued, priority=priority.name.lower())
+                waiter.future.set_result(self._grant(priority))
+
+    def _remove(self, priority: Priority, waiter: _Waiter) -> None:
+        waiters = self._queues[priority].get(waiter.key)
+        if waiters is None or waiter not in waiters:
+            return
+        waiters.remove(waiter)
+        if not waiters:
+            del self._queues[priority][waiter.key]
+        self._count(priority, -1)
+
+    def _drop_key(self, priority: Priority, key: Hashable) -> None:
+        waiters = self._queues[priority].pop(key, None)
+        if not waiters:
+            return
+        self._count(priority, -len(waiters))
+        for waiter in waiters:
+            if not waiter.future.done():
+                scheduler_rejections.inc(priority=priority.name.lower(), reason="superseded")
+                waiter.future.set_exception(Expired("superseded"))
+
+    def _count(self, priority: Priority, delta: int) -> None:
+        self._queued[priority] += delta
+        scheduler_queue_depth.set(self._queued[priority], priority=priority.name.lower())
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+SLOTS = _env_int("SCHED_SLOTS", _env_int("GEMINI_MAX_CONCURRENCY", 32))
+scheduler = Scheduler(
+    SLOTS,
+    {
+        Priority.STANDARD: _env_int("SCHED_STANDARD_SLOTS", max(1, SLOTS * 3 // 4)),
+        Priority.BATCH: _env_int("SCHED_BATCH_SLOTS", max(1, SLOTS // 4)),
+    },
+    max_queue=_env_int("SCHED_MAX_QUEUE", 64),
+)
+# A live frame still queued after this long is dropped: the next frame is already on its way
+LIVE_FRAME_DEADLINE_S = _env_int("LIVE_FRAME_DEADLINE_MS", 3000) / 1000
@@ -0,0 +1,247 @@
+import io
+import os
+import shutil
+import subprocess
+import wave
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+FRAME_S = 0.02          # energy is measured per 20 ms frame
+WINDOW_S = 5.0          # audio is decoded and scored this many seconds at a time
+MIN_PAUSE_S = 0.25      # shorter gaps are part of normal articulation
+LONG_PAUSE_S = 2.0
+MIN_SPEECH_DBFS = -50.0
+SYLLABLES_PER_WORD = 1.4
+
+FFMPEG = os.getenv("FFMPEG_BINARY") or shutil.which("ffmpeg")
+
+
+def clarity_score(snr_db: float, wpm: float, pause_ratio: float, long_pauses_per_min: float) -> float:
+    """0-100 heuristic: audible over the background, a conversational pace, few long pauses."""
+    loudness = float(np.clip((snr_db - 6) / 24, 0, 1))
+    if wpm < 110:
+        pace = max(0.0, (wpm - 60) / 50)
+    elif wpm > 170:
+        pace = max(0.0, (240 - wpm) / 70)
+    else:
+        pace = 1.0
+    fluency = float(np.clip(1 - max(0.0, pause_ratio - 0.3) / 0.4, 0, 1) * np.clip(1 - long_pauses_per_min / 6, 0, 1))
+    return round(100 * (0.5 * loudness + 0.3 * pace + 0.2 * fluency), 1)
+
+
+class _Totals:
+    __slots__ = ("frames", "speech_frames", "speech_db", "gap_frames", "syllables", "pauses", "long_pauses", "pause_s", "max_pause_s")
+
+    def __init__(self):
+        self.frames = self.speech_frames = self.gap_frames = self.syllables = self.pauses = self.long_pauses = 0
+        self.speech_db = self.pause_s = self.max_pause_s = 0.0
+
+    def add_pause(self, seconds: float) -> None:
+        self.pauses += 1
+        self.pause_s += seconds
+        self.max_pause_s = max(self.max_pause_s, seconds)
+        if seconds >= LONG_PAUSE_S:
+            self.long_pauses += 1
+
+    def score(self, noise_db: float) -> float:
+        if self.speech_frames * FRAME_S < 1.0:
+            return 0.0
+        span_min = (self.speech_frames + self.gap_frames) * FRAME_S / 60
+        wpm = self.syllables / SYLLABLES_PER_WORD / span_min
+        snr = self.speech_db / self.speech_frames - noise_db
+        return clarity_score(snr, wpm, self.gap_frames / (self.speech_frames + self.gap_frames), self.long_pauses / span_min)
+
+
+class SpeechMetrics:
+    """Incremental speech statistics over mono 16-bit PCM.
+
+    ``feed`` takes audio in pieces of any size; between calls at most one
+    window of frame energies and running totals are kept, so memory stays flat
+    however long the recording is. Frame energy, voice activity (an adaptive
+    noise floor) and syllable nuclei (energy peaks, for speaking rate) are
+    computed with NumPy a window at a time; ``trend`` gets one clarity point
+    per ``window_s``.
+    """
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE, window_s: float = WINDOW_S):
+        self.sample_rate = sample_rate
+        self.frame_len = int(sample_rate * FRAME_S)
+        self.window_frames = int(round(window_s / FRAME_S))
+        self.trend: List[Dict[str, float]] = []
+        self._rest = np.zeros(0, dtype=np.float32)
+        self._pending = np.zeros(0, dtype=np.float64)  # frame energies not yet analyzed, under one window
+        self._noise_db: Optional[float] = None
+        self._total = _Totals()
+        self._window = _Totals()
+        # The speech or silence run still open at the end of the last block
+        self._run_speech = False
+        self._run_frames = 0
+        self._heard_speech = False  # silence before the first word is not a pause
+
+    def feed(self, samples: np.ndarray) -> None:
+        x = samples.astype(np.float32) / 32768.0 if samples.dtype == np.int16 else samples.astype(np.float32)
+        if len(self._rest):
+            x = np.concatenate([self._rest, x])
+        n = len(x) // self.frame_len
+        self._rest = x[n * self.frame_len:].copy()
+        if n == 0:
+            return
+        frames = x[:n * self.frame_len].reshape(n, self.frame_len)
+        db = np.concatenate([self._pending, 10 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)])
+        # Whole windows only, so results do not depend on how the audio was split
+        full = len(db) // self.window_frames * self.window_frames
+        for start in range(0, full, self.window_frames):
+            self._analyze(db[start:start + self.window_frames])
+            self._close_window()
+        self._pending = db[full:]
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals so far; the partial last window is scored too (call once, at the end)."""
+        if len(self._pending):
+            self._analyze(self._pending)
+            self._pending = self._pending[:0]
+            if self._window.frames * FRAME_S >= 1.0:
+                self._close_window()
+        total = self._total
+        duration = total.frames * FRAME_S
+        speaking = total.speech_frames * FRAME_S
+        span_min = (total.speech_frames + total.gap_frames) * FRAME_S / 60
+        noise = self._noise_db if self._noise_db is not None else MIN_SPEECH_DBFS
+        return {
+            "duration": round(duration, 2),
+            "speaking_time": round(speaking, 2),
+            "silence_time": round(duration - speaking, 2),
+            "speaking_rate_wpm": round(total.syllables / SYLLABLES_PER_WORD / span_min, 1) if span_min else 0.0,
+            "pauses": total.pauses,
+            "long_pauses": total.long_pauses,
+            "mean_pause": round(total.pause_s / total.pauses, 2) if total.pauses else 0.0,
+            "max_pause": round(total.max_pause_s, 2),
+            "snr_db": round(total.speech_db / total.speech_frames - noise, 1) if total.speech_frames else 0.0,
+            "speech_clarity": total.score(noise),
+        }
+
+    def _analyze(self, db: np.ndarray) -> None:
+        # The floor drops to any quieter stretch at once and creeps up slowly
+        low = float(np.percentile(db, 10))
+        self._noise_db = low if self._noise_db is None else min(low, self._noise_db + 0.5)
+        threshold = max(self._noise_db + 10, MIN_SPEECH_DBFS)
+        speech = db > threshold
+
+        # Syllable nuclei: peaks of the 100 ms-smoothed envelope inside speech, at least 100 ms apart
+        peaks = np.zeros(0, dtype=np.int64)
+        if len(db) >= 5:
+            smooth = np.convolve(db, np.ones(5) / 5, mode="same")
+            peaks = np.flatnonzero(
+                (smooth[1:-1] > smooth[:-2]) & (smooth[1:-1] >= smooth[2:]) & speech[1:-1] & (smooth[1:-1] > threshold + 3)
+            ) + 1
+        if len(peaks):
+            peaks = peaks[np.concatenate(([True], np.diff(peaks) >= 5))]
+
+        for totals in (self._total, self._window):
+            totals.frames += len(db)
+            totals.speech_frames += int(speech.sum())
+            totals.speech_db += float(db[speech].sum())
+            totals.syllables += len(peaks)
+
+        # Walk the speech/silence runs (not the frames) to find pauses
+        bounds = np.concatenate(([0], np.flatnonzero(np.diff(speech.astype(np.int8))) + 1, [len(speech)]))
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            is_speech = bool(speech[a])
+            if is_speech == self._run_speech:
+                self._run_frames += int(b - a)
+                continue
+            if is_speech and self._heard_speech:
+                # A gap that ended in speech: a pause between words
+                for totals in (self._total, self._window):
+                    totals.gap_frames += self._run_frames
+                    if self._run_frames * FRAME_S >= MIN_PAUSE_S:
+                        totals.add_pause(self._run_frames * FRAME_S)
+            self._heard_speech = self._heard_speech or is_speech
+            self._run_speech = is_speech
+            self._run_frames = int(b - a)
+
+    def _close_window(self) -> None:
+        self.trend.append({"t": round(self._total.frames * FRAME_S, 1), "score": self._window.score(self._noise_db)})
+        self._window = _Totals()
+
+
+def _wav_windows(f, window_s: float) -> Tuple[int, Iterator[np.ndarray]]:
+    reader = wave.open(f, "rb")
+    if reader.getsampwidth() != 2:
+        reader.close()
+        raise ValueError("only 16-bit WAV is supported")
+    channels, rate = reader.getnchannels(), reader.getframerate()
+
+    def windows():
+        with reader:
+            while True:
+                data = reader.readframes(int(rate * window_s))
+                if not data:
+                    return
+                samples = np.frombuffer(data, dtype="<i2")
+                yield samples if channels == 1 else samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+
+    return rate, windows()
+
+
+def _ffmpeg_windows(path: str, window_s: float) -> Iterator[np.ndarray]:
+    """Decode the audio track to 16 kHz mono PCM as it streams out of ffmpeg."""
+    proc = subprocess.Popen(
+        [FFMPEG, "-v", "error", "-i", path, "-vn", "-ac", "1", "-ar", str(SAMPLE_RATE), "-f", "s16le", "-"],
+        stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+    )
+    window_bytes = int(SAMPLE_RATE * window_s) * 2
+    try:
+        while True:
+            data = proc.stdout.read(window_bytes)
+            if not data:
+                return
+            yield np.frombuffer(data[:len(data) // 2 * 2], dtype="<i2")
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def _run(rate: int, windows: Iterator[np.ndarray], window_s: float) -> Optional[Dict[str, Any]]:
+    metrics = SpeechMetrics(rate, window_s)
+    for samples in windows:
+        metrics.feed(samples)
+    summary = metrics.summary()
+    if not summary["duration"]:
+        return None  # no audio track
+    summary["trend"] = metrics.trend
+    return summary
+
+
+def analyze_file(path: str, window_s: float = WINDOW_S) -> Optional[Dict[str, Any]]:
+    """Speech metrics for a recording's audio track, or None when it has none or
+    it cannot be decoded (non-WAV input needs ffmpeg on the PATH)."""
+    try:
+        with open(path, "rb") as f:
+            is_wav = f.read(4) == b"RIFF"
+        if is_wav:
+            return _run(*_wav_windows(path, window_s), window_s)
+        if FFMPEG:
+            return _run(SAMPLE_RATE, _ffmpeg_windows(path, window_s), window_s)
+    except Exception as e:
+        print(f"Error analyzing audio: {e}")
+    return None
+
+
+def analyze_bytes(data: bytes, window_s: float = WINDOW_S) -> Optional[Dict[str, Any]]:
+    """Speech metrics for an in-memory clip, e.g. a live session's audio chunk (WAV or anything ffmpeg reads)."""
+    try:
+        if data[:4] == b"RIFF":
+            return _run(*_wav_windows(io.BytesIO(data), window_s), window_s)
+        if FFMPEG:
+            proc = subprocess.run(
+                [FFMPEG, "-v", "error", "-i", "pipe:0", "-vn", "-ac", "1", "-ar", str(SAMPLE_RATE), "-f", "s16le", "-"],
+                input=data, capture_output=True, timeout=10,
+            )
+            pcm = proc.stdout[:len(proc.stdout) // 2 * 2]
+            return _run(SAMPLE_RATE, iter([np.frombuffer(pcm, dtype="<i2")]), window_s)
+    except Exception as e:
+        print(f"Error analyzing audio: {e}")
+    return None
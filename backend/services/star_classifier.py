@@ -0,0 +1,137 @@
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# Phrase models for the four STAR components, matched case-insensitively.
+# Each is one compiled alternation, so a segment is scanned once per
+# component still missing rather than word by word.
+_CUES: Dict[str, "re.Pattern[str]"] = {
+    "situation": re.compile(
+        r"\b(?:"
+        r"(?:at|in) my (?:previous|last|former|current|first) (?:job|company|role|position|internship|team|employer)"
+        r"|when i (?:was|worked)\b"
+        r"|while (?:i was|working|interning)\b"
+        r"|(?:last|this|one|previous) (?:year|summer|semester|quarter|month|spring|fall|winter)\b"
+        r"|back in (?:19|20)\d\d"
+        r"|(?:a few|several|two|three) (?:weeks|months|years) ago"
+        r"|one time\b"
+        r"|during (?:my|the|a|an|our)\b"
+        r"|there was (?:a|an|this)\b"
+        r"|we were (?:facing|dealing|working|struggling|running|seeing|losing|behind)"
+        r"|(?:our|the) (?:team|company|client|customer|product|service|project|system|app|codebase) "
+        r"(?:was|had|were|kept|needed|faced)\b"
+        r"|the (?:situation|context|background|problem|issue) was"
+        r")",
+        re.IGNORECASE,
+    ),
+    "task": re.compile(
+        r"\b(?:"
+        r"my (?:role|job|task|goal|responsibility|assignment|objective|mandate) (?:was|is|involved)"
+        r"|i was (?:responsible|tasked|asked|assigned|in charge|charged|expected|supposed)"
+        r"|(?:tasked|charged) with"
+        r"|i (?:needed|had|wanted|was asked) to"
+        r"|we (?:needed|had|wanted) to"
+        r"|(?:the|our) (?:goal|objective|task|challenge|mission|deadline|requirement|aim) was"
+        r"|it was (?:up to me|my job|my responsibility)"
+        r"|i (?:owned|took ownership of)"
+        r")",
+        re.IGNORECASE,
+    ),
+    "action": re.compile(
+        r"\b(?:"
+        r"(?:i|we) (?:then |first |quickly |personally )?"
+        r"(?:decided|built|created|designed|implemented|developed|wrote|led|organized|analyzed|analysed|proposed|"
+        r"introduced|set up|reached out|met with|talked to|spoke with|scheduled|coordinated|refactored|automated|"
+        r"investigated|researched|reorganized|prioritized|delegated|negotiated|presented|trained|mentored|fixed|"
+        r"debugged|tested|migrated|rewrote|started|initiated|collaborated|worked with|convinced|drafted|planned|"
+        r"broke|split|added|removed|replaced|profiled|measured|tracked|identified|gathered|interviewed|volunteered|"
+        r"optimized|optimised|cached|switched|changed|moved|cut|reduced|improved|"
+        r"stepped in|took the lead|took the initiative|made sure|focused on|came up with|put together)"
+        r"|(?:so|then|first|next|after that|afterwards),? i\b"
+        r"|my approach was"
+        r"|step by step"
+        r")",
+        re.IGNORECASE,
+    ),
+    "result": re.compile(
+        r"\b(?:"
+        r"as a result|in the end|ultimately|eventually|the (?:outcome|result|impact) was"
+        r"|(?:which|this|that|it) (?:resulted|led to|helped|allowed|enabled|meant|saved|reduced|increased|improved|cut)"
+        r"|(?:reduced|increased|improved|cut|saved|boosted|grew|raised|lowered|decreased|dropped|doubled|tripled|halved)"
+        r"\b[^.!?]{0,40}?\d"
+        r"|\d+(?:\.\d+)?\s?(?:%|percent\b|x\b|times\b)"
+        r"|(?:we|i) (?:delivered|shipped|launched|won|achieved|exceeded|met|finished|completed|hit|closed)\b"
+        r"|(?:received|got|earned) (?:positive |great |good )?(?:feedback|recognition|an award|a promotion|promoted)"
+        r"|i learned|the lesson|successfully|on time\b|ahead of schedule"
+        r")",
+        re.IGNORECASE,
+    ),
+}
+
+COMPONENTS = ("situation", "task", "action", "result")
+# Characters of the previous segment kept so a phrase split across segments still matches
+_CARRY = 48
+
+
+def _star(found) -> Dict[str, object]:
+    star = {c: c in found for c in COMPONENTS}
+    star["completeness"] = len(found) / len(COMPONENTS)
+    return star
+
+
+def score_star(text: str) -> Dict[str, object]:
+    """STAR flags and completeness (0-1) for one answer's transcript."""
+    return _star({c for c in COMPONENTS if text and _CUES[c].search(text)})
+
+
+class StarTracker:
+    """STAR coverage of an answer that arrives as transcript segments.
+
+    Each ``feed`` only searches the new segment (plus a short tail of the
+    previous one) for components not found yet, so the cost per segment
+    does not grow with the session and falls as the answer fills in.
+    """
+
+    __slots__ = ("found", "_tail")
+
+    def __init__(self):
+        self.found = set()
+        self._tail = ""
+
+    def feed(self, segment: Optional[str]) -> Dict[str, object]:
+        if segment and len(self.found) < len(COMPONENTS):
+            text = f"{self._tail} {segment}" if self._tail else segment
+            for component in COMPONENTS:
+                if component not in self.found and _CUES[component].search(text):
+                    self.found.add(component)
+            self._tail = segment[-_CARRY:]
+        return _star(self.found)
+
+
+class StarSessions:
+    """Bounded LRU of StarTracker per live session id."""
+
+    def __init__(self, max_sessions: int = 1024):
+        self.max_sessions = max_sessions
+        self._trackers: "OrderedDict[str, StarTracker]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def feed(self, session_id: str, segment: Optional[str]) -> Dict[str, object]:
+        with self._lock:
+            tracker = self._trackers.get(session_id)
+            if tracker is None:
+                tracker = self._trackers[session_id] = StarTracker()
+                while len(self._trackers) > self.max_sessions:
+                    self._trackers.popitem(last=False)
+            else:
+                self._trackers.move_to_end(session_id)
+            return tracker.feed(segment)
+
+    def discard(self, session_id: str) -> None:
+        with self._lock:
+            self._trackers.pop(session_id, None)
+
+
+# STAR coverage of each live session's transcript so far, fed by /behavioral/chunk and dropped by /behavioral/finish
+star_sessions = StarSessions()
@@ -0,0 +1,280 @@
+import json
+from typing import Any, Callable, List, Optional, get_args, get_origin
+from pydantic import TypeAdapter, ValidationError
+from services.upstream import GEMINI_REQUEST_OPTIONS, gemini
+
+# Gemini JSON mode: the model emits bare JSON, no fences or prose
+JSON_MODE = {"response_mime_type": "application/json"}
+
+_LITERALS = {"True": "true", "False": "false", "None": "null", "true": "true", "false": "false", "null": "null"}
+
+
+class StructuredOutputError(ValueError):
+    """Model output that could not be parsed or validated; ``text`` keeps the raw response."""
+
+    def __init__(self, message: str, text: str = ""):
+        super().__init__(message)
+        self.text = text
+
+
+def repair_json(text: str) -> str:
+    """Best-effort fix of the defects LLMs commonly produce.
+
+    Handles code fences and surrounding prose, single-quoted strings, Python
+    literals, raw newlines in strings, trailing commas, and output truncated
+    mid-value (open strings and brackets are closed, a dangling key dropped).
+    """
+    start = min((i for i in (text.find("{"), text.find("[")) if i >= 0), default=-1)
+    if start < 0:
+        return text.strip()
+    out: List[str] = []
+    stack: List[str] = []
+    quote = None
+    escape = False
+    i = start
+    while i < len(text):
+        ch = text[i]
+        if quote:
+            if escape:
+                escape = False
+                if ch == "'":
+                    out[-1] = "'"  # \' is not a JSON escape
+                else:
+                    out.append(ch)
+            elif ch == "\\":
+                escape = True
+                out.append(ch)
+            elif ch == quote:
+                quote = None
+                out.append('"')
+            elif ch == '"':
+                out.append('\\"')  # inside a single-quoted string
+            elif ch == "\n":
+                out.append("\\n")
+            else:
+                out.append(ch)
+        elif ch in "\"'":
+            quote = ch
+            out.append('"')
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+            out.append(ch)
+        elif ch in "}]":
+            _strip_trailing_comma(out)
+            if stack:
+                out.append(stack.pop())
+            if not stack:
+                break  # ignore anything after the top-level value
+        elif ch.isalpha() and out and out[-1][-1:].isdigit():
+            out.append(ch)  # exponent, e.g. 1e5
+        elif ch.isalpha():
+            j = i
+            while j < len(text) and (text[j].isalnum() or text[j] == "_"):
+                j += 1
+            word = text[i:j]
+            out.append(_LITERALS.get(word, json.dumps(word)))
+            i = j
+            continue
+        else:
+            out.append(ch)
+        i += 1
+
+    if quote:
+        out.append('"')
+    if stack:
+        _drop_dangling(out, stack[-1])
+        for closer in reversed(stack):
+            _strip_trailing_comma(out)
+            out.append(closer)
+    return "".join(out)
+
+
+def _strip_trailing_comma(out: List[str]) -> None:
+    while out and out[-1].isspace():
+        out.pop()
+    if out and out[-1] == ",":
+        out.pop()
+
+
+def _drop_dangling(out: List[str], closer: str) -> None:
+    """Remove a truncated ``"key":`` (or bare ``"key"`` in an object) at the end of the output."""
+    text = "".join(out).rstrip().rstrip(",").rstrip()
+    if text.endswith(":"):
+        cut = max(text.rfind(",", 0, len(text) - 1), text.rfind("{", 0, len(text) - 1))
+        text = text[: cut + 1] if text[cut] == "{" else text[:cut]
+    elif closer == "}" and text.endswith('"'):
+        opening = len(text) - 2
+        while opening >= 0 and not (text[opening] == '"' and text[opening - 1] != "\\"):
+            opening -= 1
+        before = text[:opening].rstrip()
+        if before.endswith((",", "{")):
+            text = before.rstrip(",")
+    out[:] = [text]
+
+
+def parse_json(text: str) -> Any:
+    """json.loads, falling back to repair_json; raises StructuredOutputError."""
+    if text is None:
+        raise StructuredOutputError("Empty model response")
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    try:
+        return json.loads(repair_json(text))
+    except ValueError as e:
+        raise StructuredOutputError(f"Unparseable model output: {e}", text)
+
+
+def validate(data: Any, schema) -> Any:
+    """Validate against a pydantic model or ``List[model]`` and return plain data.
+
+    For lists, invalid items are dropped; it only fails when none are valid.
+    """
+    if get_origin(schema) in (list, List):
+        item = TypeAdapter(get_args(schema)[0])
+        if isinstance(data, dict):
+            # {"questions": [...]} style wrappers
+            data = next((v for v in data.values() if isinstance(v, list)), [data])
+        if not isinstance(data, list):
+            raise StructuredOutputError(f"Expected a JSON array, got {type(data).__name__}")
+        valid = []
+        for element in data:
+            try:
+                valid.append(item.dump_python(item.validate_python(element)))
+            except ValidationError:
+                continue
+        if data and not valid:
+            raise StructuredOutputError("No array element matched the schema")
+        return valid
+    adapter = TypeAdapter(schema)
+    try:
+        return adapter.dump_python(adapter.validate_python(data))
+    except ValidationError as e:
+        raise StructuredOutputError(f"Model output failed validation: {e}")
+
+
+def parse_structured(text: str, schema) -> Any:
+    try:
+        return validate(parse_json(text), schema)
+    except StructuredOutputError as e:
+        e.text = e.text or text
+        raise
+
+
+class IncrementalJSONParser:
+    """Parses a JSON array as text streams in, returning each element once it is complete.
+
+    Leading prose or fences before the array are skipped. ``close()`` returns
+    the whole value (repaired if the stream was cut short).
+    """
+
+    def __init__(self):
+        self.text = ""
+        self._pos = 0
+        self._depth = 0
+        self._started = False
+        self._in_string = False
+        self._escape = False
+        self._element_start: Optional[int] = None
+        self.is_array = False
+
+    def feed(self, chunk: str) -> List[Any]:
+        self.text += chunk or ""
+        done = []
+        text = self.text
+        while self._pos < len(text):
+            ch = text[self._pos]
+            if not self._started:
+                if ch in "[{":
+                    self._started = True
+                    self.is_array = ch == "["
+                    self._depth = 1
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif self._depth == 0:
+                break
+            else:
+                top_level = self.is_array and self._depth == 1
+                if top_level and self._element_start is None and not ch.isspace() and ch not in ",]":
+                    self._element_start = self._pos
+                if ch == '"':
+                    self._in_string = True
+                elif ch in "[{":
+                    self._depth += 1
+                elif ch in "]}":
+                    if top_level and self._element_start is not None:
+                        self._emit(self._pos, done)  # last scalar element
+                    self._depth -= 1
+                    if self.is_array and self._depth == 1 and self._element_start is not None:
+                        self._emit(self._pos + 1, done)
+                elif ch == "," and top_level and self._element_start is not None:
+                    self._emit(self._pos, done)
+            self._pos += 1
+        return done
+
+    def _emit(self, end: int, done: List[Any]) -> None:
+        raw = self.text[self._element_start:end]
+        self._element_start = None
+        try:
+            done.append(parse_json(raw))
+        except StructuredOutputError:
+            pass
+
+    def close(self) -> Any:
+        return parse_json(self.text)
+
+
+def generate_structured(
+    model,
+    contents,
+    schema,
+    stream: bool = False,
+    on_item: Optional[Callable[[Any], None]] = None,
+    hedge: bool = False,
+) -> Any:
+    """Call Gemini in JSON mode and return output validated against ``schema``.
+
+    The call goes through the shared ``gemini`` upstream policy (retries, rate
+    limit, circuit breaker; ``hedge=True`` for short idempotent prompts). With
+    ``stream=True`` and a ``List[model]`` schema, ``on_item`` receives each
+    validated element as soon as it has streamed in; streams are not retried.
+    Raises StructuredOutputError for unusable output; transport errors and
+    UpstreamError propagate.
+    """
+    if not stream:
+        resp = gemini.call(model.generate_content, contents, generation_config=JSON_MODE,
+                           request_options=GEMINI_REQUEST_OPTIONS, hedge=hedge)
+        return parse_structured(_response_text(resp), schema)
+    item_schema = get_args(schema)[0] if get_origin(schema) in (list, List) else None
+    parser = IncrementalJSONParser()
+
+    def consume():
+        for chunk in model.generate_content(contents, generation_config=JSON_MODE, stream=True, request_options=GEMINI_REQUEST_OPTIONS):
+            for element in parser.feed(_response_text(chunk)):
+                if on_item and item_schema is not None:
+                    try:
+                        on_item(validate([element], schema)[0])
+                    except StructuredOutputError:
+                        pass
+
+    gemini.call(consume, retry=False)
+    return parse_structured(parser.text, schema)
+
+
+async def agenerate_structured(model, contents, schema, hedge: bool = False) -> Any:
+    """generate_structured on a Gemini worker thread, for use from async code."""
+    return await gemini.offload(generate_structured, model, contents, schema, hedge=hedge)
+
+
+def _response_text(resp) -> str:
+    try:
+        return resp.text
+    except ValueError as e:
+        # Blocked or empty candidates raise on .text
+        raise StructuredOutputError(f"No text in model response: {e}")
@@ -0,0 +1,83 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class ClaimsCache:
+    """Bounded LRU of decoded JWT claims keyed by token digest.
+
+    Entries expire with the token's own ``exp`` so a cached token is never
+    accepted after it would have failed a full decode.
+    """
+
+    def __init__(self, max_size: int = 4096):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        k = self.key(token)
+        with self._lock:
+            entry = self._entries.get(k)
+            if entry is None:
+                return None
+            claims, exp = entry
+            if exp <= time.time():
+                del self._entries[k]
+                return None
+            self._entries.move_to_end(k)
+            return claims
+
+    def put(self, token: str, claims: Dict[str, Any]) -> None:
+        exp = claims.get("exp")
+        if exp is None:
+            return
+        k = self.key(token)
+        with self._lock:
+            self._entries[k] = (claims, float(exp))
+            self._entries.move_to_end(k)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class TokenVersionCache:
+    """Short-lived cache of each user's token_version for revocation checks.
+
+    Revocations made in this process take effect immediately; revocations from
+    other workers are picked up within ``ttl`` seconds.
+    """
+
+    def __init__(self, ttl: float = 30.0):
+        self.ttl = ttl
+        self._versions: Dict[int, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, user_id: int, loader: Callable[[int], Optional[int]]) -> Optional[int]:
+        now = time.time()
+        with self._lock:
+            entry = self._versions.get(user_id)
+            if entry is not None and entry[1] > now:
+                return entry[0]
+        version = loader(user_id)
+        if version is not None:
+            self.set(user_id, version)
+        return version
+
+    def set(self, user_id: int, version: int) -> None:
+        with self._lock:
+            self._versions[user_id] = (version, time.time() + self.ttl)
+
+
+# Shared by every AuthService in the process
+claims_cache = ClaimsCache()
+token_versions = TokenVersionCache()
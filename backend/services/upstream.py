@@ -0,0 +1,316 @@
+import asyncio
+import functools
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import Any, Callable, Optional
+import os
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+from services.metrics import in_flight, upstream_circuit_state, upstream_hedges, upstream_rejections, upstream_retries
+
+load_dotenv()
+
+# Overridable so benchmarks can point the services at a local stub (benchmarks/stub_upstream.py)
+GEMINI_API_ENDPOINT = os.getenv("GEMINI_API_ENDPOINT", "")
+ELEVENLABS_API_BASE = os.getenv("ELEVENLABS_API_BASE", "https://api.elevenlabs.io").rstrip("/")
+
+
+def configure_gemini(api_key: str) -> None:
+    import google.generativeai as genai
+
+    if GEMINI_API_ENDPOINT:
+        # gRPC needs TLS; the REST transport accepts a plain http:// endpoint
+        genai.configure(api_key=api_key, transport="rest", client_options={"api_endpoint": GEMINI_API_ENDPOINT})
+    else:
+        genai.configure(api_key=api_key)
+
+
+@lru_cache(maxsize=None)
+def gemini_model(name: str):
+    """One GenerativeModel per model name, shared by every request (call configure_gemini first)."""
+    import google.generativeai as genai
+
+    return genai.GenerativeModel(name)
+
+
+class UpstreamError(RuntimeError):
+    """Raised without calling the upstream: circuit open, rate limit or concurrency cap exceeded.
+
+    Callers treat it like any other upstream failure and serve their fallback.
+    """
+
+
+class RetryableStatus(Exception):
+    """HTTP response worth retrying (429/5xx) from a plain requests call."""
+
+    def __init__(self, response: requests.Response):
+        super().__init__(f"HTTP {response.status_code}")
+        self.response = response
+
+
+def raise_for_retryable(response: requests.Response) -> requests.Response:
+    if response.status_code == 429 or response.status_code >= 500:
+        raise RetryableStatus(response)
+    return response
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, (RetryableStatus, requests.ConnectionError, requests.Timeout, ConnectionError, TimeoutError)):
+        return True
+    try:
+        from google.api_core import exceptions as google_exceptions
+    except ImportError:
+        return False
+    return isinstance(exc, (
+        google_exceptions.TooManyRequests,
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.InternalServerError,
+        google_exceptions.GatewayTimeout,
+        google_exceptions.DeadlineExceeded,
+    ))
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens per second, up to ``burst`` saved."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self) -> float:
+        """Take a token and return 0, or return the seconds until one is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, timeout: float) -> bool:
+        if self.rate <= 0:
+            return True
+        deadline = time.monotonic() + timeout
+        while True:
+            wait_s = self._take()
+            if wait_s == 0:
+                return True
+            if time.monotonic() + wait_s > deadline:
+                return False
+            time.sleep(wait_s)
+
+    def try_acquire(self) -> bool:
+        return self.rate <= 0 or self._take() == 0
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures and rejects calls for
+    ``reset_timeout`` seconds; then lets one trial call through (half-open).
+    """
+
+    CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self._set(self.HALF_OPEN)
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def release(self) -> None:
+        """The allowed call never reached the upstream; let another trial through."""
+        with self._lock:
+            self._trial_running = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._trial_running = False
+            self._set(self.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._set(self.OPEN)
+
+    def _set(self, state: str) -> None:
+        self.state = state
+        upstream_circuit_state.set({self.CLOSED: 0, self.HALF_OPEN: 1, self.OPEN: 2}[state], upstream=self.name)
+
+
+# Hedged attempts run here so the calling thread can wait on whichever finishes first
+_hedge_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="upstream-hedge")
+
+
+class Upstream:
+    """Call policy for one upstream API: rate limit, concurrency cap, retries with
+    jittered exponential backoff, optional hedging and a circuit breaker.
+
+    ``call`` blocks; async code uses ``acall``, which runs it on this upstream's
+    own worker threads (sized to the concurrency cap, unlike asyncio's default
+    executor, which on a small machine has only a handful).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float = 0.0,
+        burst: int = 10,
+        max_concurrency: int = 32,
+        retries: int = 2,
+        backoff_base: float = 0.25,
+        backoff_max: float = 4.0,
+        hedge_after: float = 0.0,
+        acquire_timeout: float = 5.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.hedge_after = hedge_after
+        self.acquire_timeout = acquire_timeout
+        self.breaker = CircuitBreaker(name, failure_threshold, reset_timeout)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._session: Optional[requests.Session] = None
+        self._session_lock = threading.Lock()
+        self._pool_size = max_concurrency
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix=f"upstream-{name}")
+
+    def session(self) -> requests.Session:
+        """Shared keep-alive session sized to the concurrency cap."""
+        with self._session_lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self._pool_size)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
+
+    def call(self, fn: Callable[..., Any], *args, retry: bool = True, hedge: bool = False, **kwargs) -> Any:
+        """Run ``fn(*args, **kwargs)`` under this upstream's policy.
+
+        Only retryable failures (timeouts, connection errors, 429/5xx) are retried
+        and counted against the breaker. Pass ``retry=False`` for calls that are
+        not safe to repeat, e.g. streams that have already delivered output;
+        ``hedge=True`` only for idempotent calls.
+        """
+        attempts = 1 + (self.retries if retry else 0)
+        for attempt in range(attempts):
+            if not self.breaker.allow():
+                upstream_rejections.inc(upstream=self.name, reason="circuit_open")
+                raise UpstreamError(f"{self.name}: circuit open")
+            try:
+                if not self.bucket.acquire(self.acquire_timeout):
+                    upstream_rejections.inc(upstream=self.name, reason="rate_limited")
+                    raise UpstreamError(f"{self.name}: rate limit wait exceeded")
+                result = self._attempt(fn, args, kwargs, hedge)
+            except UpstreamError:
+                self.breaker.release()
+                raise
+            except Exception as e:
+                if not _is_retryable(e):
+                    self.breaker.record_success()  # the upstream answered; the request itself was bad
+                    raise
+                self.breaker.record_failure()
+                if attempt == attempts - 1:
+                    raise
+                upstream_retries.inc(upstream=self.name)
+                # Full jitter: spread retries from many callers over the whole window
+                time.sleep(random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt)))
+                continue
+            self.breaker.record_success()
+            return result
+
+    async def acall(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        return await self.offload(self.call, fn, *args, **kwargs)
+
+    def offload(self, fn: Callable[..., Any], *args, **kwargs) -> "asyncio.Future":
+        """Run blocking code that calls this upstream on its worker threads."""
+        return asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    def _attempt(self, fn, args, kwargs, hedge: bool):
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            upstream_rejections.inc(upstream=self.name, reason="saturated")
+            raise UpstreamError(f"{self.name}: too many concurrent calls")
+        try:
+            with in_flight(self.name):
+                if hedge and self.hedge_after > 0:
+                    return self._hedged(fn, args, kwargs)
+                return fn(*args, **kwargs)
+        finally:
+            self._slots.release()
+
+    def _hedged(self, fn, args, kwargs):
+        first = _hedge_pool.submit(fn, *args, **kwargs)
+        done, _ = wait([first], timeout=self.hedge_after)
+        # A hedge is an extra request, so it needs its own token; skip it when rate limited
+        if done or not self.bucket.try_acquire():
+            return first.result()
+        upstream_hedges.inc(upstream=self.name)
+        pending = {first, _hedge_pool.submit(fn, *args, **kwargs)}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    return future.result()  # the slower attempt finishes in the background
+                error = future.exception()
+        raise error
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)))
+
+
+gemini = Upstream(
+    "gemini",
+    rate=_env_float("GEMINI_RPS", 0.0),
+    burst=int(_env_float("GEMINI_BURST", 10)),
+    max_concurrency=int(_env_float("GEMINI_MAX_CONCURRENCY", 32)),
+    retries=int(_env_float("UPSTREAM_RETRIES", 2)),
+    hedge_after=_env_float("GEMINI_HEDGE_AFTER_MS", 0) / 1000,
+    failure_threshold=int(_env_float("BREAKER_FAILURES", 5)),
+    reset_timeout=_env_float("BREAKER_RESET_S", 30),
+)
+elevenlabs = Upstream(
+    "elevenlabs",
+    rate=_env_float("ELEVENLABS_RPS", 0.0),
+    burst=int(_env_float("ELEVENLABS_BURST", 5)),
+    max_concurrency=int(_env_float("ELEVENLABS_MAX_CONCURRENCY", 8)),
+    retries=int(_env_float("UPSTREAM_RETRIES", 2)),
+    failure_threshold=int(_env_float("BREAKER_FAILURES", 5)),
+    reset_timeout=_env_float("BREAKER_RESET_S", 30),
+)
+
+# google-generativeai request_options: a per-attempt deadline, and no client-side
+# retry (its default retries 503s for minutes) since Upstream.call owns retrying
+GEMINI_REQUEST_OPTIONS = {"timeout": _env_float("GEMINI_TIMEOUT_S", 60), "retry": None}
@@ -1,5 +1,6 @@
+from sqlalchemy import update
 from sqlalchemy.orm import Session
-from database import User, InterviewSession, BehavioralAnalysis
+from database import User, InterviewSession, BehavioralAnalysis, dialect_insert
 from typing import Optional, Dict, Any
 from datetime import datetime
 
@@ -15,39 +16,70 @@ class UserService:
         """Get user by email"""
         return self.db.query(User).filter(User.email == email).first()
     
+    # Google profile fields synced on every login
+    PROFILE_FIELDS = ("name", "picture", "verified_email")
+    
     def create_user(self, user_data: Dict[str, Any]) -> User:
-        """Create a new user"""
-        user = User(
-            google_id=user_data["google_id"],
-            email=user_data["email"],
-            name=user_data["name"],
-            picture=user_data.get("picture"),
-            verified_email=user_data.get("verified_email", False)
-        )
-        self.db.add(user)
+        """Create a new user (upsert on Google ID so concurrent first logins don't collide)"""
+        now = datetime.utcnow()
+        values = {
+            "google_id": user_data["google_id"],
+            "email": user_data["email"],
+            "name": user_data["name"],
+            "picture": user_data.get("picture"),
+            "verified_email": user_data.get("verified_email", False),
+            "created_at": now,
+            "updated_at": now,
+            "is_active": True,
+            "token_version": 0,
+        }
+        stmt = dialect_insert(User).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[User.google_id],
+            set_={field: getattr(stmt.excluded, field) for field in self.PROFILE_FIELDS + ("updated_at",)},
+        ).returning(User)
+        user = self.db.scalars(stmt, execution_options={"populate_existing": True}).one()
         self.db.commit()
-        self.db.refresh(user)
         return user
     
+    def profile_changes(self, user: User, user_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Profile fields whose incoming value differs from the stored row"""
+        changes = {}
+        for field in self.PROFILE_FIELDS:
+            if field in user_data and user_data[field] != getattr(user, field):
+                changes[field] = user_data[field]
+        return changes
+    
     def update_user(self, user: User, user_data: Dict[str, Any]) -> User:
-        """Update user information"""
-        user.name = user_data.get("name", user.name)
-        user.picture = user_data.get("picture", user.picture)
-        user.verified_email = user_data.get("verified_email", user.verified_email)
-        user.updated_at = datetime.utcnow()
+        """Update user information, skipping the write when nothing changed"""
+        changes = self.profile_changes(user, user_data)
+        if not changes:
+            return user
+        stmt = (
+            update(User)
+            .where(User.id == user.id)
+            .values(**changes, updated_at=datetime.utcnow())
+            .returning(User)
+        )
+        user = self.db.scalars(stmt, execution_options={"populate_existing": True}).one()
         self.db.commit()
-        self.db.refresh(user)
         return user
     
+    def bump_token_version(self, user_id: int) -> int:
+        """Increment the user's token version, revoking previously issued tokens"""
+        user = self.db.query(User).filter(User.id == user_id).first()
+        if user is None:
+            raise ValueError(f"Unknown user: {user_id}")
+        user.token_version = (user.token_version or 0) + 1
+        self.db.commit()
+        return user.token_version
+    
     def get_or_create_user(self, user_data: Dict[str, Any]) -> User:
-        """Get existing user or create new one"""
+        """Get existing user or create new one; a returning user with an unchanged profile costs one SELECT"""
         user = self.get_user_by_google_id(user_data["google_id"])
-        if user:
-            # Update user data
-            return self.update_user(user, user_data)
-        else:
-            # Create new user
+        if user is None:
             return self.create_user(user_data)
+        return self.update_user(user, user_data)
     
     def create_interview_session(self, user_id: int, session_data: Dict[str, Any]) -> InterviewSession:
         """Create a new interview session"""
@@ -56,11 +88,10 @@ class UserService:
             company=session_data["company"],
             position=session_data["position"],
             interview_type=session_data["interview_type"],
-            questions=session_data.get("questions", "[]")
+            questions=session_data.get("questions", [])
         )
         self.db.add(session)
         self.db.commit()
-        self.db.refresh(session)
         return session
     
     def get_user_interview_sessions(self, user_id: int) -> list[InterviewSession]:
@@ -77,11 +108,12 @@ class UserService:
             posture_score=analysis_data["posture_score"],
             speech_clarity=analysis_data["speech_clarity"],
             overall_feedback=analysis_data["overall_feedback"],
-            improvements=analysis_data.get("improvements", "[]")
+            improvements=analysis_data.get("improvements", []),
+            trends=analysis_data.get("trends"),
+            segments=analysis_data.get("segments"),
         )
         self.db.add(analysis)
         self.db.commit()
-        self.db.refresh(analysis)
         return analysis
     
     def get_user_behavioral_analyses(self, user_id: int) -> list[BehavioralAnalysis]:
@@ -0,0 +1,193 @@
+import math
+import os
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from services.metrics import timed
+from services.speech_metrics import FFMPEG, analyze_file
+
+MAX_KEYFRAMES = int(os.getenv("VIDEO_KEYFRAMES", "16"))
+SAMPLE_FPS = 2.0         # frames scored per second of video
+TILE_WIDTH = 320         # keyframes are downscaled to this width in the montage
+MONTAGE_COLUMNS = 4
+AUDIO_BITRATE = "16k"    # speech-grade Opus
+
+
+class _Candidate:
+    __slots__ = ("t", "score", "tile")
+
+    def __init__(self, t: float, score: float, tile: np.ndarray):
+        self.t = t
+        self.score = score
+        self.tile = tile
+
+
+def _tile(frame: np.ndarray) -> np.ndarray:
+    h, w = frame.shape[:2]
+    if w <= TILE_WIDTH:
+        return frame.copy()
+    return cv2.resize(frame, (TILE_WIDTH, max(1, round(h * TILE_WIDTH / w))), interpolation=cv2.INTER_AREA)
+
+
+@timed()
+def select_keyframes(
+    video_path: str,
+    max_frames: int = MAX_KEYFRAMES,
+    face_cascade: Optional[cv2.CascadeClassifier] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> List[Tuple[float, np.ndarray]]:
+    """Up to ``max_frames`` (timestamp, downscaled frame) pairs spread over the video.
+
+    Frames are scored at ``SAMPLE_FPS`` by how much the picture changed since
+    the last sample (scene change). The timeline is split into buckets and the
+    highest-scoring frame of each is kept, preferring frames with a detected
+    face; only ``2 * max_frames`` downscaled candidates are held at a time, so
+    memory does not grow with the video's length. Black frames are skipped
+    unless the whole video is black, when the best of them is kept.
+    """
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise ValueError("Could not open video file")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 0
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = fps if 0 < fps < 1000 else 30.0
+    step = max(1, int(round(fps / SAMPLE_FPS)))
+    duration = total / fps if total > 0 else 0
+    # Unknown length (e.g. streamed WebM): start with 1 s buckets and widen them as needed
+    bucket_s = duration / (2 * max_frames) if duration else 1.0
+    buckets: Dict[int, _Candidate] = {}
+    dark: Optional[_Candidate] = None  # best black frame, used only if every frame is black
+    previous = None
+    index = 0
+    try:
+        while True:
+            if index % step:
+                if not cap.grab():
+                    break
+                index += 1
+                continue
+            ok, frame = cap.read()
+            if not ok:
+                break
+            t = index / fps
+            small = cv2.cvtColor(cv2.resize(frame, (96, 54), interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+            # Mean absolute change since the previous sample; the opening frame always qualifies
+            score = 255.0 if previous is None else float(cv2.absdiff(small, previous).mean())
+            previous = small
+            if small.mean() > 16:  # skip black frames
+                key = int(t // bucket_s)
+                best = buckets.get(key)
+                if best is None or score > best.score:
+                    buckets[key] = _Candidate(t, score, _tile(frame))
+                if len(buckets) > 2 * max_frames:
+                    bucket_s *= 2
+                    merged: Dict[int, _Candidate] = {}
+                    for candidate in buckets.values():
+                        k = int(candidate.t // bucket_s)
+                        if k not in merged or candidate.score > merged[k].score:
+                            merged[k] = candidate
+                    buckets = merged
+            elif not buckets and (dark is None or score > dark.score):
+                dark = _Candidate(t, score, _tile(frame))
+            if progress:
+                progress(index, total)
+            index += 1
+    finally:
+        cap.release()
+
+    candidates = [buckets[k] for k in sorted(buckets)] or ([dark] if dark else [])
+    if face_cascade is not None:
+        for candidate in candidates:
+            gray = cv2.cvtColor(candidate.tile, cv2.COLOR_BGR2GRAY)
+            if len(face_cascade.detectMultiScale(gray, 1.1, 4)):
+                candidate.score += 1000.0  # a visible candidate beats any scene change
+    # Pair up neighbouring buckets until at most max_frames remain, keeping the better of each pair
+    while len(candidates) > max_frames:
+        groups = np.array_split(np.arange(len(candidates)), max_frames)
+        candidates = [max((candidates[i] for i in group), key=lambda c: c.score) for group in groups if len(group)]
+    return [(c.t, c.tile) for c in candidates]
+
+
+def build_montage(keyframes: List[Tuple[float, np.ndarray]], quality: int = 70) -> bytes:
+    """One JPEG grid of the keyframes, each labelled with its m:ss timestamp."""
+    if not keyframes:
+        raise ValueError("No frames to build a montage from")
+    tile_h = max(tile.shape[0] for _, tile in keyframes)
+    columns = min(MONTAGE_COLUMNS, len(keyframes))
+    rows = math.ceil(len(keyframes) / columns)
+    canvas = np.zeros((rows * tile_h, columns * TILE_WIDTH, 3), dtype=np.uint8)
+    for i, (t, tile) in enumerate(keyframes):
+        y, x = (i // columns) * tile_h, (i % columns) * TILE_WIDTH
+        canvas[y:y + tile.shape[0], x:x + tile.shape[1]] = tile
+        label = f"{int(t // 60)}:{int(t % 60):02d}"
+        cv2.putText(canvas, label, (x + 6, y + 22), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 3, cv2.LINE_AA)
+        cv2.putText(canvas, label, (x + 6, y + 22), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1, cv2.LINE_AA)
+    ok, buf = cv2.imencode(".jpg", canvas, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError("Could not encode montage")
+    return buf.tobytes()
+
+
+def extract_audio(video_path: str) -> Optional[bytes]:
+    """The audio track as low-bitrate mono Opus (Ogg), or None without ffmpeg or an audio track."""
+    if not FFMPEG:
+        return None
+    try:
+        proc = subprocess.run(
+            [FFMPEG, "-v", "error", "-i", video_path, "-vn", "-ac", "1", "-ar", "16000",
+             # The fastest Opus setting is several times quicker at about the same size
+             "-c:a", "libopus", "-b:a", AUDIO_BITRATE, "-application", "voip", "-compression_level", "0", "-f", "ogg", "-"],
+            stdin=subprocess.DEVNULL, capture_output=True, timeout=300,
+        )
+    except Exception as e:
+        print(f"Error extracting audio: {e}")
+        return None
+    return proc.stdout if proc.returncode == 0 and proc.stdout else None
+
+
+def describe_speech(speech: Dict[str, Any]) -> str:
+    return (
+        f"Locally measured audio: {speech['speaking_time']:.0f}s of speech in {speech['duration']:.0f}s, "
+        f"about {speech['speaking_rate_wpm']:.0f} words/min, {speech['pauses']} pauses "
+        f"({speech['long_pauses']} longer than 2s, longest {speech['max_pause']:.1f}s), "
+        f"signal-to-noise {speech['snr_db']:.0f} dB, clarity score {speech['speech_clarity']:.0f}/100."
+    )
+
+
+def build_video_payload(
+    video_path: str,
+    face_cascade: Optional[cv2.CascadeClassifier] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]], Dict[str, Any]]:
+    """Compact stand-in for a recording: (content parts, local speech metrics, size stats).
+
+    The parts are a keyframe montage and, when ffmpeg is available, the audio
+    track as 16 kbit/s Opus, instead of the original file.
+    """
+    started = time.perf_counter()
+    # The audio encode and the speech metrics each read the audio through their own
+    # ffmpeg process, alongside the frame scan here
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        pending_audio = pool.submit(extract_audio, video_path)
+        pending_speech = pool.submit(analyze_file, video_path)
+        keyframes = select_keyframes(video_path, face_cascade=face_cascade, progress=progress)
+        montage = build_montage(keyframes)
+        audio = pending_audio.result()
+        speech = pending_speech.result()
+    parts = [{"inline_data": {"data": montage, "mime_type": "image/jpeg"}}]
+    if audio:
+        parts.append({"inline_data": {"data": audio, "mime_type": "audio/ogg"}})
+    stats = {
+        "raw_bytes": os.path.getsize(video_path),
+        "payload_bytes": len(montage) + len(audio or b""),
+        "keyframes": len(keyframes),
+        "montage_bytes": len(montage),
+        "audio_bytes": len(audio or b""),
+        "prep_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+    return parts, speech, stats
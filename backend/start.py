@@ -1,8 +1,16 @@
 #!/usr/bin/env python3
 """
 Startup script for the Interview Practice FastAPI backend
+
+Development (default): one uvicorn process with auto-reload.
+Production (--prod or MODE=production): a gunicorn master loads the app and
+its services (Haar cascades, Gemini clients, Google auth) once, then forks
+uvicorn workers that share those pages copy-on-write. Workers are recycled
+after MAX_REQUESTS and drained for GRACEFUL_TIMEOUT seconds on shutdown.
 """
 
+import argparse
+import multiprocessing
 import uvicorn
 import os
 from dotenv import load_dotenv
@@ -10,15 +18,11 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
-if __name__ == "__main__":
-    # Get configuration from environment variables
-    host = os.getenv("HOST", "0.0.0.0")
-    port = int(os.getenv("PORT", 8000))
-    reload = os.getenv("RELOAD", "true").lower() == "true"
-    
+
+def run_dev(host: str, port: int, reload: bool):
     print(f"Starting Interview Practice API on {host}:{port}")
     print(f"Reload mode: {reload}")
-    
+
     uvicorn.run(
         "main:app",
         host=host,
@@ -26,3 +30,64 @@ if __name__ == "__main__":
         reload=reload,
         log_level="info"
     )
+
+
+def run_prod(host: str, port: int, workers: int):
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        # gunicorn is POSIX-only; uvicorn's own workers are spawned, so nothing is preloaded
+        print("gunicorn not available, falling back to uvicorn workers without preloading")
+        uvicorn.run("main:app", host=host, port=port, workers=workers, log_level="info")
+        return
+
+    class ProductionApplication(BaseApplication):
+        def __init__(self, options):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            # Runs once in the master before fork (preload_app)
+            import main
+            main.preload_services()
+            return main.app
+
+    options = {
+        "bind": f"{host}:{port}",
+        "workers": workers,
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": True,
+        "max_requests": int(os.getenv("MAX_REQUESTS", 1000)),
+        "max_requests_jitter": int(os.getenv("MAX_REQUESTS_JITTER", 100)),
+        "graceful_timeout": int(os.getenv("GRACEFUL_TIMEOUT", 30)),
+        # Full-video analysis can legitimately run for minutes
+        "timeout": int(os.getenv("WORKER_TIMEOUT", 300)),
+        "loglevel": "info",
+    }
+    print(f"Starting Interview Practice API on {host}:{port} with {workers} workers (preloaded)")
+    ProductionApplication(options).run()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the Interview Practice API")
+    parser.add_argument("--prod", action="store_true", help="multi-worker production mode")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=None)
+    args = parser.parse_args()
+
+    # Get configuration from environment variables
+    host = args.host or os.getenv("HOST", "0.0.0.0")
+    port = args.port or int(os.getenv("PORT", 8000))
+    production = args.prod or os.getenv("MODE", "development").lower() == "production"
+
+    if production:
+        workers = args.workers or int(os.getenv("WORKERS", multiprocessing.cpu_count()))
+        run_prod(host, port, workers)
+    else:
+        reload = os.getenv("RELOAD", "true").lower() == "true"
+        run_dev(host, port, reload)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test script for the merged activity feed: keyset paging across kinds and its per-table indexes
+"""
+
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+# Never touch the development database
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}")
+
+from sqlalchemy import delete, inspect, text
+
+from database import DSAAttempt, InterviewAttempt, StudySession, create_tables, engine, session_scope
+from services.progress_service import ProgressService
+
+USER_ID = 9001
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+# Newest first: timestamp, then kind (study, interview, dsa), then id
+EXPECTED = ["Study: s-b", "Study: s-a", "Interview: i-a", "DSA: d-a", "Study: s-c", "DSA: d-b", "Interview: i-b", "DSA: d-c"]
+
+
+def _seed():
+    with session_scope() as db:
+        for model in (StudySession, InterviewAttempt, DSAAttempt):
+            db.execute(delete(model).where(model.user_id == USER_ID))
+        # Several rows share T0, within and across kinds
+        for topic, at in (("s-a", T0), ("s-b", T0), ("s-c", T0 - timedelta(hours=1))):
+            db.add(StudySession(user_id=USER_ID, topic=topic, difficulty="easy", questions_attempted=4, questions_correct=3, completed_at=at))
+            db.flush()
+        for kind, at in (("i-a", T0), ("i-b", T0 - timedelta(hours=2))):
+            db.add(InterviewAttempt(user_id=USER_ID, type=kind, difficulty="easy", score=80, duration_sec=60, completed_at=at))
+            db.flush()
+        for topic, at in (("d-a", T0), ("d-b", T0 - timedelta(hours=1)), ("d-c", T0 - timedelta(hours=3))):
+            db.add(DSAAttempt(user_id=USER_ID, topic=topic, difficulty="easy", correct=True, attempted_at=at))
+            db.flush()
+
+
+def _walk(service: ProgressService, limit: int):
+    seen, cursor, pages = [], None, 0
+    while True:
+        items, cursor = service.recent_activity_page(limit=limit, cursor=cursor)
+        seen += [item["activity"] for item in items]
+        pages += 1
+        if cursor is None:
+            return seen, pages
+        # The cursor survives a round trip through its text form
+        assert ProgressService._encode_cursor(*ProgressService._decode_cursor(cursor)) == cursor
+
+
+def test_keyset_paging():
+    create_tables()
+    _seed()
+    with session_scope() as db:
+        service = ProgressService(db, USER_ID)
+        assert _walk(service, 100) == (EXPECTED, 1)
+        for limit in (1, 2, 3):
+            seen, pages = _walk(service, limit)
+            assert seen == EXPECTED, (limit, seen)
+            assert pages == -(-len(EXPECTED) // limit)
+        # An exactly full last page has no next cursor
+        items, cursor = service.recent_activity_page(limit=4, cursor=service.recent_activity_page(limit=4)[1])
+        assert [i["activity"] for i in items] == EXPECTED[4:] and cursor is None
+        try:
+            service.recent_activity_page(cursor="2026-01-01T12:00:00~bogus~1")
+            assert False, "bad cursor accepted"
+        except ValueError:
+            pass
+
+
+def test_feed_indexes_created_on_existing_tables():
+    create_tables()
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX IF EXISTS ix_dsa_attempts_user_attempted"))
+    create_tables()
+    for table, name in (
+        ("interview_attempts", "ix_interview_attempts_user_completed"),
+        ("study_sessions", "ix_study_sessions_user_completed"),
+        ("dsa_attempts", "ix_dsa_attempts_user_attempted"),
+    ):
+        index = next(i for i in inspect(engine).get_indexes(table) if i["name"] == name)
+        assert index["column_names"][0] == "user_id" and index["column_names"][2] == "id"
+    print("[SUCCESS] activity feed paging")
+
+
+if __name__ == "__main__":
+    test_keyset_paging()
+    test_feed_indexes_created_on_existing_tables()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test script for the local answer evaluator and provisional evaluations upgraded in place
+"""
+
+import os
+import tempfile
+
+# Never touch the development database
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}")
+
+from database import create_tables
+from services.answer_evaluator import EvaluationStore, local_evaluation
+
+QUESTION = "How would you design a rate limiter for a public API?"
+EXPECTED = (
+    "Discuss the token bucket or sliding window algorithm, where counters live (Redis with atomic "
+    "increments and expiry), per-user and per-IP keys, returning 429 with a Retry-After header, "
+    "and how limits stay consistent across multiple API servers."
+)
+
+
+def test_local_evaluation():
+    good = local_evaluation(QUESTION, (
+        "I would use a token bucket per user and per IP, stored in Redis so every API server shares the "
+        "counters; atomic increments with an expiry keep it consistent. Over the limit the API returns 429 "
+        "with a Retry-After header. A sliding window log is an alternative when bursts must be smoothed."
+    ), EXPECTED)
+    weak = local_evaluation(QUESTION, "I would just block users that send too many requests.", EXPECTED)
+    assert good["evaluation"]["score"] >= 70 > weak["evaluation"]["score"], (good, weak)
+    assert good["source"] == "local" and "token, bucket" in weak["explanation"]
+    assert local_evaluation(QUESTION, "no idea", EXPECTED)["evaluation"] == {"score": 0, "verdict": "Needs Improvement"}
+
+    behavioral = local_evaluation("Tell me about a time you handled a conflict.", (
+        "At my last job two engineers disagreed on a migration plan. I was responsible for the release, "
+        "so I set up a meeting and we compared both plans against the deadline. As a result we shipped on time."
+    ))
+    assert "all four parts present" in behavioral["explanation"] and behavioral["evaluation"]["score"] <= 75
+
+
+def test_provisional_upgraded_in_place():
+    create_tables()
+    store = EvaluationStore()
+    evaluation_id = store.create({"ai": local_evaluation(QUESTION, "Use a token bucket.", EXPECTED)})
+    assert store.get(evaluation_id)["status"] == "provisional"
+    store.complete(evaluation_id, {"ai": {"evaluation": {"score": 88, "verdict": "Excellent"}}, "audio_url": "/artifacts/x.mp3"})
+    final = store.get(evaluation_id)
+    assert final["status"] == "final" and final["ai"]["evaluation"]["score"] == 88 and final["audio_url"] == "/artifacts/x.mp3"
+
+    failed_id = store.create({"ai": {"evaluation": {"score": 40}}})
+    store.complete(failed_id, error="upstream down")
+    failed = store.get(failed_id)
+    assert failed["status"] == "failed" and failed["ai"]["evaluation"]["score"] == 40
+    assert store.get("missing") is None
+    print("[SUCCESS] answer evaluation tiers")
+
+
+if __name__ == "__main__":
+    test_local_evaluation()
+    test_provisional_upgraded_in_place()
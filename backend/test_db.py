@@ -3,7 +3,16 @@
 Test script to verify database functionality
 """
 
-from database import create_tables, SessionLocal, User
+import os
+import tempfile
+
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import Session
+
+import database
+from database import (
+    Base, BehavioralAnalysis, InterviewAttempt, InterviewSession, SchemaMigration, create_tables, SessionLocal, User,
+)
 from services.user_service import UserService
 
 def test_database():
@@ -39,5 +48,47 @@ def test_database():
     db.close()
     print("\n[SUCCESS] Database test completed successfully!")
 
+def test_legacy_json_migration():
+    # A database from before the JSON columns: JSON written as text, some of it malformed
+    legacy = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'legacy.db')}")
+    Base.metadata.create_all(legacy)
+    with legacy.begin() as conn:
+        conn.execute(text("ALTER TABLE behavioral_analyses DROP COLUMN trends"))
+        conn.execute(text("ALTER TABLE behavioral_analyses DROP COLUMN segments"))
+        for questions in ("Tell me about yourself", '"[\\"Design a cache\\"]"', '["Reverse a list"]', ""):
+            conn.execute(text(
+                "INSERT INTO interview_sessions (user_id, company, position, interview_type, questions) "
+                "VALUES (1, 'Acme', 'SWE', 'technical', :q)"
+            ), {"q": questions})
+        conn.execute(text(
+            "INSERT INTO interview_attempts (user_id, type, difficulty, score, duration_sec, questions) "
+            "VALUES (1, 'quick', 'easy', 70, 60, '[{\"correct\": true}')"
+        ))
+        for improvements in ('{"improvements": ["Slow down"], "trends": {"emotion": []}, "segments": [{"t": 1}]}', "Speak up"):
+            conn.execute(text(
+                "INSERT INTO behavioral_analyses (user_id, confidence_score, eye_contact_score, posture_score, "
+                "speech_clarity, improvements) VALUES (1, 70, 70, 70, 70, :i)"
+            ), {"i": improvements})
+
+    engine = database.engine
+    database.engine = legacy
+    try:
+        create_tables()
+        create_tables()
+    finally:
+        database.engine = engine
+
+    with Session(legacy) as db:
+        sessions = db.scalars(select(InterviewSession.questions).order_by(InterviewSession.id)).all()
+        assert sessions == ["Tell me about yourself", ["Design a cache"], ["Reverse a list"], ""]
+        # Truncated JSON is kept as the text it was
+        assert db.scalar(select(InterviewAttempt.questions)) == '[{"correct": true}'
+        blob, free = db.scalars(select(BehavioralAnalysis).order_by(BehavioralAnalysis.id)).all()
+        assert (blob.improvements, blob.trends, blob.segments) == (["Slow down"], {"emotion": []}, [{"t": 1}])
+        assert free.improvements == "Speak up"
+        assert db.scalars(select(SchemaMigration.name)).all() == ["json_columns"]
+    print("[SUCCESS] Legacy JSON columns migrated once")
+
 if __name__ == "__main__":
     test_database()
+    test_legacy_json_migration()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test script for cached Google ID-token verification against a local JWKS server
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from services.google_token_verifier import GoogleTokenVerifier
+
+CLIENT_ID = "test-client.apps.googleusercontent.com"
+
+
+def _make_key(kid: str):
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = private.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    ).decode()
+    public = jwk.construct(
+        private.public_key().public_bytes(serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo),
+        "RS256",
+    ).to_dict()
+    public.update({"kid": kid, "use": "sig", "alg": "RS256"})
+    return pem, public
+
+
+def _start_jwks_server(jwks: dict):
+    fetches = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            fetches.append(self.path)
+            body = json.dumps(jwks).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Cache-Control", "public, max-age=3600")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, fetches
+
+
+def _sign(pem: str, kid: str, sub: str) -> str:
+    now = int(time.time())
+    claims = {
+        "iss": "https://accounts.google.com",
+        "aud": CLIENT_ID,
+        "sub": sub,
+        "email": f"{sub}@example.com",
+        "email_verified": True,
+        "iat": now,
+        "exp": now + 3600,
+    }
+    return jwt.encode(claims, pem, algorithm="RS256", headers={"kid": kid})
+
+
+def test_google_verifier_caches_keys():
+    pem, public = _make_key("k1")
+    server, fetches = _start_jwks_server({"keys": [public]})
+    try:
+        verifier = GoogleTokenVerifier(CLIENT_ID, certs_url=f"http://127.0.0.1:{server.server_port}/certs")
+
+        # Warm-up fetches the keys once
+        assert verifier.verify(_sign(pem, "k1", "warmup"))["sub"] == "warmup"
+        assert len(fetches) == 1
+
+        # New tokens and repeated tokens verify without touching the network
+        for i in range(20):
+            token = _sign(pem, "k1", f"user-{i}")
+            assert verifier.verify(token)["sub"] == f"user-{i}"
+            assert verifier.verify(token)["sub"] == f"user-{i}"
+        assert len(fetches) == 1
+
+        # Wrong audience is rejected
+        bad = jwt.encode({"iss": "accounts.google.com", "aud": "other", "sub": "x", "exp": int(time.time()) + 60}, pem, algorithm="RS256", headers={"kid": "k1"})
+        try:
+            verifier.verify(bad)
+            assert False, "token for another audience verified"
+        except ValueError:
+            pass
+
+        # Made-up kids force at most one refetch per interval, however many arrive
+        forged_pem, _ = _make_key("forged")
+        for round_ in range(2):
+            for i in range(10):
+                try:
+                    verifier.verify(_sign(forged_pem, f"forged-{i}", "x"))
+                    assert False, "token with an unknown kid verified"
+                except ValueError:
+                    pass
+            assert len(fetches) == 1 + round_
+            verifier._last_fetch_at -= verifier.min_refetch_interval
+        print(f"[SUCCESS] {len(fetches)} JWKS fetches for 61 verifications")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_google_verifier_caches_keys()
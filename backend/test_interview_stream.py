@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test script for streamed interview generation: questions emitted as they stream, the rest from the final parse
+"""
+
+import asyncio
+
+from services.interview_generator import InterviewGenerator
+
+
+class _Chunk:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _StreamingModel:
+    def __init__(self, output: str, size: int = 7):
+        self.output = output
+        self.size = size
+
+    def generate_content(self, contents, generation_config=None, stream=False, request_options=None):
+        return [_Chunk(self.output[i:i + self.size]) for i in range(0, len(self.output), self.size)]
+
+
+def _stream(output: str):
+    generator = InterviewGenerator()
+    generator.model = _StreamingModel(output)
+
+    async def run():
+        return [event async for event in generator.stream_interview(
+            {"company": "Acme", "position": "Engineer", "interview_type": "technical"}, detail=False
+        )]
+
+    events = asyncio.run(run())
+    streamed = [payload["question"]["question"] for kind, payload in events if kind == "question"]
+    done = events[-1][1]["categories"][0]["questions"]
+    assert [q["question"] for q in done] == streamed
+    assert len({q["id"] for q in done}) == len(done)
+    return streamed
+
+
+def test_truncated_stream_with_invalid_item():
+    # An element without a question is skipped; the cut-off last one comes from the final parse
+    assert _stream(
+        '[{"question": "Design a cache"}, {"category": "no question"}, {"question": "Reverse a list"}, '
+        '{"question": "Explain CAP", "tips": ["consistency'
+    ) == ["Design a cache", "Reverse a list", "Explain CAP"]
+
+    # The stream rejects the middle element but the repaired final parse keeps it: nothing may repeat
+    questions = _stream(
+        '[{"question": "Design a cache"}, {"question": NaN}, {"question": "Reverse a list"}, '
+        '{"question": "Explain CAP", "tips": ["consistency'
+    )
+    assert questions[:2] == ["Design a cache", "Reverse a list"] and questions[-1] == "Explain CAP"
+    assert len(questions) == len(set(questions))
+    print("[SUCCESS] streamed interview generation")
+
+
+if __name__ == "__main__":
+    test_truncated_stream_with_invalid_item()
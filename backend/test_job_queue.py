@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test script for background video analysis jobs: progress, persistence, failures and lease recovery
+"""
+
+import asyncio
+import io
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+# Never touch the development database
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}")
+
+from database import AnalysisJob, BehavioralAnalysis, create_tables, session_scope
+from services.job_queue import JobQueue
+from services.scheduler import Priority, Scheduler
+
+
+class _Analyzer:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+
+    async def analyze_path(self, video_path, progress=None):
+        with open(video_path, "rb") as f:
+            assert f.read() == b"video"
+        if self.fail:
+            raise ValueError("Could not open video file")
+        for done in range(0, 11, 5):
+            progress(done, 10)
+        return {"confidence_score": 71.6, "eye_contact_score": 80, "posture_score": 64.2, "speech_clarity": 0,
+                "overall_feedback": "Steady delivery", "improvements": ["Slow down"]}
+
+
+def _wait(queue: JobQueue, job_id: str, timeout: float = 10.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.status(job_id)
+        if job["status"] in ("done", "failed"):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_job_runs_and_persists_analysis():
+    create_tables()
+    queue = JobQueue(_Analyzer, workers=1, video_dir=tempfile.mkdtemp(), poll_interval=0.05)
+    queue.start()
+    try:
+        job_id = queue.submit(42, io.BytesIO(b"video"))
+        job = _wait(queue, job_id)
+        assert job["status"] == "done" and job["progress"] == 1.0 and job["frames_total"] == 10
+        with session_scope() as db:
+            saved = db.get(BehavioralAnalysis, job["analysis_id"])
+            assert saved.user_id == 42 and saved.confidence_score == 72 and saved.improvements == ["Slow down"]
+
+        failing = JobQueue(lambda: _Analyzer(fail=True), workers=1, video_dir=queue.video_dir, poll_interval=0.05)
+        queue.stop()
+        failing.start()
+        job = _wait(failing, failing.submit(42, io.BytesIO(b"video")))
+        failing.stop()
+        assert job["status"] == "failed" and "Could not open" in job["error"] and job["analysis_id"] is None
+    finally:
+        queue.stop()
+
+
+def test_stale_running_job_is_requeued():
+    create_tables()
+    queue = JobQueue(_Analyzer, workers=0, video_dir=tempfile.mkdtemp(), lease=60)
+    job_id = queue.submit(7, io.BytesIO(b"video"))
+    assert queue._claim()[0] == job_id
+    # The process running it died: its heartbeat stops
+    with session_scope() as db:
+        db.execute(update(AnalysisJob).where(AnalysisJob.id == job_id).values(heartbeat_at=datetime.utcnow() - timedelta(minutes=5)))
+    claimed = queue._claim()
+    assert claimed[0] == job_id
+    queue._run(*claimed)
+    job = queue.status(job_id)
+    assert job["status"] == "done"
+
+    # Out of attempts: the job fails and its video is deleted
+    queue.max_attempts = 1
+    job_id = queue.submit(7, io.BytesIO(b"video"))
+    video_path = queue._claim()[2]
+    with session_scope() as db:
+        db.execute(update(AnalysisJob).where(AnalysisJob.id == job_id).values(heartbeat_at=datetime.utcnow() - timedelta(minutes=5)))
+    assert queue._claim() is None
+    assert queue.status(job_id)["status"] == "failed" and not os.path.exists(video_path)
+
+
+def test_job_waits_for_batch_slot():
+    create_tables()
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    scheduler = Scheduler(1)
+    # A request holds the only slot
+    ticket = asyncio.run_coroutine_threadsafe(scheduler.acquire(Priority.BATCH, "request"), loop).result()
+    queue = JobQueue(_Analyzer, workers=1, video_dir=tempfile.mkdtemp(), poll_interval=0.05, scheduler=scheduler)
+
+    async def start():
+        queue.start()
+
+    asyncio.run_coroutine_threadsafe(start(), loop).result()
+    try:
+        job_id = queue.submit(3, io.BytesIO(b"video"))
+        time.sleep(0.3)
+        assert queue.status(job_id)["status"] == "running" and scheduler.queued(Priority.BATCH) == 1
+        loop.call_soon_threadsafe(ticket.release)
+        assert _wait(queue, job_id)["status"] == "done"
+        time.sleep(0.05)
+        assert scheduler.running() == 0
+    finally:
+        queue.stop()
+        loop.call_soon_threadsafe(loop.stop)
+    print("[SUCCESS] background analysis jobs")
+
+
+if __name__ == "__main__":
+    test_job_runs_and_persists_analysis()
+    test_stale_running_job_is_requeued()
+    test_job_waits_for_batch_slot()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Test script for on-demand request profiling: the admin gate, 1-in-N sampling and the profile ring buffer
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+
+from services.profiler import ProfilerMiddleware, ProfileStore
+
+ADMIN = (b"authorization", b"Bearer admin")
+
+
+def _busy():
+    end = time.perf_counter() + 0.05
+    while time.perf_counter() < end:
+        sum(range(1000))
+
+
+async def _app(scope, receive, send):
+    if scope["path"] == "/boom":
+        raise RuntimeError("boom")
+    # Work handed to a thread must show up in the profile too
+    await asyncio.to_thread(_busy)
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def _middleware(store: ProfileStore, **kwargs) -> ProfilerMiddleware:
+    return ProfilerMiddleware(
+        _app,
+        routes=["/slow", "/boom"],
+        is_admin=lambda headers: headers.get("authorization") == "Bearer admin",
+        store_factory=lambda: store,
+        interval=0.002,
+        **kwargs,
+    )
+
+
+def _request(middleware: ProfilerMiddleware, path: str = "/slow", headers=(), query: bytes = b""):
+    """Response headers of one request, or the exception the app raised."""
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "path": path, "headers": list(headers), "query_string": query}
+    try:
+        asyncio.run(middleware(scope, None, send))
+    except RuntimeError as e:
+        return e
+    return dict(sent[0]["headers"])
+
+
+def test_admin_gate_and_profile_header():
+    store = ProfileStore(tempfile.mkdtemp())
+    middleware = _middleware(store)
+    assert b"x-profile-id" not in _request(middleware)
+    # Asking is not enough without an admin token
+    assert b"x-profile-id" not in _request(middleware, headers=[(b"x-profile", b"1")])
+
+    name = _request(middleware, headers=[(b"x-profile", b"1"), ADMIN])[b"x-profile-id"].decode()
+    assert _request(middleware, headers=[ADMIN], query=b"a=1&profile=1")[b"x-profile-id"]
+    with open(store.path(name)) as f:
+        stacks = f.read()
+    assert "_busy (test_profiler.py" in stacks and stacks.rstrip().split(" ")[-1].isdigit()
+    # Routes outside the profiled set are never sampled
+    unlisted = ProfilerMiddleware(_app, routes=[], is_admin=lambda h: True, store_factory=lambda: store)
+    assert b"x-profile-id" not in _request(unlisted, headers=[(b"x-profile", b"1"), ADMIN])
+
+
+def test_sampling_and_failures():
+    store = ProfileStore(tempfile.mkdtemp())
+    middleware = _middleware(store, sample_every=3)
+    profiled = [b"x-profile-id" in _request(middleware) for _ in range(6)]
+    assert profiled == [False, False, True, False, False, True]
+
+    # An app that raises before responding still leaves exactly one profile
+    before = len(os.listdir(store.root))
+    assert isinstance(_request(middleware, "/boom", headers=[(b"x-profile", b"1"), ADMIN]), RuntimeError)
+    assert len(os.listdir(store.root)) == before + 1
+
+    # A failing save is tried once and does not break the response
+    saves = []
+
+    class _BrokenStore(ProfileStore):
+        def save(self, route, collapsed):
+            saves.append(route)
+            raise OSError("disk full")
+
+    broken = _middleware(_BrokenStore(tempfile.mkdtemp()))
+    headers = _request(broken, headers=[(b"x-profile", b"1"), ADMIN])
+    assert b"x-profile-id" not in headers and saves == ["/slow"]
+
+
+def test_ring_buffer():
+    store = ProfileStore(tempfile.mkdtemp(), max_files=3)
+    names = []
+    for i in range(5):
+        names.append(store.save("/dashboard/stats", f"main {i}\n"))
+        time.sleep(0.002)
+    assert sorted(os.listdir(store.root)) == sorted(names[-3:])
+    assert store.path(names[0]) is None and store.path(names[-1])
+    assert store.path("../secret.collapsed") is None and store.path("notes.txt") is None
+    print("[SUCCESS] request profiling")
+
+
+if __name__ == "__main__":
+    test_admin_gate_and_profile_header()
+    test_sampling_and_failures()
+    test_ring_buffer()
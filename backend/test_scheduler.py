@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script for the LLM request scheduler: priority order, per-user fairness, queue limits and deadlines
+"""
+
+import asyncio
+
+from services.scheduler import Expired, Priority, QueueFull, Scheduler
+
+
+def test_interactive_work_overtakes_batch():
+    async def run():
+        scheduler = Scheduler(2, {Priority.BATCH: 1}, max_queue=8)
+        order = []
+
+        async def job(priority, key, name):
+            async with scheduler.slot(priority, key):
+                order.append(name)
+                await asyncio.sleep(0.01)
+
+        blocker = await scheduler.acquire(Priority.STANDARD, "x")
+        blocker2 = await scheduler.acquire(Priority.STANDARD, "x")
+        tasks = [asyncio.create_task(job(Priority.BATCH, "video", f"batch{i}")) for i in range(3)]
+        await asyncio.sleep(0)
+        # Alice queues three requests before Bob's one; Bob must not wait behind all of them
+        tasks += [asyncio.create_task(job(Priority.INTERACTIVE, "alice", f"alice{i}")) for i in range(3)]
+        tasks.append(asyncio.create_task(job(Priority.INTERACTIVE, "bob", "bob0")))
+        await asyncio.sleep(0)
+        blocker.release()
+        blocker2.release()
+        await asyncio.gather(*tasks)
+        assert order[:3] == ["alice0", "bob0", "alice1"], order
+        assert all(name.startswith("batch") for name in order[-3:]), order
+        assert scheduler.running() == 0 and scheduler.queued(Priority.BATCH) == 0
+
+    asyncio.run(run())
+
+
+def test_full_queue_is_rejected_with_retry_after():
+    async def run():
+        scheduler = Scheduler(1, max_queue=1)
+        held = await scheduler.acquire(Priority.STANDARD, "a")
+        waiting = asyncio.create_task(scheduler.acquire(Priority.STANDARD, "b"))
+        await asyncio.sleep(0)
+        try:
+            await scheduler.acquire(Priority.STANDARD, "c")
+            assert False, "queue should be full"
+        except QueueFull as e:
+            assert e.retry_after >= 1
+        held.release()
+        (await waiting).release()
+
+    asyncio.run(run())
+
+
+def test_stale_and_superseded_frames_are_dropped():
+    async def run():
+        scheduler = Scheduler(1, max_queue=8)
+        held = await scheduler.acquire(Priority.BATCH, "video")
+        try:
+            await scheduler.acquire(Priority.INTERACTIVE, "session", timeout=0.02)
+            assert False, "frame should have expired"
+        except Expired as e:
+            assert e.reason == "expired"
+        older = asyncio.create_task(scheduler.acquire(Priority.INTERACTIVE, "session", timeout=5, supersede=True))
+        await asyncio.sleep(0)
+        newer = asyncio.create_task(scheduler.acquire(Priority.INTERACTIVE, "session", timeout=5, supersede=True))
+        await asyncio.sleep(0)
+        try:
+            await older
+            assert False, "older frame should have been replaced"
+        except Expired as e:
+            assert e.reason == "superseded"
+        assert scheduler.queued(Priority.INTERACTIVE) == 1
+        held.release()
+        (await newer).release()
+        assert scheduler.running() == 0
+        print("[SUCCESS] request scheduler")
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    test_interactive_work_overtakes_batch()
+    test_full_queue_is_rejected_with_retry_after()
+    test_stale_and_superseded_frames_are_dropped()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test script for local speech metrics: voice activity, pauses, speaking rate and windowed streaming
+"""
+
+import io
+import wave
+
+import numpy as np
+
+from services.speech_metrics import SAMPLE_RATE, SpeechMetrics, analyze_bytes
+
+
+def _speech(seconds: float, syllables_per_s: float = 4.0) -> np.ndarray:
+    # A voiced tone whose loudness rises and falls once per syllable
+    t = np.arange(int(SAMPLE_RATE * seconds)) / SAMPLE_RATE
+    return 0.3 * np.sin(np.pi * syllables_per_s * t) ** 2 * np.sin(2 * np.pi * 180 * t)
+
+
+def _recording() -> np.ndarray:
+    silence = lambda seconds: np.zeros(int(SAMPLE_RATE * seconds))
+    signal = np.concatenate([silence(1), _speech(4), silence(0.6), _speech(3), silence(2.5), _speech(5), silence(1)])
+    signal += np.random.default_rng(0).normal(0, 0.003, len(signal))
+    return (signal * 32767).astype(np.int16)
+
+
+def test_pauses_rate_and_clarity():
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SAMPLE_RATE)
+        w.writeframes(_recording().tobytes())
+    speech = analyze_bytes(buf.getvalue())
+    assert speech["pauses"] == 2 and speech["long_pauses"] == 1 and 2.3 < speech["max_pause"] < 2.8
+    assert 9 < speech["speaking_time"] < 12.5
+    assert 110 < speech["speaking_rate_wpm"] < 160
+    assert speech["speech_clarity"] > 70 and len(speech["trend"]) == 4
+
+    noise = SpeechMetrics()
+    noise.feed((np.random.default_rng(1).normal(0, 0.003, SAMPLE_RATE * 5) * 32767).astype(np.int16))
+    assert noise.summary()["speaking_time"] == 0 and noise.summary()["speech_clarity"] == 0
+
+
+def test_results_do_not_depend_on_chunking():
+    pcm = _recording()
+    whole = SpeechMetrics()
+    whole.feed(pcm)
+    pieces = SpeechMetrics()
+    for i in range(0, len(pcm), 777):
+        pieces.feed(pcm[i:i + 777])
+    assert whole.summary() == pieces.summary() and whole.trend == pieces.trend
+    print("[SUCCESS] speech metrics")
+
+
+if __name__ == "__main__":
+    test_pauses_rate_and_clarity()
+    test_results_do_not_depend_on_chunking()
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Test script for local STAR scoring of transcripts, one-shot and per live session
+"""
+
+from services.star_classifier import StarSessions, score_star
+
+ANSWER = [
+    "At my last job our checkout service kept timing out during sales.",
+    "I was responsible for the payments API and we needed to fix it before the holidays.",
+    "So I profiled the service and added caching for the pricing",
+    "calls. In the end checkout latency dropped by 40%.",
+]
+
+
+def test_score_star():
+    assert score_star(" ".join(ANSWER)) == {"situation": True, "task": True, "action": True, "result": True, "completeness": 1.0}
+    assert score_star("I think teamwork is really important.")["completeness"] == 0.0
+    assert score_star("") == {"situation": False, "task": False, "action": False, "result": False, "completeness": 0.0}
+
+
+def test_sessions_accumulate():
+    sessions = StarSessions(max_sessions=2)
+    seen = [sessions.feed("a", segment)["completeness"] for segment in ANSWER]
+    assert seen == [0.25, 0.5, 0.75, 1.0]
+    # Frames without speech keep the session's coverage; other sessions are separate
+    assert sessions.feed("a", None)["result"] is True
+    assert sessions.feed("b", "We shipped it on time.") == {"situation": False, "task": False, "action": False, "result": True, "completeness": 0.25}
+    sessions.discard("a")
+    assert sessions.feed("a", None)["completeness"] == 0.0
+    print("[SUCCESS] STAR scoring")
+
+
+if __name__ == "__main__":
+    test_score_star()
+    test_sessions_accumulate()
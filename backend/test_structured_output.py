@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test script for LLM output repair, incremental parsing and schema validation
+"""
+
+from typing import List
+
+from services.llm_schemas import AnswerEvaluation, FrameAnalysis, InterviewQuestion, VideoAnalysis
+from services.structured_output import IncrementalJSONParser, StructuredOutputError, parse_json, parse_structured
+
+
+def test_repairs_common_defects():
+    assert parse_json('```json\n{"a": 1, "b": [1, 2,],}\n```') == {"a": 1, "b": [1, 2]}
+    assert parse_json("Here you go: {'ok': True, 'n': None, 'text': 'it\\'s'} Thanks!") == {"ok": True, "n": None, "text": "it's"}
+    assert parse_json('{"text": "line one\nline two"}') == {"text": "line one\nline two"}
+    # Truncated mid-stream: open string and brackets are closed, a dangling key dropped
+    assert parse_json('[{"question": "a"}, {"question": "b", "tips": ["x", "y') == [
+        {"question": "a"}, {"question": "b", "tips": ["x", "y"]}
+    ]
+    assert parse_json('{"summary": "ok", "theory": ') == {"summary": "ok"}
+
+
+def test_validation_keeps_valid_items():
+    text = '[{"question": "Design a cache", "difficulty": "Hard"}, {"category": "no question"}, {"question": "Reverse a list"}]'
+    questions = parse_structured(text, List[InterviewQuestion])
+    assert [q["question"] for q in questions] == ["Design a cache", "Reverse a list"]
+    assert questions[1]["difficulty"] == "Medium"
+
+    evaluation = parse_structured('{"evaluation": {"score": "85", "verdict": "Good"}, "summary": "s"}', AnswerEvaluation)
+    assert evaluation["evaluation"]["score"] == 85 and evaluation["explanation"] == ""
+
+    try:
+        parse_structured("I cannot help with that.", AnswerEvaluation)
+        assert False, "prose validated"
+    except StructuredOutputError as e:
+        assert e.text == "I cannot help with that."
+
+
+def test_rejects_missing_core_fields():
+    # Valid JSON without the question, scores or feedback must not pass as a neutral answer
+    for schema in (AnswerEvaluation, FrameAnalysis, VideoAnalysis, List[InterviewQuestion]):
+        try:
+            parse_structured('{"foo": 1}', schema)
+            assert False, f"{schema} accepted an empty answer"
+        except StructuredOutputError:
+            pass
+    try:
+        parse_structured('{"evaluation": {"verdict": "Good"}}', AnswerEvaluation)
+        assert False, "evaluation without a score validated"
+    except StructuredOutputError:
+        pass
+
+
+def test_incremental_parser_emits_completed_elements():
+    stream = '```json\n[{"question": "a, [b]", "tips": ["x"]}, {"question": "c\\"d"}]\n```'
+    parser = IncrementalJSONParser()
+    seen = []
+    for i in range(0, len(stream), 7):
+        seen.extend(parser.feed(stream[i:i + 7]))
+    assert seen == [{"question": "a, [b]", "tips": ["x"]}, {"question": 'c"d'}]
+    assert parser.close() == seen
+    print("[SUCCESS] structured output parsing")
+
+
+if __name__ == "__main__":
+    test_repairs_common_defects()
+    test_validation_keeps_valid_items()
+    test_rejects_missing_core_fields()
+    test_incremental_parser_emits_completed_elements()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for the upstream call policy: retries, circuit breaker, hedging and rate limiting
+"""
+
+import threading
+import time
+
+from services.upstream import RetryableStatus, TokenBucket, Upstream, UpstreamError
+
+
+class _Response:
+    status_code = 503
+
+
+def test_retries_then_opens_circuit():
+    upstream = Upstream("test", retries=2, backoff_base=0.001, failure_threshold=3, reset_timeout=0.2)
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise RetryableStatus(_Response())
+        return "ok"
+
+    assert upstream.call(flaky) == "ok" and len(calls) == 3
+
+    def down():
+        calls.append(1)
+        raise TimeoutError("upstream down")
+
+    calls.clear()
+    try:
+        upstream.call(down)
+        assert False, "expected the last attempt's error"
+    except TimeoutError:
+        pass
+    assert len(calls) == 3 and upstream.breaker.state == "open"
+
+    # Open: fail fast without touching the upstream
+    try:
+        upstream.call(down)
+        assert False, "circuit should be open"
+    except UpstreamError:
+        pass
+    assert len(calls) == 3
+
+    # After the reset timeout one trial call is let through and closes the circuit
+    time.sleep(0.25)
+    assert upstream.call(lambda: "recovered") == "recovered"
+    assert upstream.breaker.state == "closed"
+
+
+def test_client_errors_are_not_retried():
+    upstream = Upstream("test", retries=3, backoff_base=0.001)
+    calls = []
+
+    def bad_request():
+        calls.append(1)
+        raise ValueError("invalid argument")
+
+    try:
+        upstream.call(bad_request)
+    except ValueError:
+        pass
+    assert len(calls) == 1 and upstream.breaker.state == "closed"
+
+
+def test_hedge_returns_the_faster_attempt():
+    upstream = Upstream("test", hedge_after=0.05)
+    attempts = []
+    lock = threading.Lock()
+
+    def sometimes_slow():
+        with lock:
+            attempts.append(1)
+            first = len(attempts) == 1
+        time.sleep(1.0 if first else 0.01)
+        return "slow" if first else "fast"
+
+    start = time.perf_counter()
+    assert upstream.call(sometimes_slow, hedge=True) == "fast"
+    assert time.perf_counter() - start < 0.5 and len(attempts) == 2
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=20, burst=2)
+    start = time.perf_counter()
+    for _ in range(6):
+        assert bucket.acquire(timeout=1)
+    # Two from the burst, four more at 20/s
+    assert time.perf_counter() - start >= 0.15
+    empty = TokenBucket(rate=0.5, burst=1)
+    assert empty.acquire(timeout=0) and not empty.acquire(timeout=0.1)
+    print("[SUCCESS] upstream call policy")
+
+
+if __name__ == "__main__":
+    test_retries_then_opens_circuit()
+    test_client_errors_are_not_retried()
+    test_hedge_returns_the_faster_attempt()
+    test_token_bucket_limits_rate()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test script for user resolution on user-scoped routes: bearer tokens, revocation and the ?user_id= fallback
+"""
+
+import io
+import os
+import tempfile
+
+# Never touch the development database
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}")
+
+from fastapi.testclient import TestClient
+
+import main
+from database import create_tables, session_scope
+from services.job_queue import JobQueue
+
+
+def _user(google_id: str) -> dict:
+    return main.get_auth_service().create_user_session(
+        {"google_id": google_id, "email": f"{google_id}@example.com", "name": google_id, "verified_email": True}
+    )
+
+
+def test_user_scoped_route_auth():
+    create_tables()
+    # No lifespan: the job queue's workers are not started, so the job stays queued
+    client = TestClient(main.app)
+    owner, other = _user("auth-owner"), _user("auth-other")
+    owner_id = owner["user"]["id"]
+    job_id = JobQueue(lambda: None, workers=0, video_dir=tempfile.mkdtemp()).submit(owner_id, io.BytesIO(b"video"))
+    url = f"/jobs/{job_id}"
+
+    def bearer(session: dict) -> dict:
+        return {"Authorization": f"Bearer {session['access_token']}"}
+
+    assert client.get(url, headers=bearer(owner)).json()["id"] == job_id
+    # The token's user wins over ?user_id=, so another user's token cannot read the job
+    assert client.get(f"{url}?user_id={owner_id}", headers=bearer(other)).status_code == 404
+    assert client.get(url, headers={"Authorization": "Bearer not-a-jwt"}).status_code == 401
+
+    allowed = main.ALLOW_QUERY_USER_ID
+    try:
+        # The default: tokenless requests fall back to ?user_id=
+        main.ALLOW_QUERY_USER_ID = True
+        assert client.get(f"{url}?user_id={owner_id}").status_code == 200
+
+        main.ALLOW_QUERY_USER_ID = False
+        res = client.get(f"{url}?user_id={owner_id}")
+        assert res.status_code == 401 and res.headers["www-authenticate"] == "Bearer"
+        assert client.get(url, headers=bearer(owner)).status_code == 200
+    finally:
+        main.ALLOW_QUERY_USER_ID = allowed
+
+    with session_scope() as db:
+        main.get_auth_service().revoke_user_tokens(db, owner_id)
+    assert client.get(url, headers=bearer(owner)).status_code == 401
+    print("[SUCCESS] user-scoped route auth")
+
+
+if __name__ == "__main__":
+    test_user_scoped_route_auth()
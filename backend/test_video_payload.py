@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Test script for the compact video payload: keyframe selection and the labelled montage
+"""
+
+import os
+import tempfile
+
+import cv2
+import numpy as np
+
+from services.video_payload import TILE_WIDTH, build_montage, select_keyframes
+
+
+def _video(seconds: int = 20, fps: int = 10, dark: bool = False) -> str:
+    # Four scenes of different colours; each cut is the biggest change in its stretch of video
+    path = os.path.join(tempfile.mkdtemp(), "video.mp4")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (640, 360))
+    for i in range(seconds * fps):
+        colour = [(200, 60, 60), (60, 200, 60), (60, 60, 200), (200, 200, 60)][i // (5 * fps)]
+        writer.write(np.full((360, 640, 3), [c // 20 for c in colour] if dark else colour, dtype=np.uint8))
+    writer.release()
+    return path
+
+
+def test_keyframes_montage():
+    path = _video()
+    keyframes = select_keyframes(path, max_frames=4)
+    times = [t for t, _ in keyframes]
+    assert len(keyframes) == 4 and times == sorted(times)
+    # One frame per scene, taken at its cut
+    assert [int(t // 5) for t in times] == [0, 1, 2, 3]
+    assert all(tile.shape[1] == TILE_WIDTH for _, tile in keyframes)
+
+    montage = cv2.imdecode(np.frombuffer(build_montage(keyframes), dtype=np.uint8), cv2.IMREAD_COLOR)
+    assert montage.shape[:2] == (180, 4 * TILE_WIDTH)
+
+
+def test_all_dark_video_keeps_a_frame():
+    # An unlit recording still gives the model one frame rather than no montage at all
+    keyframes = select_keyframes(_video(seconds=4, dark=True), max_frames=4)
+    assert len(keyframes) == 1
+    assert build_montage(keyframes)
+    print("[SUCCESS] video payload")
+
+
+if __name__ == "__main__":
+    test_keyframes_montage()
+    test_all_dark_video_keeps_a_frame()